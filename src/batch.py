@@ -0,0 +1,151 @@
+"""
+Пакетный поиск информации о странах.
+"""
+
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Iterator, Optional, TextIO
+
+import asyncclick as click
+
+from clients.session import session_manager
+from collectors.models import LocationInfoDTO, model_encoder
+from collectors.refresh import refresh_queue
+from main import show_location_info
+from reader import Reader
+from settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def parse_locations(lines: TextIO) -> Iterator[str]:
+    """
+    Чтение строк для поиска.
+
+    Каждая строка содержит либо строку для поиска, либо JSON-объект с ключом ``location``
+    (строки, начинающиеся с ``{`` или ``[``, считаются JSON):
+
+    .. code-block::
+
+        London
+        {"location": "Tallinn"}
+
+    Строки с некорректным JSON или JSON, не являющимся объектом, пропускаются с предупреждением в журнале.
+
+    :param lines: Входной поток
+    :return:
+    """
+
+    for number, line in enumerate(lines, start=1):
+        if not (line := line.strip()):
+            continue
+        if not line.startswith(("{", "[")):
+            yield line
+            continue
+
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as exception:
+            logger.warning("Строка %s пропущена: некорректный JSON (%s)", number, exception)
+            continue
+        if not isinstance(data, dict):
+            logger.warning("Строка %s пропущена: ожидается JSON-объект", number)
+            continue
+        if location := data.get("location"):
+            yield str(location)
+
+
+async def read_locations(lines: TextIO) -> AsyncIterator[str]:
+    """
+    Чтение строк для поиска без блокировки цикла событий.
+
+    Входной поток (например, стандартный ввод) читается в отдельном потоке,
+    поэтому ожидание ввода не останавливает уже начатое чтение данных о странах.
+
+    :param lines: Входной поток
+    :return:
+    """
+
+    locations = parse_locations(lines)
+
+    def read_next() -> Optional[str]:
+        return next(locations, None)
+
+    while (location := await asyncio.to_thread(read_next)) is not None:
+        yield location
+
+
+def to_json_line(
+    location: str, location_info: Optional[LocationInfoDTO] | Exception
+) -> str:
+    """
+    Формирование строки результата в формате JSON.
+
+    :param location: Строка для поиска
+    :param location_info: Найденные данные о стране или ошибка их получения
+    :return:
+    """
+
+    if isinstance(location_info, Exception):
+        error = str(location_info) or type(location_info).__name__
+        return json.dumps(
+            {"location": location, "result": None, "error": error},
+            ensure_ascii=False,
+        )
+
+    return json.dumps(
+        {"location": location, "result": location_info},
+        default=model_encoder,
+        ensure_ascii=False,
+    )
+
+
+@click.command()
+@click.option(
+    "--input",
+    "-i",
+    "input_file",
+    type=click.File("r"),
+    default="-",
+    help="Файл со строками для поиска (по умолчанию – стандартный ввод)",
+)
+@click.option(
+    "--format",
+    "-f",
+    "output_format",
+    type=click.Choice(["json", "table"]),
+    default="json",
+    help="Формат вывода: JSON-строки или таблицы",
+)
+async def process_batch(input_file: TextIO, output_format: str) -> None:
+    """
+    Поиск и вывод информации о странах для каждой строки входного файла.
+
+    :param input_file: Файл со строками для поиска
+    :param str output_format: Формат вывода
+    """
+
+    try:
+        async for location, location_info in Reader().find_many(
+            read_locations(input_file)
+        ):
+            if output_format == "json":
+                click.echo(to_json_line(location, location_info))
+            elif isinstance(location_info, Exception):
+                click.secho(f"\n{location}", fg="cyan")
+                click.secho(f"Ошибка при поиске данных: {location_info}", fg="red")
+            else:
+                click.secho(f"\n{location}", fg="cyan")
+                await show_location_info(location_info)
+    finally:
+        # ожидание фоновой актуализации устаревших данных
+        await refresh_queue.drain(settings.REFRESH_TIMEOUT)
+        await session_manager.close()
+
+
+if __name__ == "__main__":
+    # запуск обработки входного файла
+    # pylint: disable=E1120
+    process_batch(_anyio_backend="asyncio")
@@ -0,0 +1,80 @@
+"""
+Сравнение производительности хранилищ кэша.
+
+Запуск (из директории ``src``):
+
+.. code-block:: console
+
+    python -m benchmarks.cache_backends --keys 250
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from collectors.storage import CacheBackend, FileSystemBackend, MemoryBackend, SqliteBackend
+
+# данные о погоде для одной локации
+PAYLOAD = {
+    "main": {"temp": 13.92, "pressure": 1023, "humidity": 54},
+    "wind": {"speed": 4.63},
+    "weather": [{"description": "scattered clouds"}],
+    "visibility": 10000,
+    "timezone": 7200,
+}
+
+
+async def measure(operation: Callable[[], Awaitable[object]]) -> float:
+    """
+    Замер времени выполнения операции.
+
+    :param operation: Операция
+    :return: Время выполнения (в миллисекундах)
+    """
+
+    started = time.perf_counter()
+    await operation()
+    return (time.perf_counter() - started) * 1000
+
+
+async def benchmark(backend: CacheBackend, keys: list[str]) -> dict[str, float]:
+    """
+    Замер времени основных операций хранилища.
+
+    :param backend: Хранилище
+    :param keys: Ключи данных
+    :return: Время операций (в миллисекундах) по названиям операций
+    """
+
+    try:
+        return {
+            "put_many": await measure(lambda: backend.put_many("weather", {key: PAYLOAD for key in keys})),
+            "fresh_keys": await measure(lambda: backend.fresh_keys("weather", keys, ttl=60)),
+            "get_many": await measure(lambda: backend.get_many("weather", keys)),
+            "get (each)": await measure(lambda: asyncio.gather(*(backend.get("weather", key) for key in keys))),
+        }
+    finally:
+        await backend.close()
+
+
+async def main(count: int) -> None:
+    keys = [f"capital_{number}" for number in range(count)]
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        backends: dict[str, CacheBackend] = {
+            "files": FileSystemBackend(root),
+            "memory": MemoryBackend(capacity=count),
+            "sqlite": SqliteBackend(root.joinpath("snapshots.sqlite3")),
+        }
+        for name, backend in backends.items():
+            timings = await benchmark(backend, keys)
+            print(f"{name:<8}" + "".join(f"{operation:>12}: {value:8.2f} ms" for operation, value in timings.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=250, help="Количество ключей")
+    asyncio.run(main(parser.parse_args().keys))
@@ -0,0 +1,187 @@
+"""
+Сравнение кодеков сохраняемых данных: время декодирования и чтения данных каждого сборщика
+(чтение файлов, декодирование и построение моделей данных).
+
+Запуск (из директории ``src``):
+
+.. code-block:: console
+
+    python -m benchmarks.codecs --countries 250 --repeat 5
+"""
+
+import argparse
+import asyncio
+import itertools
+import string
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from collectors import codecs as codecs_module, storage as storage_module
+from collectors.codecs import CODECS, get_codec
+from collectors.collector import (
+    CityCollector,
+    CountryCollector,
+    CurrencyRatesCollector,
+    NewsCollector,
+    WeatherCollector,
+)
+from collectors.models import LocationDTO
+
+# данные о погоде для одной локации
+WEATHER = {
+    "main": {"temp": 13.92, "pressure": 1023, "humidity": 54},
+    "wind": {"speed": 4.63},
+    "weather": [{"description": "scattered clouds"}],
+    "visibility": 10000,
+    "timezone": 7200,
+}
+# данные об одной новости
+ARTICLE = {
+    "author": "Jane Doe",
+    "title": "Lorem ipsum dolor sit amet",
+    "description": "Consectetur adipiscing elit, sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.",
+    "publishedAt": "2024-06-06T10:57:25Z",
+    "content": "Ut enim ad minim veniam, quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo.",
+    "url": "https://example.com/news/lorem-ipsum",
+}
+
+
+def get_country(alpha2code: str) -> dict:
+    """
+    Получение данных об одной стране.
+
+    :param alpha2code: Код страны
+    :return:
+    """
+
+    return {
+        "capital": f"Capital {alpha2code}",
+        "alpha2code": alpha2code,
+        "alt_spellings": [alpha2code, f"Country {alpha2code}", f"Republic of {alpha2code}"],
+        "area": 45227.0,
+        "currencies": [{"code": "EUR"}],
+        "flag": f"http://assets.promptapi.com/flags/{alpha2code}.svg",
+        "languages": [{"name": "Estonian", "native_name": "eesti"}],
+        "name": f"Country {alpha2code}",
+        "population": 1315944,
+        "subregion": "Northern Europe",
+        "timezones": ["UTC+02:00"],
+    }
+
+
+def get_city(location: LocationDTO) -> dict:
+    """
+    Получение данных о столице страны.
+
+    :param location: Локация
+    :return:
+    """
+
+    return {
+        "country": {"code": location.alpha2code, "name": f"Country {location.alpha2code}"},
+        "geo_id": 588409,
+        "latitude": 59.436958,
+        "longitude": 24.753531,
+        "name": location.capital,
+        "state_or_region": "Harjumaa",
+    }
+
+
+async def measure(operation: Callable[[], Awaitable[object]], repeat: int) -> float:
+    """
+    Замер лучшего времени выполнения операции.
+
+    :param operation: Операция
+    :param repeat: Количество повторов
+    :return: Время выполнения (в миллисекундах)
+    """
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await operation()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return min(timings)
+
+
+async def benchmark(name: str, count: int, repeat: int) -> dict[str, tuple[float, float]]:
+    """
+    Замер времени декодирования и чтения данных сборщиков одним кодеком.
+
+    :param name: Название кодека
+    :param count: Количество стран
+    :param repeat: Количество повторов каждого замера
+    :return: Время декодирования и чтения (в миллисекундах) по названиям сборщиков
+    """
+
+    codec = get_codec(name)
+    codes = ["".join(pair) for pair in itertools.product(string.ascii_uppercase, repeat=2)][:count]
+    countries = [get_country(code) for code in codes]
+    locations = [LocationDTO(capital=country["capital"], alpha2code=country["alpha2code"]) for country in countries]
+    news_keys = [NewsCollector.get_key(country["name"], country["alpha2code"]) for country in countries]
+    # данные сборщиков по названиям сборщиков и ключам
+    data: dict[str, dict[str, Any]] = {
+        CountryCollector.name: {CountryCollector.cache_key: countries},
+        CurrencyRatesCollector.name: {
+            CurrencyRatesCollector.cache_key: {
+                "base": "RUB",
+                "date": "2024-06-06",
+                "rates": {f"{code}X": 0.0112 for code in codes},
+            }
+        },
+        WeatherCollector.name: {await WeatherCollector.get_key(location): WEATHER for location in locations},
+        CityCollector.name: {await CityCollector.get_key(location): get_city(location) for location in locations},
+        NewsCollector.name: {key: {"totalResults": 20, "articles": [ARTICLE] * 20} for key in news_keys},
+    }
+    # чтение всех данных сборщика
+    reads: dict[str, Callable[[], Awaitable[object]]] = {
+        CountryCollector.name: CountryCollector.read,
+        CurrencyRatesCollector.name: CurrencyRatesCollector.read,
+        WeatherCollector.name: lambda: asyncio.gather(*(WeatherCollector.read(location) for location in locations)),
+        CityCollector.name: lambda: asyncio.gather(*(CityCollector.read(location) for location in locations)),
+        NewsCollector.name: lambda: asyncio.gather(*(NewsCollector.read(key) for key in news_keys)),
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        # сборщики читают данные из хранилища, созданного по настройкам
+        codecs_module.settings.CACHE_CODEC = name
+        storage_module.settings.CACHE_BACKEND = "files"
+        storage_module.settings.MEDIA_ABSOLUTE_PATH = Path(directory)
+        backend = storage_module.get_cache_backend()
+        for collector in (CountryCollector, CurrencyRatesCollector, WeatherCollector, CityCollector, NewsCollector):
+            await backend.put_many(collector.namespace, data[collector.name])
+
+        result = {}
+        for collector_name, read in reads.items():
+            contents = [codec.dumps(payload) for payload in data[collector_name].values()]
+
+            async def decode() -> None:
+                for content in contents:
+                    codec.loads(content)
+
+            result[collector_name] = (await measure(decode, repeat), await measure(read, repeat))
+
+        return result
+
+
+async def main(count: int, repeat: int) -> None:
+    for name in CODECS:
+        try:
+            timings = await benchmark(name, count, repeat)
+        except RuntimeError as exception:
+            print(f"{name:<8}{exception}")
+            continue
+
+        for collector_name, (decode, read) in timings.items():
+            print(f"{name:<8}{collector_name:<16}decode: {decode:8.2f} ms    read + decode + build: {read:8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--countries", type=int, default=250, help="Количество стран")
+    parser.add_argument("--repeat", type=int, default=5, help="Количество повторов каждого замера")
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.countries, arguments.repeat))
@@ -0,0 +1,133 @@
+"""
+Сравнение моделей pydantic и моделей для чтения (см. :mod:`collectors.records`) на полном списке стран:
+время создания, занимаемая память и время хэширования (построения множества) моделей.
+
+Модели pydantic создаются с проверкой данных, как при чтении сохраненных данных сборщиками,
+а модели для чтения – по значениям полей, как при чтении снимка данных о странах
+(данные о странах в обоих случаях декодируются из сохраненного вида: JSON и снимка).
+
+Запуск (из директории ``src``):
+
+.. code-block:: console
+
+    python -m benchmarks.read_models --countries 250 --repeat 5
+"""
+
+import argparse
+import itertools
+import json
+import pickle
+import string
+import time
+import tracemalloc
+from dataclasses import asdict, astuple
+from typing import Callable
+
+from benchmarks.codecs import ARTICLE, WEATHER, get_country
+from collectors.collector import CountryCollector
+from collectors.models import LocationDTO, NewsDTO, WeatherInfoDTO
+from collectors.records import CountryRecord, LocationRecord, NewsRecord, WeatherRecord
+
+
+def measure(operation: Callable[[], object], repeat: int) -> float:
+    """
+    Замер лучшего времени выполнения операции.
+
+    :param operation: Операция
+    :param repeat: Количество повторов
+    :return: Время выполнения (в миллисекундах)
+    """
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return min(timings)
+
+
+def measure_memory(operation: Callable[[], object]) -> float:
+    """
+    Замер памяти, занимаемой результатом операции.
+
+    :param operation: Операция
+    :return: Объем памяти (в килобайтах)
+    """
+
+    tracemalloc.start()
+    try:
+        result = operation()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+
+    return size / 1024
+
+
+def benchmark(count: int, repeat: int) -> dict[str, dict[str, tuple[float, float, float]]]:
+    """
+    Замер времени создания, памяти и времени хэширования моделей.
+
+    :param count: Количество стран
+    :param repeat: Количество повторов каждого замера
+    :return: Время создания (в миллисекундах), память (в килобайтах) и время хэширования (в миллисекундах)
+        по названиям моделей и представлениям
+    """
+
+    codes = ["".join(pair) for pair in itertools.product(string.ascii_uppercase, repeat=2)][:count]
+    items = [get_country(code) for code in codes]
+    # значения полей стран в том виде, в каком они хранятся в снимке
+    rows = pickle.dumps([astuple(CountryRecord.from_dto(country)) for country in CountryCollector.build(items)])
+    content = json.dumps(items)
+    locations = [(item["capital"], item["alpha2code"]) for item in items]
+    weather = WeatherRecord.from_payload(WEATHER)
+    weather_fields = asdict(weather)
+
+    # создание моделей в каждом представлении
+    builders: dict[str, dict[str, Callable[[], list]]] = {
+        "country": {
+            "pydantic": lambda: CountryCollector.build(json.loads(content)),
+            "record": lambda: [CountryRecord(*row) for row in pickle.loads(rows)],
+        },
+        "location": {
+            "pydantic": lambda: [LocationDTO(capital=capital, alpha2code=code) for capital, code in locations],
+            "record": lambda: [LocationRecord(capital, code) for capital, code in locations],
+        },
+        "weather": {
+            "pydantic": lambda: [WeatherInfoDTO(**weather_fields) for _ in items],
+            "record": lambda: [WeatherRecord.from_payload(WEATHER) for _ in items],
+        },
+        "news": {
+            "pydantic": lambda: [NewsDTO(**ARTICLE) for _ in items],
+            "record": lambda: [NewsRecord.from_payload(ARTICLE) for _ in items],
+        },
+    }
+
+    result: dict[str, dict[str, tuple[float, float, float]]] = {}
+    for name, representations in builders.items():
+        result[name] = {}
+        for representation, build in representations.items():
+            models = build()
+            hashing = measure(lambda: set(models), repeat) if name == "location" else 0.0
+            result[name][representation] = (measure(build, repeat), measure_memory(build), hashing)
+
+    return result
+
+
+def main(count: int, repeat: int) -> None:
+    for name, representations in benchmark(count, repeat).items():
+        for representation, (build, memory, hashing) in representations.items():
+            print(
+                f"{name:<10}{representation:<10}build: {build:8.2f} ms    memory: {memory:8.1f} KiB"
+                + (f"    hash: {hashing:6.2f} ms" if hashing else "")
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--countries", type=int, default=250, help="Количество стран")
+    parser.add_argument("--repeat", type=int, default=5, help="Количество повторов каждого замера")
+    arguments = parser.parse_args()
+    main(arguments.countries, arguments.repeat)
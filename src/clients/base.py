@@ -2,8 +2,132 @@
 Базовые функции для клиентов внешних сервисов.
 """
 
+import asyncio
+import logging
+import re
 from abc import ABC, abstractmethod
-from typing import Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http import HTTPStatus
+from typing import Any, Iterator, Mapping, Optional
+
+import aiohttp
+
+from clients.breaker import CircuitBreaker, get_circuit_breaker
+from clients.flight import get_request_key, single_flight
+from clients.policy import RETRY_STATUSES, get_backoff, get_rate_limiter, parse_retry_after
+from clients.session import SessionManager, session_manager as default_session_manager
+from settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class ConditionalRequest:
+    """
+    Условный запрос: валидаторы сохраненного ответа (``etag``, ``last_modified``) отправляются сервису,
+    и, если данные не изменились, сервис отвечает статусом 304 без содержимого.
+
+    Валидаторы хранятся в виде словаря:
+
+    .. code-block::
+
+        {
+            "etag": '"33a64df551425fcc55e4d42a148795d9f25f89d4"',
+            "last_modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+            "max_age": 86400,
+        }
+    """
+
+    def __init__(self, validators: Optional[dict[str, Any]] = None) -> None:
+        """
+        Конструктор.
+
+        :param validators: Валидаторы сохраненного ответа
+        """
+
+        self.validators = validators or {}
+        # валидаторы полученного ответа
+        self.response_validators: dict[str, Any] = {}
+        # данные не изменились (ответ со статусом 304)
+        self.not_modified = False
+
+    def get_headers(self) -> dict[str, str]:
+        """
+        Получение заголовков условного запроса.
+
+        :return:
+        """
+
+        headers = {}
+        if etag := self.validators.get("etag"):
+            headers["If-None-Match"] = etag
+        if last_modified := self.validators.get("last_modified"):
+            headers["If-Modified-Since"] = last_modified
+
+        return headers
+
+    def update(self, status: int, headers: Mapping[str, str]) -> None:
+        """
+        Сохранение валидаторов и статуса полученного ответа.
+
+        :param status: Статус ответа сервиса
+        :param headers: Заголовки ответа сервиса
+        :return:
+        """
+
+        self.not_modified = status == HTTPStatus.NOT_MODIFIED
+        validators: dict[str, Any] = {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+        }
+        if match := re.search(r"max-age=(\d+)", headers.get("Cache-Control", "")):
+            validators["max_age"] = int(match.group(1))
+        if self.not_modified:
+            # ответ 304 может не содержать часть валидаторов, тогда они остаются прежними
+            validators = {**self.validators, **{name: value for name, value in validators.items() if value}}
+
+        self.response_validators = {name: value for name, value in validators.items() if value}
+
+
+# условный запрос, выполняемый в текущей задаче (см. :func:`conditional_request`)
+_conditional_request: ContextVar[Optional[ConditionalRequest]] = ContextVar(
+    "conditional_request", default=None
+)
+
+
+@contextmanager
+def conditional_request(validators: Optional[dict[str, Any]] = None) -> Iterator[ConditionalRequest]:
+    """
+    Выполнение запросов клиентов внутри блока как условных.
+
+    .. code-block::
+
+        with conditional_request(validators) as request:
+            result = await client.get_countries()
+        if request.not_modified:
+            ...
+
+    :param validators: Валидаторы сохраненного ответа
+    :return: Условный запрос с валидаторами и статусом полученного ответа
+    """
+
+    request = ConditionalRequest(validators)
+    token = _conditional_request.set(request)
+    try:
+        yield request
+    finally:
+        _conditional_request.reset(token)
+
+
+def get_conditional_request() -> Optional[ConditionalRequest]:
+    """
+    Получение условного запроса, выполняемого в текущей задаче (см. :func:`conditional_request`).
+
+    :return: Условный запрос или None, если запросы выполняются как безусловные
+    """
+
+    return _conditional_request.get()
 
 
 class BaseClient(ABC):
@@ -11,6 +135,20 @@ class BaseClient(ABC):
     Базовый класс, реализующий интерфейс для клиентов.
     """
 
+    # провайдер данных: частота запросов ограничивается для каждого провайдера (см. :mod:`clients.policy`)
+    PROVIDER: str = ""
+    # базовый URL сервиса: запросы к каждому сервису отключаются при его отказе (см. :mod:`clients.breaker`)
+    BASE_URL: str = ""
+
+    def __init__(self, session_manager: Optional[SessionManager] = None) -> None:
+        """
+        Конструктор.
+
+        :param session_manager: Менеджер HTTP-сессии (по умолчанию – общий для всех клиентов)
+        """
+
+        self.session_manager = session_manager or default_session_manager
+
     @abstractmethod
     async def get_base_url(self) -> str:
         """
@@ -27,3 +165,132 @@ class BaseClient(ABC):
         :param endpont:
         :return:
         """
+
+    def get_circuit_breaker(self) -> CircuitBreaker:
+        """
+        Получение выключателя запросов к сервису клиента.
+
+        :return:
+        """
+
+        return get_circuit_breaker(self.BASE_URL)
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Получение HTTP-сессии для выполнения запросов.
+
+        :return:
+        """
+
+        return await self.session_manager.get_session()
+
+    async def _get(
+        self,
+        endpoint: str,
+        params: Optional[dict[str, str]] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> Optional[Any]:
+        """
+        Выполнение GET-запроса через общую сессию.
+
+        Одинаковые одновременные запросы (с теми же URL, параметрами и заголовками) объединяются:
+        выполняется только первый из них, остальные получают его результат (см. :mod:`clients.flight`).
+
+        :param endpoint: URL запроса
+        :param params: Параметры запроса
+        :param headers: Заголовки запроса
+        :return: Содержимое ответа или None, если запрос неуспешен или данные не изменились
+        """
+
+        if (conditional := _conditional_request.get()) is not None:
+            headers = {**(headers or {}), **conditional.get_headers()}
+
+        if settings.HTTP_SINGLE_FLIGHT:
+            result, response = await single_flight.do(
+                get_request_key(endpoint, params, headers),
+                lambda: self._get_with_retries(endpoint, params, headers),
+            )
+        else:
+            result, response = await self._get_with_retries(endpoint, params, headers)
+
+        # статус и валидаторы ответа сохраняются для каждого вызывающего, в том числе объединенного
+        if conditional is not None and response is not None:
+            conditional.update(*response)
+
+        return result
+
+    async def _get_with_retries(
+        self,
+        endpoint: str,
+        params: Optional[dict[str, str]] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> tuple[Optional[Any], Optional[tuple[int, Mapping[str, str]]]]:
+        """
+        Выполнение GET-запроса с повторными попытками.
+
+        Запрос выполняется с ограничением частоты запросов к провайдеру и повторяется
+        (не больше ``HTTP_RETRIES`` раз) при ошибке соединения, превышении времени ожидания
+        или временной ошибке сервиса (429, 5xx) с учетом заголовка ``Retry-After``.
+        Если выключатель запросов к сервису разомкнут, то запрос не выполняется.
+
+        :param endpoint: URL запроса
+        :param params: Параметры запроса
+        :param headers: Заголовки запроса
+        :return: Содержимое ответа (None, если запрос неуспешен или данные не изменились),
+            статус и заголовки последнего полученного ответа
+        """
+
+        # статус и заголовки последнего полученного ответа
+        last_response: Optional[tuple[int, Mapping[str, str]]] = None
+        rate_limiter = get_rate_limiter(self.PROVIDER)
+        breaker = self.get_circuit_breaker()
+        session = await self.get_session()
+        for attempt in range(settings.HTTP_RETRIES + 1):
+            if (probe := breaker.acquire()) is None:
+                logger.info("Запросы к сервису %s отключены после ошибок, запрос пропущен", self.BASE_URL)
+                return None, last_response
+
+            retry_after = None
+            # результат запроса для выключателя (None – не учитывается)
+            success: Optional[bool] = None
+            try:
+                await rate_limiter.acquire()
+                async with session.get(endpoint, params=params, headers=headers) as response:
+                    last_response = response.status, response.headers
+                    # ответ без ошибки сервера (в том числе 4xx) означает, что сервис работает
+                    success = response.status < HTTPStatus.INTERNAL_SERVER_ERROR
+                    if response.status == HTTPStatus.OK:
+                        return await response.json(), last_response
+                    if response.status not in RETRY_STATUSES:
+                        if response.status != HTTPStatus.NOT_MODIFIED:
+                            logger.warning("Ошибка запроса %s: статус %s", endpoint, response.status)
+                        return None, last_response
+                    if response.status == HTTPStatus.TOO_MANY_REQUESTS:
+                        # превышение квоты не является отказом сервиса
+                        success = None
+
+                    error = f"статус {response.status}"
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exception:
+                success = False
+                error = repr(exception)
+            finally:
+                breaker.record(success, probe)
+
+            if attempt == settings.HTTP_RETRIES:
+                break
+            if retry_after is not None:
+                if retry_after > settings.HTTP_BACKOFF_MAX:
+                    logger.warning("Сервис %s недоступен еще %.0f с, запрос отменен", endpoint, retry_after)
+                    return None, last_response
+                # запросы к провайдеру приостанавливаются для всех клиентов
+                rate_limiter.pause(retry_after)
+
+            delay = max(get_backoff(attempt), retry_after or 0.0)
+            logger.info(
+                "Ошибка запроса %s (%s), повторная попытка через %.1f с", endpoint, error, delay
+            )
+            await asyncio.sleep(delay)
+
+        logger.warning("Ошибка запроса %s (%s), попытки исчерпаны", endpoint, error)
+        return None, last_response
@@ -0,0 +1,185 @@
+"""
+Автоматический выключатель (circuit breaker) запросов к внешним сервисам.
+
+Если сервис перестал отвечать, то после нескольких ошибок подряд запросы к нему не выполняются
+(сразу возвращается отказ), пока не истечет время восстановления. Затем выполняются пробные запросы:
+при успешном ответе запросы возобновляются, при ошибке выключатель снова размыкается.
+"""
+
+import time
+from enum import Enum
+from typing import NamedTuple, Optional
+
+from settings import get_settings
+
+settings = get_settings()
+
+
+class CircuitState(str, Enum):
+    """
+    Состояние выключателя.
+    """
+
+    # запросы выполняются
+    CLOSED = "closed"
+    # запросы не выполняются
+    OPEN = "open"
+    # выполняются пробные запросы
+    HALF_OPEN = "half_open"
+
+
+class CircuitStats(NamedTuple):
+    """
+    Статистика выключателя.
+    """
+
+    state: CircuitState
+    # количество ошибок подряд
+    consecutive_failures: int
+    # общее количество успешных и неуспешных запросов
+    successes: int
+    failures: int
+    # количество запросов, не выполненных из-за разомкнутого выключателя
+    short_circuited: int
+    # время (timestamp), после которого будут выполняться пробные запросы (для разомкнутого выключателя)
+    retry_at: Optional[float]
+
+
+class CircuitBreaker:
+    """
+    Выключатель запросов к одному сервису.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, half_open_requests: int = 1) -> None:
+        """
+        Конструктор.
+
+        :param failure_threshold: Количество ошибок подряд, после которого выключатель размыкается (0 – никогда)
+        :param reset_timeout: Время, в течение которого запросы не выполняются (в секундах)
+        :param half_open_requests: Максимальное количество одновременных пробных запросов
+        """
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_requests = max(half_open_requests, 1)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._consecutive_failures = 0
+        self._successes = 0
+        self._failures = 0
+        self._short_circuited = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """
+        Текущее состояние выключателя.
+
+        :return:
+        """
+
+        if self._state is CircuitState.OPEN and time.monotonic() >= self._opened_at + self.reset_timeout:
+            self._state = CircuitState.HALF_OPEN
+            self._probes = 0
+
+        return self._state
+
+    def acquire(self) -> Optional[bool]:
+        """
+        Получение разрешения на выполнение запроса.
+
+        :return: None, если запрос выполнять нельзя, иначе – признак пробного запроса
+        """
+
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return False
+        if state is CircuitState.HALF_OPEN and self._probes < self.half_open_requests:
+            self._probes += 1
+            return True
+
+        self._short_circuited += 1
+        return None
+
+    def record(self, success: Optional[bool], probe: bool = False) -> None:
+        """
+        Учет результата выполненного запроса.
+
+        :param success: Признак успешного запроса (None – результат не учитывается, например, запрос отменен)
+        :param probe: Признак пробного запроса (см. :meth:`acquire`)
+        :return:
+        """
+
+        if probe:
+            self._probes = max(self._probes - 1, 0)
+
+        if success is None:
+            return
+        if success:
+            self._successes += 1
+            self._consecutive_failures = 0
+            if probe:
+                self._state = CircuitState.CLOSED
+            return
+
+        self._failures += 1
+        self._consecutive_failures += 1
+        if probe or (
+            self._state is CircuitState.CLOSED
+            and 0 < self.failure_threshold <= self._consecutive_failures
+        ):
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> CircuitStats:
+        """
+        Получение статистики выключателя.
+
+        :return:
+        """
+
+        state = self.state
+        retry_at = None
+        if state is CircuitState.OPEN:
+            retry_at = time.time() + self._opened_at + self.reset_timeout - time.monotonic()
+
+        return CircuitStats(
+            state=state,
+            consecutive_failures=self._consecutive_failures,
+            successes=self._successes,
+            failures=self._failures,
+            short_circuited=self._short_circuited,
+            retry_at=retry_at,
+        )
+
+
+# выключатели по базовым URL сервисов
+_circuit_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(base_url: str) -> CircuitBreaker:
+    """
+    Получение общего для процесса выключателя запросов к сервису.
+
+    :param base_url: Базовый URL сервиса (для пустого URL выключатель никогда не размыкается)
+    :return:
+    """
+
+    if base_url not in _circuit_breakers:
+        _circuit_breakers[base_url] = CircuitBreaker(
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD if base_url else 0,
+            reset_timeout=settings.CIRCUIT_RESET_TIMEOUT,
+            half_open_requests=settings.CIRCUIT_HALF_OPEN_REQUESTS,
+        )
+
+    return _circuit_breakers[base_url]
+
+
+def get_circuit_stats() -> dict[str, CircuitStats]:
+    """
+    Получение статистики всех выключателей.
+
+    :return: Статистика по базовым URL сервисов
+    """
+
+    return {base_url: breaker.stats() for base_url, breaker in _circuit_breakers.items()}
@@ -2,13 +2,9 @@
 Функции для взаимодействия с внешним сервисом-провайдером данных о городах.
 """
 
-from http import HTTPStatus
 from typing import Optional
 
-import aiohttp
-
 from clients.base import BaseClient
-from logger import trace_config
 from settings import get_settings
 
 settings = get_settings()
@@ -19,16 +15,16 @@ class CityClient(BaseClient):
     Реализация функций для взаимодействия с внешним сервисом-провайдером данных о городах.
     """
 
+    PROVIDER = "apilayer"
     BASE_URL = "https://api.apilayer.com/geo/city"
 
     async def get_base_url(self) -> str:
         return self.BASE_URL
 
-    async def _request(self, endpoint: str) -> Optional[dict]:  # type: ignore[return]
-        async with aiohttp.ClientSession(trace_configs=[trace_config]) as session:
-            async with session.get(endpoint, headers=(await self.headers)) as response:
-                if response.status == HTTPStatus.OK:
-                    return await response.json()[0]
+    async def _request(self, endpoint: str) -> Optional[dict]:
+        # сервис возвращает список найденных городов
+        result = await self._get(endpoint, headers=(await self.headers))
+        return result[0] if result else None
 
     async def get_city_info(self, city_name: str) -> Optional[dict]:
         """
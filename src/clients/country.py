@@ -1,13 +1,9 @@
 """
 Функции для взаимодействия с внешним сервисом-провайдером данных о странах.
 """
-from http import HTTPStatus
-from typing import Optional
-
-import aiohttp
+from typing import Any, Optional
 
 from clients.base import BaseClient
-from logger import trace_config
 from settings import get_settings
 
 settings = get_settings()
@@ -18,27 +14,25 @@ class CountryClient(BaseClient):
     Реализация функций для взаимодействия с внешним сервисом-провайдером данных о странах.
     """
 
+    PROVIDER = "apilayer"
     BASE_URL = "https://api.apilayer.com/geo/country"
 
     async def get_base_url(self) -> str:
         return self.BASE_URL
 
-    async def _request(self, endpoint: str) -> Optional[dict]:  # type: ignore[return]
+    async def _request(self, endpoint: str) -> Optional[Any]:
 
         # формирование заголовков запроса
         headers = {"apikey": settings.API_KEY_APILAYER}
 
-        async with aiohttp.ClientSession(trace_configs=[trace_config]) as session:
-            async with session.get(endpoint, headers=headers) as response:
-                if response.status == HTTPStatus.OK:
-                    return await response.json()
+        return await self._get(endpoint, headers=headers)
 
-    async def get_countries(self, bloc: str = "eu") -> Optional[dict]:
+    async def get_countries(self, bloc: str = "eu") -> Optional[list[dict]]:
         """
         Получение данных о странах.
 
-        :param bloc: Регион
-        :return:
+        :param bloc: Региональное объединение
+        :return: Список стран объединения
         """
 
         return await self._request(f"{await self.get_base_url()}/regional_bloc/{bloc}")
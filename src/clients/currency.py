@@ -1,13 +1,9 @@
 """
 Функции для взаимодействия с внешним сервисом-провайдером данных о курсах валют.
 """
-from http import HTTPStatus
 from typing import Optional
 
-import aiohttp
-
 from clients.base import BaseClient
-from logger import trace_config
 from settings import get_settings
 
 settings = get_settings()
@@ -18,20 +14,18 @@ class CurrencyClient(BaseClient):
     Реализация функций для взаимодействия с внешним сервисом-провайдером данных о курсах валют.
     """
 
+    PROVIDER = "apilayer"
     BASE_URL = "https://api.apilayer.com/fixer/latest"
 
     async def get_base_url(self) -> str:
         return self.BASE_URL
 
-    async def _request(self, endpoint: str) -> Optional[dict]:  # type: ignore[return]
+    async def _request(self, endpoint: str) -> Optional[dict]:
 
         # формирование заголовков запроса
         headers = {"apikey": settings.API_KEY_APILAYER}
 
-        async with aiohttp.ClientSession(trace_configs=[trace_config]) as session:
-            async with session.get(endpoint, headers=headers) as response:
-                if response.status == HTTPStatus.OK:
-                    return await response.json()
+        return await self._get(endpoint, headers=headers)
 
     async def get_rates(self, base: str = "rub") -> Optional[dict]:
         """
@@ -0,0 +1,154 @@
+"""
+Объединение одинаковых одновременных запросов к внешним сервисам (single-flight).
+
+Если запрос с тем же ключом уже выполняется (например, два поиска одной страны запрашивают
+информацию об одной столице, или чтение данных совпало по времени со сбором), то повторный запрос
+не выполняется: все вызывающие ожидают результат первого запроса.
+"""
+
+import asyncio
+from functools import partial
+from typing import Any, Awaitable, Callable, Hashable, NamedTuple, Optional
+
+
+class FlightStats(NamedTuple):
+    """
+    Статистика объединения запросов.
+    """
+
+    # общее количество запросов
+    calls: int
+    # количество запросов, получивших результат уже выполняющегося запроса
+    deduplicated: int
+    # количество выполняющихся запросов
+    in_flight: int
+
+
+class _Flight:
+    """
+    Выполняющийся запрос и количество ожидающих его результат.
+    """
+
+    def __init__(self, task: asyncio.Task) -> None:
+        """
+        Конструктор.
+
+        :param task: Задача выполнения запроса
+        """
+
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Объединение одновременных вызовов с одинаковым ключом.
+    """
+
+    def __init__(self) -> None:
+        """
+        Конструктор.
+        """
+
+        self._flights: dict[Hashable, _Flight] = {}
+        self._calls = 0
+        self._deduplicated = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Выполнение вызова или ожидание результата уже выполняющегося вызова с тем же ключом.
+
+        Вызов выполняется в отдельной задаче, поэтому отмена одного из ожидающих не прерывает его
+        для остальных; вызов отменяется, только если его результат больше никто не ожидает.
+
+        :param key: Ключ вызова
+        :param func: Функция, возвращающая корутину вызова
+        :return: Результат вызова
+        """
+
+        self._calls += 1
+        flight = self._flights.get(key)
+        # задача, созданная в другом (уже завершенном) цикле событий, не может быть продолжена
+        if flight is None or flight.task.get_loop() is not asyncio.get_running_loop():
+            flight = self._flights[key] = _Flight(asyncio.ensure_future(func()))
+            flight.task.add_done_callback(partial(self._done, key, flight))
+        else:
+            self._deduplicated += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                self._forget(key, flight)
+                flight.task.cancel()
+
+    def _done(self, key: Hashable, flight: _Flight, task: asyncio.Task) -> None:
+        """
+        Обработка завершения задачи вызова.
+
+        :param key: Ключ вызова
+        :param flight: Вызов
+        :param task: Завершенная задача
+        :return:
+        """
+
+        self._forget(key, flight)
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        """
+        Удаление завершенного вызова: следующий вызов с тем же ключом будет выполнен заново.
+
+        :param key: Ключ вызова
+        :param flight: Завершенный вызов
+        :return:
+        """
+
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> FlightStats:
+        """
+        Получение статистики объединения вызовов.
+
+        :return:
+        """
+
+        return FlightStats(calls=self._calls, deduplicated=self._deduplicated, in_flight=len(self._flights))
+
+
+# объединение запросов всех клиентов процесса
+single_flight = SingleFlight()
+
+
+def get_flight_stats() -> FlightStats:
+    """
+    Получение статистики объединения запросов к внешним сервисам.
+
+    :return:
+    """
+
+    return single_flight.stats()
+
+
+def get_request_key(
+    endpoint: str,
+    params: Optional[dict[str, str]] = None,
+    headers: Optional[dict[str, str]] = None,
+) -> Hashable:
+    """
+    Получение ключа запроса: запросы объединяются, только если совпадают URL, параметры и заголовки
+    (в том числе валидаторы условного запроса).
+
+    :param endpoint: URL запроса
+    :param params: Параметры запроса
+    :param headers: Заголовки запроса
+    :return:
+    """
+
+    return (
+        endpoint,
+        tuple(sorted((params or {}).items())),
+        tuple(sorted((headers or {}).items())),
+    )
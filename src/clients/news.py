@@ -2,13 +2,9 @@
 Функции для взаимодействия с внешним сервисом-провайдером
 получения последних новостей в стране.
 """
-from http import HTTPStatus
 from typing import Optional
 
-import aiohttp
-
 from clients.base import BaseClient
-from logger import trace_config
 from settings import get_settings
 
 settings = get_settings()
@@ -78,20 +74,18 @@ class NewsClient(BaseClient):
     получения последних новостей в стране.
     """
 
+    PROVIDER = "newsapi"
     BASE_URL = "https://newsapi.org/v2/top-headlines"
 
     async def get_base_url(self) -> str:
         return self.BASE_URL
 
-    async def _request(self, endpoint: str, country: str = "ru") -> Optional[dict]:  # type: ignore[return]
+    async def _request(self, endpoint: str, country: str = "ru") -> Optional[dict]:
 
         # формирование параметров запроса
         params = self._get_query_params(country)
 
-        async with aiohttp.ClientSession(trace_configs=[trace_config]) as session:
-            async with session.get(endpoint, params=params) as response:
-                if response.status == HTTPStatus.OK:
-                    return await response.json()
+        return await self._get(endpoint, params=params)
 
     def _get_query_params(self, country: str) -> dict[str, str]:
         return {
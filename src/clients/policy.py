@@ -0,0 +1,251 @@
+"""
+Ограничение частоты запросов и повторные попытки запросов к внешним сервисам.
+
+У каждого провайдера данных (APILayer, OpenWeather, NewsAPI) свои квоты, поэтому частота запросов
+ограничивается отдельно для каждого провайдера (общим для всех его клиентов ограничителем).
+
+Сборщики получают разрешение на первый запрос для ключа заранее (см. :func:`prepaid`),
+чтобы ожидание в очереди ограничителя не учитывалось во времени ожидания данных для ключа.
+"""
+
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import Iterator, Optional
+
+from settings import get_settings
+
+settings = get_settings()
+
+# статусы ответов, при которых запрос повторяется
+RETRY_STATUSES = frozenset(
+    {
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.INTERNAL_SERVER_ERROR,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }
+)
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты запросов («корзина токенов»): не больше ``rate`` запросов в секунду
+    с возможностью кратковременного превышения до ``capacity`` запросов.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """
+        Конструктор.
+
+        :param rate: Количество запросов в секунду (0 – без ограничения)
+        :param capacity: Максимальное количество запросов, выполняемых без ожидания
+        """
+
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        # время, до которого запросы приостановлены (например, по заголовку Retry-After)
+        self._paused_until = 0.0
+
+    async def acquire(self) -> None:
+        """
+        Ожидание разрешения на выполнение запроса.
+
+        Если разрешение получено заранее (см. :func:`prepaid`), то оно используется без ожидания.
+        Если ожидание прервано (отмена задачи), то зарезервированный токен возвращается.
+
+        :return:
+        """
+
+        if (reservation := _reservation.get()) is not None and reservation.use(self):
+            return
+
+        if (delay := self._reserve()) > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.refund()
+                raise
+
+    async def reserve(self) -> "Reservation":
+        """
+        Получение разрешения на выполнение запроса заранее (см. :func:`prepaid`).
+
+        :return:
+        """
+
+        await self.acquire()
+        return Reservation(self)
+
+    def refund(self) -> None:
+        """
+        Возврат неиспользованного токена.
+
+        :return:
+        """
+
+        if self.rate > 0:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def pause(self, delay: float) -> None:
+        """
+        Приостановка запросов к провайдеру.
+
+        :param delay: Время приостановки (в секундах)
+        :return:
+        """
+
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+    def _reserve(self) -> float:
+        """
+        Резервирование токена для запроса (без ожидания, поэтому безопасно для конкурентных задач).
+
+        :return: Время ожидания до выполнения запроса (в секундах)
+        """
+
+        now = time.monotonic()
+        delay = self._paused_until - now
+        if self.rate <= 0:
+            return delay
+
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        # отрицательное количество токенов – очередь ожидающих запросов
+        self._tokens -= 1
+
+        return max(delay, -self._tokens / self.rate)
+
+
+class Reservation:
+    """
+    Разрешение на выполнение одного запроса к провайдеру, полученное заранее.
+    """
+
+    def __init__(self, bucket: TokenBucket) -> None:
+        """
+        Конструктор.
+
+        :param bucket: Ограничитель частоты запросов, выдавший разрешение
+        """
+
+        self.bucket = bucket
+        self.used = False
+
+    def use(self, bucket: TokenBucket) -> bool:
+        """
+        Использование разрешения для запроса.
+
+        :param bucket: Ограничитель частоты запросов, к которому относится запрос
+        :return: True, если разрешение относится к ограничителю и еще не использовано
+        """
+
+        if self.used or bucket is not self.bucket:
+            return False
+
+        self.used = True
+        return True
+
+    def release(self) -> None:
+        """
+        Возврат неиспользованного разрешения ограничителю.
+
+        :return:
+        """
+
+        if not self.used:
+            self.used = True
+            self.bucket.refund()
+
+
+# разрешение на запрос, полученное заранее для текущей задачи
+_reservation: ContextVar[Optional[Reservation]] = ContextVar("reservation", default=None)
+
+
+@contextmanager
+def prepaid(reservation: Optional[Reservation]) -> Iterator[None]:
+    """
+    Использование полученного заранее разрешения для первого запроса в контексте
+    (в том числе в задачах, созданных в контексте). Неиспользованное разрешение возвращается при выходе.
+
+    .. code-block::
+
+        reservation = await get_rate_limiter("openweather").reserve()
+        with prepaid(reservation):
+            await asyncio.wait_for(client.get_weather("Tallinn,EE"), timeout=10)
+
+    :param reservation: Разрешение на запрос (None – без разрешения)
+    :return:
+    """
+
+    token = _reservation.set(reservation)
+    try:
+        yield
+    finally:
+        _reservation.reset(token)
+        if reservation is not None:
+            reservation.release()
+
+
+# ограничители частоты запросов по провайдерам
+_rate_limiters: dict[str, TokenBucket] = {}
+
+
+def get_rate_limiter(provider: str) -> TokenBucket:
+    """
+    Получение общего для процесса ограничителя частоты запросов к провайдеру.
+
+    Частота запросов задается в настройках ``RATE_LIMIT_<ПРОВАЙДЕР>`` (запросов в секунду).
+
+    :param provider: Название провайдера
+    :return:
+    """
+
+    if provider not in _rate_limiters:
+        rate = getattr(settings, f"RATE_LIMIT_{provider.upper()}", 0) if provider else 0
+        _rate_limiters[provider] = TokenBucket(rate, settings.RATE_LIMIT_BURST)
+
+    return _rate_limiters[provider]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Получение времени ожидания из заголовка ``Retry-After`` (количество секунд или дата).
+
+    :param value: Значение заголовка
+    :return: Время ожидания (в секундах) или None, если заголовок отсутствует или некорректен
+    """
+
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def get_backoff(attempt: int) -> float:
+    """
+    Получение времени ожидания перед повторной попыткой: экспоненциально растущий интервал
+    со случайным разбросом (чтобы повторные запросы конкурентных задач не совпадали по времени).
+
+    :param attempt: Номер неудачной попытки (начиная с 0)
+    :return: Время ожидания (в секундах)
+    """
+
+    return random.uniform(0, min(settings.HTTP_BACKOFF_MAX, settings.HTTP_BACKOFF_BASE * 2**attempt))
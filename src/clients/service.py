@@ -0,0 +1,31 @@
+"""
+Функции для взаимодействия с сервисом поиска информации о странах.
+"""
+from typing import Optional
+
+from clients.base import BaseClient
+from settings import get_settings
+
+settings = get_settings()
+
+
+class ServiceClient(BaseClient):
+    """
+    Реализация функций для взаимодействия с запущенным сервисом поиска (см. модуль :mod:`server`).
+    """
+
+    async def get_base_url(self) -> str:
+        return settings.SERVICE_URL.rstrip("/")
+
+    async def _request(self, endpoint: str, location: str = "") -> Optional[dict]:
+        return await self._get(endpoint, params={"location": location})
+
+    async def find(self, location: str) -> Optional[dict]:
+        """
+        Поиск информации о стране.
+
+        :param location: Страна и/или город
+        :return:
+        """
+
+        return await self._request(f"{await self.get_base_url()}/find", location)
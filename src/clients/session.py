@@ -0,0 +1,83 @@
+"""
+Управление общей HTTP-сессией для клиентов внешних сервисов.
+"""
+import asyncio
+from typing import Optional
+
+import aiohttp
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import AsyncResolver, DefaultResolver
+
+from logger import trace_config
+from settings import get_settings
+
+settings = get_settings()
+
+
+class SessionManager:
+    """
+    Владелец общей HTTP-сессии с пулом соединений.
+
+    Сессия создается при первом обращении и переиспользуется всеми клиентами,
+    поэтому соединения (в том числе TLS) и результаты DNS-запросов не создаются заново для каждого запроса.
+    """
+
+    def __init__(self) -> None:
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Получение общей сессии (создается при необходимости).
+
+        :return:
+        """
+
+        loop = asyncio.get_running_loop()
+        # сессия привязана к циклу событий, в котором она была создана
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=settings.HTTP_LIMIT,
+                    limit_per_host=settings.HTTP_LIMIT_PER_HOST,
+                    keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+                    use_dns_cache=True,
+                    ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+                    resolver=self._get_resolver(),
+                ),
+                trace_configs=[trace_config],
+                timeout=aiohttp.ClientTimeout(total=settings.HTTP_TIMEOUT),
+            )
+            self._loop = loop
+
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Закрытие сессии и всех открытых соединений.
+
+        :return:
+        """
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    @staticmethod
+    def _get_resolver() -> AbstractResolver:
+        """
+        Получение асинхронного DNS-резолвера (aiodns), если он доступен.
+
+        :return:
+        """
+
+        try:
+            return AsyncResolver()
+        except RuntimeError:
+            # aiodns не установлен
+            return DefaultResolver()
+
+
+# общий менеджер сессии для всех клиентов
+session_manager = SessionManager()
@@ -3,11 +3,40 @@
 """
 import logging
 
+import asyncclick as click
+
 from collectors.collector import Collectors
+from collectors.scheduler import Scheduler
+
+
+@click.command()
+@click.option(
+    "--daemon",
+    "-d",
+    "daemon",
+    is_flag=True,
+    default=False,
+    help="Запустить постоянно работающий планировщик вместо однократного сбора данных",
+)
+async def process_collect(daemon: bool) -> None:
+    """
+    Сбор данных о странах.
+
+    :param bool daemon: Запустить постоянно работающий планировщик
+    """
+
+    if daemon:
+        # актуализация данных по времени их устаревания до получения сигнала остановки
+        await Scheduler().run()
+        return
 
-if __name__ == "__main__":
     logging.info("Запуск обновления данных ...")
     # запуск обработки
-    Collectors().collect()
+    await Collectors.run()
 
     logging.info("Обновление завершено.")
+
+
+if __name__ == "__main__":
+    # pylint: disable=E1120
+    process_collect(_anyio_backend="asyncio")
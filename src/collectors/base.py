@@ -1,13 +1,43 @@
 """
 Базовые функции сборщиков информации о странах.
 """
-from pathlib import Path
+import asyncio
+import hashlib
+import logging
 import time
+from enum import Enum
+from pathlib import Path
 from abc import ABC, abstractmethod
-from typing import Iterable, Any, Optional
+from typing import Any, Awaitable, Callable, Iterable, Optional, TypeVar
+
+from clients.base import BaseClient, conditional_request
+from clients.breaker import CircuitState
+from clients.policy import TokenBucket, get_rate_limiter, prepaid
+from collectors.locks import FileLock
+from collectors.models import CollectSummaryDTO, CountryDeltaDTO
+from collectors.refresh import refresh_queue
+from collectors.storage import CacheBackend, CacheEntry, FileSystemBackend, get_cache_backend
+from settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
-import aiofiles
-import aiofiles.os
+ItemT = TypeVar("ItemT")
+
+
+class CollectStatus(str, Enum):
+    """
+    Результат сбора данных для одного элемента.
+    """
+
+    # данные получены и сохранены в кэш
+    SUCCEEDED = "succeeded"
+    # данные не получены (ошибка, превышено время ожидания, пустой ответ)
+    FAILED = "failed"
+    # данные в кэше актуальны, сбор не требуется
+    SKIPPED = "skipped"
+    # сервис ответил, что данные не изменились, обновлено только время их получения
+    NOT_MODIFIED = "not_modified"
 
 
 class BaseCollector(ABC):
@@ -15,44 +45,712 @@ class BaseCollector(ABC):
     Базовый класс, реализующий интерфейс для сборщиков информации.
     """
 
-    @abstractmethod
-    async def collect(self, **kwargs: Any) -> Optional[Iterable[Any]]:
-        ...
+    # название этапа сбора данных
+    name: str
+    # зависимости этапа: название этапа -> название аргумента метода collect,
+    # в который передается результат этапа (None – только ожидание завершения этапа)
+    depends_on: dict[str, Optional[str]] = {}
+    # пространство имен данных сборщика (поддиректория в файловом хранилище кэша)
+    namespace: str = ""
+
+    # ключ данных сборщиков, хранящих данные под одним ключом
+    cache_key: str = ""
+    # клиент внешнего сервиса, от которого получаются данные
+    client: Optional[BaseClient] = None
 
-    @staticmethod
     @abstractmethod
-    async def get_file_path(**kwargs: Any) -> Path:
+    async def collect(self, **kwargs: Any) -> Any:
         ...
 
+    async def commit(self, result: Any) -> None:
+        """
+        Завершение этапа сбора данных после успешного выполнения всех зависящих от него этапов
+        (см. :meth:`collectors.collector.Collectors.gather`).
+
+        :param result: Результат этапа (см. :meth:`collect`)
+        :return:
+        """
+
     @property
     @abstractmethod
     async def cache_ttl(self) -> int:
         ...
 
-    async def cache_invalid(self, **kwargs: Any) -> bool:
+    @property
+    async def cache_max_stale(self) -> int:
+        """
+        Предельный возраст данных (в секундах), до которого устаревшие данные выдаются пользователю
+        (по умолчанию устаревшие данные не выдаются).
+
+        :return:
+        """
+
+        return await self.cache_ttl
+
+    @abstractmethod
+    async def fetch(self, item: Any) -> Optional[Any]:
+        """
+        Получение данных для одного ключа от внешнего сервиса.
+
+        :param item: Элемент, для которого получаются данные (например, локация)
+        :return: Данные или None, если их не удалось получить
+        """
+
+    async def refresh(self, key: Optional[str] = None, item: Any = None) -> CollectSummaryDTO:
+        """
+        Актуализация данных для одного ключа.
+
+        :param key: Ключ данных (по умолчанию – ключ данных сборщика)
+        :param item: Элемент, для которого получаются данные (см. :meth:`fetch`)
+        :return: Итоги актуализации
+        """
+
+        return await self.refresh_many(
+            {key or self.cache_key: item},
+            self.fetch,
+            concurrency=1,
+            timeout=settings.REFRESH_TIMEOUT,
+        )
+
+    @staticmethod
+    def get_backend() -> CacheBackend:
+        """
+        Получение хранилища кэша, выбранного в настройках.
+
+        :return:
+        """
+
+        return get_cache_backend()
+
+    @classmethod
+    async def get_file_path(cls, filename: Optional[str] = None, **kwargs: Any) -> Optional[Path]:
+        """
+        Получение пути до файла с данными в хранилище кэша, выбранном в настройках.
+
+        :param filename: Ключ данных (по умолчанию – ключ данных сборщика)
+        :return: Путь до файла или None, если хранилище не хранит данные в отдельных файлах
+        """
+
+        backend = cls.get_backend()
+        if not isinstance(backend, FileSystemBackend):
+            return None
+
+        return backend.get_path(cls.namespace, filename or cls.cache_key)
+
+    async def cache_invalid(self, key: Optional[str] = None, **kwargs: Any) -> bool:
         """
         Проверка необходимости актуализации данных в кэше.
         Если True, то необходимо актуализировать данные в кэше, иначе брать данные из кэша.
 
+        :param key: Ключ данных (по умолчанию – ключ данных сборщика)
         :return: bool
         """
 
-        file_path = await self.get_file_path(**kwargs)
+        return bool(await self.stale_keys((key or self.cache_key,)))
+
+    async def stale_keys(self, keys: Iterable[str]) -> set[str]:
+        """
+        Получение ключей, данные для которых необходимо актуализировать.
+
+        Время актуальности данных для каждого ключа вычисляется методом :meth:`get_key_ttl`.
+
+        :param keys: Проверяемые ключи
+        :return:
+        """
+
+        backend = self.get_backend()
+        cache_ttl = await self.cache_ttl
+        keys = set(keys)
+        # данные, актуальные при минимальном времени актуальности, актуальны для любого ключа
+        min_ttl = cache_ttl * (1 - settings.CACHE_TTL_JITTER)
+        stale = keys - await backend.fresh_keys(self.namespace, keys, min_ttl)
+        if not stale:
+            return stale
+
+        now = time.time()
+        if settings.CACHE_TTL_JITTER or settings.CACHE_CONDITIONAL_REQUESTS:
+            validators = (
+                await self.load_validators(stale) if settings.CACHE_CONDITIONAL_REQUESTS else {}
+            )
+            fetched_at = await backend.fetched_at_many(self.namespace, stale)
+            stale = {
+                key
+                for key in stale
+                if key not in fetched_at
+                or now - fetched_at[key] > self.get_key_ttl(key, cache_ttl, validators.get(key))
+            }
+
+        # ключи, данные для которых недавно не удалось получить, не запрашиваются до истечения паузы
+        failures = await self.load_failures(stale)
+        return {
+            key
+            for key in stale
+            if key not in failures or self.get_retry_at(failures[key], cache_ttl) <= now
+        }
+
+    def get_key_ttl(
+        self, key: str, cache_ttl: float, validators: Optional[dict[str, Any]] = None
+    ) -> float:
+        """
+        Получение времени актуальности данных для ключа.
+
+        Время актуальности из настроек сокращается на постоянную для ключа долю (не более ``CACHE_TTL_JITTER``),
+        чтобы данные, собранные одновременно, устаревали в разное время. Время актуальности продлевается
+        до времени, разрешенного сервисом (``Cache-Control: max-age``), если оно больше.
+
+        :param key: Ключ данных
+        :param cache_ttl: Время актуальности данных из настроек (в секундах)
+        :param validators: Сохраненные валидаторы ответа сервиса
+        :return: Время актуальности данных (в секундах)
+        """
+
+        # доля сокращения вычисляется по хэшу ключа и не меняется между запусками
+        digest = hashlib.sha1(f"{self.namespace}/{key}".encode()).digest()
+        fraction = int.from_bytes(digest[:8], "big") / 2**64
+
+        return max(
+            cache_ttl * (1 - settings.CACHE_TTL_JITTER * fraction),
+            (validators or {}).get("max_age", 0),
+        )
+
+    async def get_entry_ttl(self, key: str) -> float:
+        """
+        Получение времени актуальности сохраненных данных для ключа с учетом сохраненных валидаторов
+        ответа сервиса (см. :meth:`get_key_ttl`).
+
+        :param key: Ключ данных
+        :return: Время актуальности данных (в секундах)
+        """
+
+        validators = (
+            (await self.load_validators((key,))).get(key) if settings.CACHE_CONDITIONAL_REQUESTS else None
+        )
+        return self.get_key_ttl(key, await self.cache_ttl, validators)
+
+    @staticmethod
+    def get_retry_at(failure: dict[str, Any], cache_ttl: float) -> float:
+        """
+        Получение времени повторного получения данных после неудачных попыток.
+
+        Пауза после первой неудачи равна ``CACHE_FAILURE_BACKOFF`` и удваивается после каждой следующей,
+        но не превышает времени актуальности данных.
+
+        :param failure: Сохраненные сведения о неудачных попытках (время последней попытки и их количество)
+        :param cache_ttl: Время актуальности данных из настроек (в секундах)
+        :return: Время (timestamp)
+        """
+
+        backoff = settings.CACHE_FAILURE_BACKOFF * 2 ** (max(failure["attempts"], 1) - 1)
+        return failure["failed_at"] + min(backoff, cache_ttl)
+
+    def get_unavailable_until(self) -> Optional[float]:
+        """
+        Получение времени, до которого запросы к сервису сборщика отключены после ошибок (см. :mod:`clients.breaker`).
+
+        :return: Время (timestamp) или None, если запросы к сервису выполняются
+        """
+
+        if self.client is None:
+            return None
+
+        stats = self.client.get_circuit_breaker().stats()
+        return stats.retry_at if stats.state is CircuitState.OPEN else None
+
+    async def get_keys(self) -> list[str]:
+        """
+        Получение ключей данных, которые собирает сборщик (по сохраненным данным этапов, от которых он зависит).
+
+        :return:
+        """
+
+        return [self.cache_key]
+
+    async def get_expiries(self) -> dict[str, float]:
+        """
+        Получение времени устаревания данных для ключей сборщика.
+        Для ключей без данных временем устаревания считается текущее время,
+        а для ключей, данные для которых не удалось получить, – время повторной попытки (см. :meth:`get_retry_at`).
+
+        :return: Время устаревания данных (timestamp) по ключам
+        """
+
+        keys = await self.get_keys()
+        cache_ttl = await self.cache_ttl
+        fetched_at = await self.get_backend().fetched_at_many(self.namespace, keys)
+        validators = (
+            await self.load_validators(fetched_at) if settings.CACHE_CONDITIONAL_REQUESTS else {}
+        )
+
+        failures = await self.load_failures(keys)
+
+        now = time.time()
+        expiries = {
+            key: (
+                fetched_at[key] + self.get_key_ttl(key, cache_ttl, validators.get(key))
+                if key in fetched_at
+                else now
+            )
+            for key in keys
+        }
+        # данные, которые не удалось получить, запрашиваются повторно после паузы
+        for key, failure in failures.items():
+            expiries[key] = max(expiries[key], self.get_retry_at(failure, cache_ttl))
+
+        return expiries
+
+    @classmethod
+    def get_validators_namespace(cls) -> str:
+        """
+        Получение пространства имен для валидаторов ответов сервиса (см. :class:`clients.base.ConditionalRequest`).
+
+        :return:
+        """
+
+        return f"validators/{cls.namespace}".rstrip("/")
+
+    async def load_validators(self, keys: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """
+        Чтение сохраненных валидаторов ответов сервиса.
+
+        :param keys: Ключи данных
+        :return: Валидаторы по ключам (ключи без валидаторов отсутствуют)
+        """
+
+        entries = await self.get_backend().get_many(self.get_validators_namespace(), keys)
+        return {key: entry.payload for key, entry in entries.items()}
+
+    @classmethod
+    def get_failures_namespace(cls) -> str:
+        """
+        Получение пространства имен для сведений о неудачных попытках получения данных.
+
+        :return:
+        """
+
+        return f"failures/{cls.namespace}".rstrip("/")
+
+    async def load_failures(self, keys: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """
+        Чтение сведений о неудачных попытках получения данных.
+
+        :param keys: Ключи данных
+        :return: Время последней неудачной попытки и количество попыток подряд по ключам
+            (ключи без неудачных попыток отсутствуют)
+        """
+
+        entries = await self.get_backend().get_many(self.get_failures_namespace(), keys)
+        return {key: entry.payload for key, entry in entries.items()}
+
+    async def save(self, payload: Any, key: Optional[str] = None) -> None:
+        """
+        Сохранение данных в кэш.
+
+        :param payload: Данные
+        :param key: Ключ данных (по умолчанию – ключ данных сборщика)
+        :return:
+        """
+
+        await self.get_backend().put(self.namespace, key or self.cache_key, payload)
+
+    async def save_many(self, items: dict[str, Any]) -> None:
+        """
+        Сохранение данных для нескольких ключей в кэш.
+
+        :param items: Данные по ключам
+        :return:
+        """
+
+        await self.get_backend().put_many(self.namespace, items)
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        """
+        Удаление из кэша данных, валидаторов, сведений о неудачных попытках и файлов блокировок для нескольких ключей.
+
+        :param keys: Ключи данных
+        :return:
+        """
+
+        if not (keys := list(keys)):
+            return
+
+        backend = self.get_backend()
+        await backend.delete_many(self.namespace, keys)
+        await backend.delete_many(self.get_validators_namespace(), keys)
+        await backend.delete_many(self.get_failures_namespace(), keys)
+        for key in keys:
+            lock = self.get_lock(key)
+            # файл блокировки, захваченной другим процессом, не удаляется
+            if lock.path.exists() and await lock.acquire(blocking=False):
+                try:
+                    lock.path.unlink(missing_ok=True)
+                finally:
+                    lock.release()
+
+        logger.info("Удалены данные %s для ключей: %s", self.namespace, ", ".join(sorted(keys)))
+
+    async def get_obsolete_keys(self, countries: CountryDeltaDTO) -> set[str]:
+        """
+        Получение ключей данных, которые больше не нужны после изменения списка стран
+        (для удаленных стран и стран, у которых изменились столица или название).
+
+        :param countries: Локации стран и изменения списка стран
+        :return:
+        """
+
+        return set()
+
+    async def collect_garbage(self, countries: CountryDeltaDTO) -> None:
+        """
+        Удаление данных, которые больше не нужны после изменения списка стран.
+
+        :param countries: Локации стран и изменения списка стран
+        :return:
+        """
+
+        await self.delete_many(await self.get_obsolete_keys(countries))
+
+    @classmethod
+    async def load(cls, key: Optional[str] = None) -> Optional[Any]:
+        """
+        Чтение данных из кэша.
+
+        :param key: Ключ данных (по умолчанию – ключ данных сборщика)
+        :return:
+        """
 
+        entry = await cls.get_backend().get(cls.namespace, key or cls.cache_key)
+        return entry.payload if entry else None
+
+    @classmethod
+    async def read_cached(cls, key: Optional[str] = None, item: Any = None) -> Optional[Any]:
+        """
+        Чтение данных из кэша для выдачи пользователю (stale-while-revalidate).
+
+        Устаревшие данные ставятся в очередь на фоновую актуализацию и возвращаются сразу,
+        если они не старше предельного возраста (см. :attr:`cache_max_stale`).
+
+        :param key: Ключ данных (по умолчанию – ключ данных сборщика)
+        :param item: Элемент для актуализации данных (см. :meth:`fetch`)
+        :return:
+        """
+
+        key = key or cls.cache_key
+        entry = await cls.get_backend().get(cls.namespace, key)
+        if entry is None or not await cls.is_servable(entry.age, key, item):
+            return None
+
+        return entry.payload
+
+    @classmethod
+    async def is_servable(cls, age: float, key: Optional[str] = None, item: Any = None) -> bool:
+        """
+        Проверка возраста данных перед выдачей пользователю: устаревшие данные ставятся в очередь
+        на фоновую актуализацию (см. :meth:`read_cached`).
+
+        :param age: Возраст данных (в секундах)
+        :param key: Ключ данных (по умолчанию – ключ данных сборщика)
+        :param item: Элемент для актуализации данных (см. :meth:`fetch`)
+        :return: True, если данные не старше предельного возраста
+        """
+
+        key = key or cls.cache_key
+        collector = cls()
+        # валидаторы читаются, только если данные старше времени актуальности из настроек
         if (
-            # проверка существования файла
-            # (если файл не существует)
-            not await aiofiles.os.path.isfile(file_path)
-            # проверка наличия содержимого в файле без валидации структуры и значений
-            # (или если файл существует, но он пустой)
-            or not await aiofiles.os.path.getsize(file_path)
-            # проверка срока актуальности кэша
-            # путем сравнения разницы между текущим временем
-            # и времени последнего изменения файла
-            # (или если файл существует и не пустой, но данные в нем уже устарели)
-            or (time.time() - await aiofiles.os.path.getmtime(file_path))
-            > await self.cache_ttl
+            settings.CACHE_BACKGROUND_REFRESH
+            and age > collector.get_key_ttl(key, await collector.cache_ttl)
+            and age > await collector.get_entry_ttl(key)
         ):
+            refresh_queue.enqueue(collector, key, item)
+
+        return age <= await collector.cache_max_stale
+
+    @classmethod
+    async def get_entry_age(cls, key: Optional[str] = None) -> Optional[float]:
+        """
+        Получение возраста данных в кэше.
+
+        :param key: Ключ данных (по умолчанию – ключ данных сборщика)
+        :return: Возраст данных (в секундах) или None, если данных нет
+        """
+
+        fetched_at = await cls.get_backend().fetched_at(cls.namespace, key or cls.cache_key)
+        return CacheEntry(None, fetched_at).age if fetched_at is not None else None
+
+    async def refresh_many(
+        self,
+        items: dict[str, ItemT],
+        fetch: Callable[[ItemT], Awaitable[Optional[Any]]],
+        concurrency: int,
+        timeout: float,
+    ) -> CollectSummaryDTO:
+        """
+        Актуализация данных для нескольких ключей.
+
+        Данные запрашиваются конкурентно только для ключей с неактуальными данными
+        и сохраняются в кэш после получения всех ответов.
+
+        :param items: Элементы для получения данных по ключам
+        :param fetch: Функция получения данных для одного элемента
+        :param concurrency: Максимальное количество одновременных запросов
+        :param timeout: Время ожидания данных для одного элемента (в секундах)
+        :return: Итоги актуализации
+        """
+
+        stale = await self.stale_keys(items)
+        due = await self.get_refresh_slice(stale)
+        if due and self.get_unavailable_until() is not None:
+            # сервис не отвечает: запросы не выполняются до истечения времени отключения
+            logger.warning("Сервис %s недоступен, актуализация данных %s отложена", self.name, self.namespace)
+            due = set()
+        if deferred := len(stale) - len(due):
+            logger.info("Актуализация %s: %s ключей отложено до следующего запуска", self.namespace, deferred)
+
+        summary = await self.revalidate_many(
+            {key: items[key] for key in sorted(due)}, fetch, concurrency, timeout
+        )
+        summary.skipped += len(items) - len(stale)
+        summary.deferred = deferred
+
+        return summary
+
+    async def get_refresh_slice(self, stale: set[str]) -> set[str]:
+        """
+        Получение ключей, данные для которых актуализируются в текущем запуске.
+
+        Если задано ``CACHE_REFRESH_SLICE``, то за один запуск актуализируется не больше заданного количества ключей
+        (сначала ключи без данных, затем – с самыми старыми данными), а остальные откладываются до следующих
+        запусков: нагрузка на сервисы распределяется по времени.
+
+        :param stale: Ключи с неактуальными данными
+        :return:
+        """
+
+        if not settings.CACHE_REFRESH_SLICE or len(stale) <= settings.CACHE_REFRESH_SLICE:
+            return stale
+
+        fetched_at = await self.get_backend().fetched_at_many(self.namespace, stale)
+        oldest = sorted(stale, key=lambda key: (fetched_at.get(key, 0.0), key))
+        del oldest[settings.CACHE_REFRESH_SLICE:]
+
+        return set(oldest)
+
+    async def revalidate_many(
+        self,
+        items: dict[str, ItemT],
+        fetch: Callable[[ItemT], Awaitable[Optional[Any]]],
+        concurrency: int,
+        timeout: float,
+    ) -> CollectSummaryDTO:
+        """
+        Получение данных для нескольких ключей независимо от их актуальности.
+
+        Если для ключа сохранены данные и валидаторы ответа сервиса, то выполняется условный запрос:
+        при ответе «данные не изменились» обновляется только время получения данных.
+
+        :param items: Элементы для получения данных по ключам
+        :param fetch: Функция получения данных для одного элемента
+        :param concurrency: Максимальное количество одновременных запросов
+        :param timeout: Время ожидания данных для одного элемента (в секундах)
+        :return: Итоги получения данных
+        """
+
+        # блокировки ключей удерживаются до сохранения полученных данных
+        locks: list[FileLock] = []
+        try:
+            return await self._revalidate_many(items, fetch, concurrency, timeout, locks)
+        finally:
+            for lock in locks:
+                lock.release()
+
+    async def _revalidate_many(
+        self,
+        items: dict[str, ItemT],
+        fetch: Callable[[ItemT], Awaitable[Optional[Any]]],
+        concurrency: int,
+        timeout: float,
+        locks: list[FileLock],
+    ) -> CollectSummaryDTO:
+        """
+        Получение данных для нескольких ключей под межпроцессными блокировками ключей (см. :meth:`revalidate_many`).
+
+        :param items: Элементы для получения данных по ключам
+        :param fetch: Функция получения данных для одного элемента
+        :param concurrency: Максимальное количество одновременных запросов
+        :param timeout: Время ожидания данных для одного элемента (в секундах)
+        :param locks: Список для захваченных блокировок ключей
+        :return: Итоги получения данных
+        """
+
+        conditional = settings.CACHE_CONDITIONAL_REQUESTS
+        backend = self.get_backend()
+        stored_validators = await self.load_validators(items) if conditional else {}
+        # условный запрос выполняется только для ключей с сохраненными данными:
+        # иначе ответ «данные не изменились» не позволит получить данные заново
+        present = await backend.fetched_at_many(self.namespace, stored_validators)
+        stored_validators = {key: value for key, value in stored_validators.items() if key in present}
+        results: dict[str, Any] = {}
+        # валидаторы полученных ответов, ключи неизменившихся данных и ключи валидаторов для удаления
+        validators: dict[str, dict[str, Any]] = {}
+        not_modified: list[str] = []
+        dropped: list[str] = []
+
+        # ключи, для которых выполнялся запрос
+        attempted: list[str] = []
+
+        async def refresh(key: str) -> CollectStatus:
+            lock = self.get_lock(key)
+            locks.append(lock)
+            if not await self.acquire_lock(lock, key):
+                return CollectStatus.SKIPPED
+
+            attempted.append(key)
+
+            with conditional_request(stored_validators.get(key)) as request:
+                result = await fetch(items[key])
+
+            if conditional and request.response_validators != stored_validators.get(key, {}):
+                validators[key] = request.response_validators
+            if conditional and request.not_modified:
+                if await backend.fetched_at(self.namespace, key) is None:
+                    # данные удалены во время запроса: валидаторы удаляются, данные будут получены заново
+                    logger.warning("Данные %s/%s не изменились, но отсутствуют в кэше", self.namespace, key)
+                    validators.pop(key, None)
+                    dropped.append(key)
+                    return CollectStatus.FAILED
+                not_modified.append(key)
+                return CollectStatus.NOT_MODIFIED
+            if not result:
+                validators.pop(key, None)
+                return CollectStatus.FAILED
+
+            results[key] = result
+            return CollectStatus.SUCCEEDED
+
+        rate_limiter = get_rate_limiter(self.client.PROVIDER) if self.client is not None else None
+        summary = await self.fan_out(items, refresh, concurrency, timeout, rate_limiter)
+        await self.save_many(results)
+        await backend.touch_many(self.namespace, not_modified)
+        await backend.put_many(self.get_validators_namespace(), validators)
+        if dropped:
+            await backend.delete_many(self.get_validators_namespace(), dropped)
+        await self.save_failures(attempted, set(results) | set(not_modified))
+
+        return summary
+
+    async def save_failures(self, attempted: Iterable[str], received: set[str]) -> None:
+        """
+        Сохранение сведений о неудачных попытках получения данных (см. :meth:`get_retry_at`).
+
+        :param attempted: Ключи, для которых выполнялся запрос
+        :param received: Ключи, данные для которых получены (или не изменились)
+        :return:
+        """
+
+        if not (attempted := list(attempted)):
+            return
+
+        backend = self.get_backend()
+        namespace = self.get_failures_namespace()
+        stored = await self.load_failures(attempted)
+        now = time.time()
+        await backend.put_many(
+            namespace,
+            {
+                key: {"failed_at": now, "attempts": stored.get(key, {}).get("attempts", 0) + 1}
+                for key in attempted
+                if key not in received
+            },
+        )
+        await backend.delete_many(namespace, [key for key in attempted if key in received and key in stored])
+
+    def get_lock(self, key: str) -> FileLock:
+        """
+        Получение межпроцессной блокировки ключа данных.
+
+        :param key: Ключ данных
+        :return:
+        """
+
+        return FileLock(
+            settings.MEDIA_ABSOLUTE_PATH.joinpath(settings.LOCK_DIR, self.namespace, f"{key}.lock")
+        )
+
+    async def acquire_lock(self, lock: FileLock, key: str) -> bool:
+        """
+        Захват блокировки ключа данных.
+
+        Если данные для ключа уже получает другой процесс, то ключ пропускается (``LOCK_KEY_MODE=skip``)
+        или ожидается завершение его получения (``LOCK_KEY_MODE=wait``): если после ожидания данные актуальны,
+        то ключ пропускается.
+
+        :param lock: Блокировка ключа
+        :param key: Ключ данных
+        :return: True, если блокировка захвачена и данные необходимо получить
+        """
+
+        if await lock.acquire(blocking=False):
             return True
 
-        return False
+        if settings.LOCK_KEY_MODE == "skip":
+            logger.info("Данные %s/%s получает другой процесс, ключ пропущен", self.namespace, key)
+            return False
+
+        logger.info("Данные %s/%s получает другой процесс, ожидание", self.namespace, key)
+        if not await lock.acquire(timeout=settings.LOCK_TIMEOUT):
+            logger.warning("Превышено время ожидания блокировки %s/%s, ключ пропущен", self.namespace, key)
+            return False
+
+        if not await self.stale_keys((key,)):
+            logger.info("Данные %s/%s актуализированы другим процессом", self.namespace, key)
+            lock.release()
+            return False
+
+        return True
+
+    @staticmethod
+    async def fan_out(
+        items: Iterable[ItemT],
+        worker: Callable[[ItemT], Awaitable[CollectStatus]],
+        concurrency: int,
+        timeout: float,
+        rate_limiter: Optional[TokenBucket] = None,
+    ) -> CollectSummaryDTO:
+        """
+        Конкурентная обработка элементов с ограничением количества одновременных задач.
+        Ошибка или превышение времени ожидания для одного элемента не прерывает обработку остальных.
+
+        Если задан ограничитель частоты запросов, то разрешение на первый запрос для элемента
+        получается до начала отсчета времени ожидания (см. :func:`clients.policy.prepaid`).
+
+        :param items: Элементы для обработки
+        :param worker: Функция обработки одного элемента
+        :param concurrency: Максимальное количество одновременно обрабатываемых элементов
+        :param timeout: Время ожидания обработки одного элемента (в секундах)
+        :param rate_limiter: Ограничитель частоты запросов к сервису
+        :return: Итоги обработки
+        """
+
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def process(item: ItemT) -> CollectStatus:
+            async with semaphore:
+                reservation = await rate_limiter.reserve() if rate_limiter is not None else None
+                try:
+                    with prepaid(reservation):
+                        return await asyncio.wait_for(worker(item), timeout=timeout)
+                except asyncio.TimeoutError:
+                    logger.warning("Превышено время ожидания для %s", item)
+                except Exception:
+                    logger.exception("Ошибка при обработке %s", item)
+
+                return CollectStatus.FAILED
+
+        statuses = await asyncio.gather(*(process(item) for item in items))
+
+        return CollectSummaryDTO(
+            succeeded=statuses.count(CollectStatus.SUCCEEDED),
+            failed=statuses.count(CollectStatus.FAILED),
+            skipped=statuses.count(CollectStatus.SKIPPED),
+            not_modified=statuses.count(CollectStatus.NOT_MODIFIED),
+        )
@@ -0,0 +1,107 @@
+"""
+Кодеки для сериализации сохраняемых в кэш данных.
+
+По умолчанию используется модуль ``json`` стандартной библиотеки.
+Если установлена библиотека ``orjson``, то данные кодируются и декодируются ею (в несколько раз быстрее),
+формат сохраненных данных при этом не меняется: данные, записанные одним кодеком, читаются другим.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from settings import get_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+settings = get_settings()
+
+
+class Codec(ABC):
+    """
+    Базовый класс, реализующий интерфейс для кодеков.
+    """
+
+    # название кодека в настройках
+    name: str = ""
+
+    @abstractmethod
+    def dumps(self, payload: Any) -> str:
+        """
+        Кодирование данных в JSON.
+
+        :param payload: Данные
+        :return:
+        """
+
+    @abstractmethod
+    def loads(self, content: str | bytes) -> Any:
+        """
+        Декодирование данных из JSON.
+
+        :param content: Закодированные данные
+        :return:
+        :raises ValueError: Если данные не являются корректным JSON
+        """
+
+
+class JsonCodec(Codec):
+    """
+    Кодек на основе модуля ``json`` стандартной библиотеки.
+    """
+
+    name = "json"
+
+    def dumps(self, payload: Any) -> str:
+        return json.dumps(payload)
+
+    def loads(self, content: str | bytes) -> Any:
+        return json.loads(content)
+
+
+class OrjsonCodec(Codec):
+    """
+    Кодек на основе библиотеки ``orjson``.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        """
+        Конструктор.
+
+        :raises RuntimeError: Если библиотека ``orjson`` не установлена
+        """
+
+        if orjson is None:
+            raise RuntimeError("Библиотека orjson не установлена")
+
+    def dumps(self, payload: Any) -> str:
+        return orjson.dumps(payload).decode()
+
+    def loads(self, content: str | bytes) -> Any:
+        return orjson.loads(content)
+
+
+# кодеки по названиям
+CODECS: dict[str, type[Codec]] = {JsonCodec.name: JsonCodec, OrjsonCodec.name: OrjsonCodec}
+
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """
+    Получение кодека по названию.
+
+    :param name: Название кодека (по умолчанию – из настроек), ``auto`` – самый быстрый из установленных
+    :return:
+    """
+
+    name = name or settings.CACHE_CODEC
+    if name == "auto":
+        name = OrjsonCodec.name if orjson is not None else JsonCodec.name
+    if name not in CODECS:
+        raise ValueError(f"Неизвестный кодек: {name}")
+
+    return CODECS[name]()
@@ -5,19 +5,25 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from pathlib import Path
+import logging
+from abc import abstractmethod
+from graphlib import TopologicalSorter
 from typing import Any, Optional, FrozenSet
 
-import aiofiles
-import aiofiles.os
-
+from clients.base import ConditionalRequest, conditional_request, get_conditional_request
+from clients.city import CityClient
 from clients.country import CountryClient
 from clients.currency import CurrencyClient
 from clients.news import COUNTRY_SHORT_NAMES, NewsClient
+from clients.session import session_manager
 from clients.weather import WeatherClient
 from collectors.base import BaseCollector
+from collectors.locks import FileLock
 from collectors.models import (
+    CityInfoDTO,
+    CollectSummaryDTO,
+    CountryDeltaDTO,
+    CountryKeyDTO,
     LocationDTO,
     CountryDTO,
     CurrencyRatesDTO,
@@ -25,9 +31,13 @@ from collectors.models import (
     NewsDTO,
     WeatherInfoDTO,
 )
+from collectors.records import AnyLocation, CountryRecord, NewsRecord, WeatherRecord
+from collectors.snapshot import CountrySnapshot
+from collectors.storage import CacheEntry
 from settings import get_settings
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 class CountryCollector(BaseCollector):
@@ -35,31 +45,238 @@ class CountryCollector(BaseCollector):
     Сбор информации о странах (географическое описание).
     """
 
+    name = "country"
+    cache_key = "country"
+
+    client: CountryClient
+
     def __init__(self) -> None:
         self.client = CountryClient()
 
-    @staticmethod
-    async def get_file_path(**kwargs: Any) -> Path:
-        return settings.MEDIA_ABSOLUTE_PATH.joinpath("country.json")
-
     @property
     async def cache_ttl(self) -> int:
         return settings.CACHE_TTL_COUNTRY
 
-    async def collect(self, **kwargs: Any) -> Optional[FrozenSet[LocationDTO]]:
-        if await self.cache_invalid():
-            # если кэш уже невалиден, то актуализируем его
-            result = await self.client.get_countries()
-            if result:
-                result_str = json.dumps(result)
-                async with aiofiles.open(await self.get_file_path(), mode="w") as file:
-                    await file.write(result_str)
+    @property
+    async def cache_max_stale(self) -> int:
+        return settings.CACHE_MAX_STALE_COUNTRY
+
+    async def fetch(self, item: Any = None) -> Optional[list[dict]]:
+        """
+        Получение данных о странах всех региональных объединений из настроек.
+
+        Объединения запрашиваются одновременно, страны, входящие в несколько объединений,
+        сохраняются один раз. Если данные хотя бы одного объединения не получены, то результата нет,
+        чтобы не сохранить неполный список стран.
+
+        Валидаторы ответов сохраняются для каждого объединения (см. :meth:`get_blocs_validators`),
+        и объединения запрашиваются условно: если данные ни одного объединения не изменились,
+        то данные о странах считаются неизменившимися, а если изменились данные хотя бы одного,
+        то данные остальных объединений запрашиваются заново.
+
+        :param item: Не используется
+        :return:
+        """
+
+        blocs = list(dict.fromkeys(settings.COUNTRY_BLOCS))
+        if len(blocs) == 1:
+            return await self.client.get_countries(blocs[0])
+
+        request = get_conditional_request()
+        stored: dict[str, Any] = request.validators.get("blocs", {}) if request is not None else {}
+        if not stored.keys() >= set(blocs):
+            # без валидаторов хотя бы одного объединения его данные получаются всегда,
+            # поэтому остальные объединения запрашиваются без условий
+            stored = {}
+
+        responses = dict(
+            zip(blocs, await asyncio.gather(*(self.fetch_bloc(bloc, stored.get(bloc)) for bloc in blocs)))
+        )
+        unchanged = [bloc for bloc, (_, bloc_request) in responses.items() if bloc_request.not_modified]
+        if request is not None and len(unchanged) == len(blocs):
+            # данные ни одного объединения не изменились
+            request.not_modified = True
+            request.response_validators = self.get_blocs_validators(
+                {bloc: bloc_request for bloc, (_, bloc_request) in responses.items()}
+            )
+            return None
+        if unchanged:
+            # данные части объединений изменились: неизменившиеся объединения запрашиваются заново целиком
+            responses.update(zip(unchanged, await asyncio.gather(*(self.fetch_bloc(bloc) for bloc in unchanged))))
+
+        countries: dict[str, dict] = {}
+        for bloc, (result, _) in responses.items():
+            if result is None:
+                logger.warning("Данные о странах объединения %s не получены", bloc)
+                return None
+            for country in result:
+                countries.setdefault(country["alpha2code"], country)
+
+        if request is not None:
+            request.response_validators = self.get_blocs_validators(
+                {bloc: bloc_request for bloc, (_, bloc_request) in responses.items()}
+            )
+
+        return list(countries.values())
+
+    async def fetch_bloc(
+        self, bloc: str, validators: Optional[dict[str, Any]] = None
+    ) -> tuple[Optional[list[dict]], ConditionalRequest]:
+        """
+        Получение данных о странах одного регионального объединения.
+
+        :param bloc: Региональное объединение
+        :param validators: Валидаторы сохраненного ответа для объединения
+        :return: Данные о странах и условный запрос со статусом и валидаторами ответа
+        """
+
+        with conditional_request(validators) as request:
+            return await self.client.get_countries(bloc), request
+
+    @staticmethod
+    def get_blocs_validators(requests: dict[str, ConditionalRequest]) -> dict[str, Any]:
+        """
+        Получение валидаторов данных о странах по валидаторам ответов для отдельных объединений.
+
+        Валидаторы объединений сохраняются вместе под ключом данных о странах, поэтому записываются
+        только после сохранения самих данных. Время актуальности ответа (``max_age``) –
+        наименьшее из времен актуальности ответов для объединений.
+
+        .. code-block::
+
+            {"blocs": {"eu": {"etag": '"v1"'}, "efta": {"etag": '"v2"', "max_age": 60}}}
+
+        :param requests: Условные запросы по объединениям
+        :return:
+        """
+
+        blocs = {bloc: request.response_validators for bloc, request in requests.items()}
+        if not all(blocs.values()):
+            return {}
+
+        validators: dict[str, Any] = {"blocs": blocs}
+        if all(bloc_validators.get("max_age") for bloc_validators in blocs.values()):
+            validators["max_age"] = min(bloc_validators["max_age"] for bloc_validators in blocs.values())
 
-        # получение данных из кэша
-        async with aiofiles.open(await self.get_file_path(), mode="r") as file:
-            content = await file.read()
+        return validators
+
+    async def collect(self, **kwargs: Any) -> CountryDeltaDTO:
+        """
+        Актуализация списка стран и сравнение его со списком, обработанным при предыдущем сборе данных
+        (см. :meth:`commit`).
+
+        Изменения определяются по сохраненному списку, а не по данным до актуализации, поэтому не теряются,
+        если список стран был актуализирован в фоне при чтении или сбор данных прервался до окончания
+        зависящих этапов.
+
+        :return: Локации стран и изменения списка стран
+        """
+
+        previous = await self.load()
+        if await self.cache_invalid() or not previous:
+            # если кэш уже невалиден (или сохраненные данные не читаются), то актуализируем его
+            await self.revalidate_many(
+                {self.cache_key: None}, self.fetch, concurrency=1, timeout=settings.REFRESH_TIMEOUT
+            )
+            current = await self.load()
+            if settings.CACHE_SNAPSHOT:
+                # снимок для чтения строится сразу после сохранения данных
+                await self.write_snapshot()
+        else:
+            current = previous
+
+        if not current:
+            # без списка стран изменения не определяются, а обработанный список не обновляется
+            return CountryDeltaDTO()
+
+        # без сохраненного списка (первый сбор) изменения определяются по данным до актуализации
+        processed = await self.load_processed()
+        delta = self.get_delta(processed if processed is not None else previous or [], current)
+        if delta.added or delta.removed or delta.changed:
+            logger.info(
+                "Список стран обновлен: добавлено %s, удалено %s, изменено %s",
+                len(delta.added),
+                len(delta.removed),
+                len(delta.changed),
+            )
+
+        return delta
+
+    async def commit(self, result: CountryDeltaDTO) -> None:
+        """
+        Сохранение списка стран, обработанного зависящими этапами (удаление ненужных данных и сбор новых).
+
+        :param result: Локации стран и изменения списка стран
+        :return:
+        """
+
+        if result.countries:
+            await self.get_backend().put(
+                self.get_processed_namespace(), self.cache_key, [country.dict() for country in result.countries]
+            )
+
+    @classmethod
+    def get_processed_namespace(cls) -> str:
+        """
+        Получение пространства имен для списка стран, обработанного при предыдущем сборе данных.
+
+        :return:
+        """
+
+        return f"processed/{cls.namespace}".rstrip("/")
+
+    @classmethod
+    async def load_processed(cls) -> Optional[list[dict]]:
+        """
+        Чтение списка стран (ключевых полей стран), обработанного при предыдущем сборе данных.
+
+        :return: Ключевые поля стран или None, если список еще не сохранялся
+        """
+
+        entry = await cls.get_backend().get(cls.get_processed_namespace(), cls.cache_key)
+        return entry.payload if entry else None
+
+    @staticmethod
+    def get_delta(previous: list[dict], current: list[dict]) -> CountryDeltaDTO:
+        """
+        Сравнение списков стран: добавленные и удаленные страны, страны с изменившимися столицей или названием.
+
+        :param previous: Предыдущие данные о странах
+        :param current: Новые данные о странах
+        :return:
+        """
+
+        def get_keys(items: list[dict]) -> dict[str, CountryKeyDTO]:
+            return {
+                item["alpha2code"]: CountryKeyDTO(
+                    alpha2code=item["alpha2code"], capital=item["capital"], name=item["name"]
+                )
+                for item in items
+            }
+
+        previous_keys, current_keys = get_keys(previous), get_keys(current)
+
+        return CountryDeltaDTO(
+            locations=frozenset(country.location for country in current_keys.values()),
+            countries=list(current_keys.values()),
+            added=[current_keys[code] for code in sorted(current_keys.keys() - previous_keys.keys())],
+            removed=[previous_keys[code] for code in sorted(previous_keys.keys() - current_keys.keys())],
+            changed=[
+                (previous_keys[code], current_keys[code])
+                for code in sorted(previous_keys.keys() & current_keys.keys())
+                if previous_keys[code] != current_keys[code]
+            ],
+        )
 
-        result = json.loads(content)
+    @classmethod
+    async def get_locations(cls) -> Optional[FrozenSet[LocationDTO]]:
+        """
+        Получение локаций (столиц стран) из сохраненных данных о странах.
+
+        :return:
+        """
+
+        result = await cls.load()
         if not result:
             return None
         locations = frozenset(
@@ -80,17 +297,67 @@ class CountryCollector(BaseCollector):
         :return:
         """
 
-        try:
-            print(await cls.get_file_path())
-            async with aiofiles.open(await cls.get_file_path(), mode="r") as file:
-                content = await file.read()
-        except FileNotFoundError:
+        countries = await cls.read_records()
+        return [country.to_dto() for country in countries] if countries is not None else None
+
+    @classmethod
+    async def read_records(cls) -> Optional[list[CountryRecord]]:
+        """
+        Чтение данных из кэша в виде моделей для чтения (см. :mod:`collectors.records`).
+
+        Проверенные данные читаются из снимка (см. :mod:`collectors.snapshot`), а если снимок отсутствует
+        или построен по другим данным, то данные о странах проверяются и снимок строится заново.
+
+        :return:
+        """
+
+        fetched_at = await cls.get_backend().fetched_at(cls.namespace, cls.cache_key)
+        if fetched_at is None or not await cls.is_servable(CacheEntry(None, fetched_at).age):
             return None
 
-        if not content:
+        if settings.CACHE_SNAPSHOT and (countries := await cls.get_snapshot().load(fetched_at)) is not None:
+            return countries
+
+        return await cls.write_snapshot()
+
+    @classmethod
+    async def write_snapshot(cls) -> Optional[list[CountryRecord]]:
+        """
+        Проверка сохраненных данных о странах и построение по ним снимка.
+
+        :return: Проверенные данные о странах
+        """
+
+        fetched_at = await cls.get_backend().fetched_at(cls.namespace, cls.cache_key)
+        items = await cls.load()
+        if fetched_at is None or not items:
             return None
 
-        items = json.loads(content)
+        countries = [CountryRecord.from_dto(country) for country in cls.build(items)]
+        if settings.CACHE_SNAPSHOT:
+            await cls.get_snapshot().save(countries, fetched_at)
+
+        return countries
+
+    @staticmethod
+    def get_snapshot() -> CountrySnapshot:
+        """
+        Получение снимка данных о странах.
+
+        :return:
+        """
+
+        return CountrySnapshot(settings.MEDIA_ABSOLUTE_PATH.joinpath(settings.SNAPSHOT_DIR, "country.pickle"))
+
+    @staticmethod
+    def build(items: list[dict]) -> list[CountryDTO]:
+        """
+        Построение моделей данных о странах с проверкой данных.
+
+        :param items: Сохраненные данные о странах
+        :return:
+        """
+
         result_list = []
         for item in items:
             result_list.append(
@@ -120,25 +387,31 @@ class CurrencyRatesCollector(BaseCollector):
     Сбор информации о курсах валют.
     """
 
+    name = "currency_rates"
+    cache_key = "currency_rates"
+
+    client: CurrencyClient
+
     def __init__(self) -> None:
         self.client = CurrencyClient()
 
-    @staticmethod
-    async def get_file_path(**kwargs: Any) -> Path:
-        return settings.MEDIA_ABSOLUTE_PATH.joinpath("currency_rates.json")
-
     @property
     async def cache_ttl(self) -> int:
         return settings.CACHE_TTL_CURRENCY_RATES
 
+    @property
+    async def cache_max_stale(self) -> int:
+        return settings.CACHE_MAX_STALE_CURRENCY_RATES
+
+    async def fetch(self, item: Any = None) -> Optional[dict]:
+        return await self.client.get_rates()
+
     async def collect(self, **kwargs: Any) -> None:
         if await self.cache_invalid():
             # если кэш уже невалиден, то актуализируем его
-            result = await self.client.get_rates()
-            if result:
-                result_str = json.dumps(result)
-                async with aiofiles.open(await self.get_file_path(), mode="w") as file:
-                    await file.write(result_str)
+            await self.revalidate_many(
+                {self.cache_key: None}, self.fetch, concurrency=1, timeout=settings.REFRESH_TIMEOUT
+            )
 
     @classmethod
     async def read(cls) -> Optional[CurrencyRatesDTO]:
@@ -148,14 +421,10 @@ class CurrencyRatesCollector(BaseCollector):
         :return:
         """
 
-        async with aiofiles.open(await cls.get_file_path(), mode="r") as file:
-            content = await file.read()
-
-        if not content:
+        result = await cls.read_cached()
+        if not result:
             return None
 
-        result = json.loads(content)
-
         return CurrencyRatesDTO(
             base=result["base"],
             date=result["date"],
@@ -163,49 +432,120 @@ class CurrencyRatesCollector(BaseCollector):
         )
 
 
-class WeatherCollector(BaseCollector):
+class LocationCollector(BaseCollector):
+    """
+    Базовый класс сборщиков информации для локаций (столиц стран): данные хранятся по ключу локации.
+    """
+
+    depends_on = {"country": "countries"}
+    # описание собираемых данных для журнала
+    description: str = ""
+
+    @property
+    @abstractmethod
+    def max_concurrency(self) -> int:
+        """
+        Максимальное количество одновременных запросов к внешнему сервису.
+
+        :return:
+        """
+
+    @property
+    @abstractmethod
+    def fetch_timeout(self) -> float:
+        """
+        Время ожидания получения данных для одной локации (в секундах).
+
+        :return:
+        """
+
+    async def collect(
+        self,
+        locations: Optional[FrozenSet[LocationDTO]] = frozenset(),
+        countries: Optional[CountryDeltaDTO] = None,
+        **kwargs: Any,
+    ) -> CollectSummaryDTO:
+
+        if countries is not None:
+            locations = countries.locations
+            await self.collect_garbage(countries)
+
+        summary = await self.refresh_many(
+            {await self.get_key(location): location for location in locations or ()},
+            self.fetch,
+            concurrency=self.max_concurrency,
+            timeout=self.fetch_timeout,
+        )
+        logger.info("Сбор данных %s завершен: %s", self.description, summary)
+
+        return summary
+
+    async def get_keys(self) -> list[str]:
+        return [
+            await self.get_key(location)
+            for location in await CountryCollector.get_locations() or ()
+        ]
+
+    async def get_obsolete_keys(self, countries: CountryDeltaDTO) -> set[str]:
+        current = {await self.get_key(location) for location in countries.locations}
+        return {await self.get_key(country.location) for country in countries.get_obsolete()} - current
+
+    @staticmethod
+    async def get_key(location: AnyLocation) -> str:
+        """
+        Получение ключа данных (имени файла) для локации.
+
+        :param location: Объект локации
+        :return:
+        """
+
+        return f"{location.capital}_{location.alpha2code}".lower()
+
+
+class WeatherCollector(LocationCollector):
     """
     Сбор информации о прогнозе погоды для столиц стран.
     """
 
+    name = "weather"
+    namespace = "weather"
+    description = "о погоде"
+
+    client: WeatherClient
+
     def __init__(self) -> None:
         self.client = WeatherClient()
 
-    @staticmethod
-    async def get_file_path(filename: str, **kwargs: Any) -> Path:  # type: ignore[override]
-        return settings.MEDIA_ABSOLUTE_PATH.joinpath("weather").joinpath(
-            f"{filename}.json"
-        )
-
     @property
     async def cache_ttl(self) -> int:
         return settings.CACHE_TTL_WEATHER
 
-    async def collect(
-        self, locations: FrozenSet[LocationDTO] = frozenset(), **kwargs: Any
-    ) -> None:
-
-        target_dir_path = f"{settings.MEDIA_ABSOLUTE_PATH}/weather"
-        # если целевой директории еще не существует, то она создается
-        if not await aiofiles.os.path.exists(target_dir_path):
-            await aiofiles.os.mkdir(target_dir_path)
-
-        for location in locations:
-            filename = f"{location.capital}_{location.alpha2code}".lower()
-            if await self.cache_invalid(filename=filename):
-                # если кэш уже невалиден, то актуализируем его
-                result = await self.client.get_weather(
-                    f"{location.capital},{location.alpha2code}"
-                )
-                if result:
-                    result_str = json.dumps(result)
-                    async with aiofiles.open(
-                        await self.get_file_path(filename), mode="w"
-                    ) as file:
-                        await file.write(result_str)
+    @property
+    async def cache_max_stale(self) -> int:
+        return settings.CACHE_MAX_STALE_WEATHER
+
+    @property
+    def max_concurrency(self) -> int:
+        return settings.WEATHER_MAX_CONCURRENCY
+
+    @property
+    def fetch_timeout(self) -> float:
+        return settings.WEATHER_TIMEOUT
+
+    async def fetch(self, location: AnyLocation) -> Optional[dict]:
+        """
+        Получение данных о погоде для одной локации.
+
+        :param location: Объект локации для получения данных
+        :return:
+        """
+
+        return await self.client.get_weather(
+            f"{location.capital},{location.alpha2code}"
+        )
 
     @classmethod
-    async def read(cls, location: LocationDTO) -> Optional[WeatherInfoDTO]:
+    async def read(cls, location: AnyLocation) -> Optional[WeatherInfoDTO]:
         """
         Чтение данных из кэша.
 
@@ -213,22 +553,78 @@ class WeatherCollector(BaseCollector):
         :return:
         """
 
-        filename = f"{location.capital}_{location.alpha2code}".lower()
-        async with aiofiles.open(await cls.get_file_path(filename), mode="r") as file:
-            content = await file.read()
+        weather = await cls.read_record(location)
+        return weather.to_dto() if weather else None
+
+    @classmethod
+    async def read_record(cls, location: AnyLocation) -> Optional[WeatherRecord]:
+        """
+        Чтение данных из кэша в виде модели для чтения (см. :mod:`collectors.records`).
 
-        result = json.loads(content)
+        :param location:
+        :return:
+        """
+
+        result = await cls.read_cached(await cls.get_key(location), location)
         if not result:
             return None
-        return WeatherInfoDTO(
-            temp=result["main"]["temp"],
-            pressure=result["main"]["pressure"],
-            humidity=result["main"]["humidity"],
-            wind_speed=result["wind"]["speed"],
-            description=result["weather"][0]["description"],
-            visibility=result["visibility"],
-            timezone=result["timezone"],
-        )
+        return WeatherRecord.from_payload(result)
+
+
+class CityCollector(LocationCollector):
+    """
+    Сбор информации о столицах стран (географические координаты).
+    """
+
+    name = "city"
+    namespace = "city"
+    description = "о столицах"
+
+    client: CityClient
+
+    def __init__(self) -> None:
+        self.client = CityClient()
+
+    @property
+    async def cache_ttl(self) -> int:
+        return settings.CACHE_TTL_CITY
+
+    @property
+    async def cache_max_stale(self) -> int:
+        return settings.CACHE_MAX_STALE_CITY
+
+    @property
+    def max_concurrency(self) -> int:
+        return settings.CITY_MAX_CONCURRENCY
+
+    @property
+    def fetch_timeout(self) -> float:
+        return settings.CITY_TIMEOUT
+
+    async def fetch(self, location: AnyLocation) -> Optional[dict]:
+        """
+        Получение данных о столице одной страны.
+
+        :param location: Объект локации для получения данных
+        :return:
+        """
+
+        return await self.client.get_city_info(location.capital)
+
+    @classmethod
+    async def read(cls, location: AnyLocation) -> Optional[CityInfoDTO]:
+        """
+        Чтение данных из кэша.
+
+        :param location:
+        :return:
+        """
+
+        result = await cls.read_cached(await cls.get_key(location), location)
+        if not result:
+            return None
+
+        return CityInfoDTO(**result)
 
 
 class NewsCollector(BaseCollector):
@@ -236,56 +632,85 @@ class NewsCollector(BaseCollector):
     Сбор новостей для стран.
     """
 
+    name = "news"
+    namespace = "news"
+    # названия стран читаются из сохраненного файла со списком стран,
+    # а изменения списка используются для удаления новостей удаленных стран
+    depends_on = {"country": "countries"}
+
+    client: NewsClient
+
     def __init__(self) -> None:
         self.client = NewsClient()
 
-    @staticmethod
-    async def get_file_path(filename: str, **kwargs: Any) -> Path:  # type: ignore[override]
-        return settings.MEDIA_ABSOLUTE_PATH.joinpath("news").joinpath(
-            f"{filename}.json"
-        )
-
     @property
     async def cache_ttl(self) -> int:
         return settings.CACHE_TTL_NEWS
 
-    async def collect(self, **kwargs: Any) -> None:
+    @property
+    async def cache_max_stale(self) -> int:
+        return settings.CACHE_MAX_STALE_NEWS
 
-        target_dir_path = settings.MEDIA_ABSOLUTE_PATH.joinpath("news")
-        # если целевой директории еще не существует, то она создается
-        if not await aiofiles.os.path.exists(target_dir_path):
-            await aiofiles.os.mkdir(target_dir_path)
+    async def collect(self, countries: Optional[CountryDeltaDTO] = None, **kwargs: Any) -> CollectSummaryDTO:
 
-        countries = await self._get_countries_names()
-        for country_name in countries:
-            short_country_name = country_name.split("_")[-1]
-            if short_country_name not in COUNTRY_SHORT_NAMES:
-                continue
-            if await self.cache_invalid(filename=country_name):
-                # если кэш уже невалиден, то актуализируем его
-                result = await self.client.get_news(short_country_name)
-                if result and result["totalResults"] > 0:
-                    result_str = json.dumps(result)
-                    async with aiofiles.open(
-                        await self.get_file_path(country_name), mode="w"
-                    ) as file:
-                        await file.write(result_str)
+        if countries is not None:
+            await self.collect_garbage(countries)
+
+        summary = await self.refresh_many(
+            {country_name: country_name.split("_")[-1] for country_name in await self.get_keys()},
+            self.fetch,
+            concurrency=settings.NEWS_MAX_CONCURRENCY,
+            timeout=settings.NEWS_TIMEOUT,
+        )
+        logger.info("Сбор новостей завершен: %s", summary)
+
+        return summary
+
+    async def get_keys(self) -> list[str]:
+        # новости собираются только для поддерживаемых сервисом стран
+        return [
+            country_name
+            for country_name in await self._get_countries_names()
+            if country_name.split("_")[-1] in COUNTRY_SHORT_NAMES
+        ]
+
+    async def fetch(self, short_country_name: str) -> Optional[dict]:
+        """
+        Получение новостей для одной страны.
+
+        :param short_country_name: Название страны в формате alpha2code
+        :return: Новости или None, если новостей нет
+        """
+
+        result = await self.client.get_news(short_country_name)
+        if result and result["totalResults"] > 0:
+            return result
+
+        return None
+
+    async def get_obsolete_keys(self, countries: CountryDeltaDTO) -> set[str]:
+        current = set(await self._get_countries_names())
+        return {self.get_key(country.name, country.alpha2code) for country in countries.get_obsolete()} - current
 
     @staticmethod
-    async def _get_countries_names() -> list[str]:
+    def get_key(name: str, alpha2code: str) -> str:
         """
-        Получение названий стран с их короткими названиями (alpha2code).
+        Получение ключа данных (названия страны с ее коротким названием) для страны.
+
+        :param name: Название страны
+        :param alpha2code: Короткое название страны (alpha2code)
+        :return:
         """
-        async with aiofiles.open(
-            settings.MEDIA_ABSOLUTE_PATH.joinpath("country.json"), mode="r"
-        ) as file:
-            content = await file.read()
 
-        items = json.loads(content)
-        return [
-            f"{item['name'].replace(' ', '_')}_{item['alpha2code']}".lower()
-            for item in items
-        ]
+        return f"{name.replace(' ', '_')}_{alpha2code}".lower()
+
+    @classmethod
+    async def _get_countries_names(cls) -> list[str]:
+        """
+        Получение названий стран с их короткими названиями (alpha2code).
+        """
+        items = await CountryCollector.load() or []
+        return [cls.get_key(item["name"], item["alpha2code"]) for item in items]
 
     @classmethod
     async def read(cls, country_name: str) -> list[NewsDTO] | None:
@@ -296,49 +721,141 @@ class NewsCollector(BaseCollector):
         :return:
         """
 
-        try:
-            async with aiofiles.open(
-                await cls.get_file_path(country_name), mode="r"
-            ) as file:
-                content = await file.read()
-        except FileNotFoundError:
-            return None
+        news = await cls.read_records(country_name)
+        return [item.to_dto() for item in news] if news is not None else None
+
+    @classmethod
+    async def read_records(cls, country_name: str) -> list[NewsRecord] | None:
+        """
+        Чтение данных из кэша в виде моделей для чтения (см. :mod:`collectors.records`).
 
-        result = json.loads(content)
+        :param country_name:
+        :return:
+        """
+
+        result = await cls.read_cached(country_name, country_name.split("_")[-1])
         if not result:
             return None
-        return [
-            NewsDTO(
-                author=item["author"],
-                title=item["title"],
-                description=item["description"],
-                publishedAt=item["publishedAt"],
-                content=item["content"],
-                url=item["url"],
-            )
-            for item in result["articles"]
-        ]
+        return [NewsRecord.from_payload(item) for item in result["articles"]]
 
 
 class Collectors:
-    @staticmethod
-    async def gather() -> tuple:
-        return await asyncio.gather(
-            CurrencyRatesCollector().collect(),
-            CountryCollector().collect(),
+    """
+    Планировщик сбора данных.
+
+    Сборщики образуют граф зависимостей (см. :attr:`BaseCollector.depends_on`)
+    и выполняются в одном цикле событий: каждый этап запускается, как только завершены этапы,
+    от которых он зависит, а независимые этапы выполняются одновременно.
+    """
+
+    collectors: tuple[type[BaseCollector], ...] = (
+        CurrencyRatesCollector,
+        CountryCollector,
+        WeatherCollector,
+        CityCollector,
+        NewsCollector,
+    )
+
+    @classmethod
+    async def gather(cls) -> dict[str, Any]:
+        """
+        Выполнение всех этапов сбора данных с учетом зависимостей между ними.
+
+        :return: Результаты этапов (или исключения) по названиям этапов
+        """
+
+        stages = {collector.name: collector for collector in cls.collectors}
+        for collector in cls.collectors:
+            if unknown := set(collector.depends_on) - set(stages):
+                raise ValueError(
+                    f"Неизвестные зависимости этапа {collector.name}: {unknown}"
+                )
+
+        # порядок запуска этапов (заодно проверяется отсутствие циклов)
+        order = TopologicalSorter(
+            {name: set(collector.depends_on) for name, collector in stages.items()}
+        ).static_order()
+        tasks: dict[str, asyncio.Task] = {}
+        instances = {name: collector() for name, collector in stages.items()}
+
+        async def run_stage(collector: BaseCollector) -> Any:
+            kwargs = {}
+            for dependency, argument in collector.depends_on.items():
+                result = await tasks[dependency]
+                if argument is not None:
+                    kwargs[argument] = result
+
+            return await collector.collect(**kwargs)
+
+        for name in order:
+            tasks[name] = asyncio.create_task(run_stage(instances[name]), name=name)
+
+        results = dict(
+            zip(tasks, await asyncio.gather(*tasks.values(), return_exceptions=True))
         )
+        for name, result in results.items():
+            if isinstance(result, BaseException):
+                logger.error("Этап сбора данных %s завершился ошибкой: %r", name, result)
+
+        # этап завершается, только если он и все зависящие от него этапы выполнены успешно
+        for name, instance in instances.items():
+            dependents = [other for other, stage in stages.items() if name in stage.depends_on]
+            if any(isinstance(results[stage], BaseException) for stage in (name, *dependents)):
+                continue
+            try:
+                await instance.commit(results[name])
+            except Exception:
+                logger.exception("Ошибка при завершении этапа сбора данных %s", name)
 
-    @staticmethod
-    def collect() -> None:
-        loop = asyncio.get_event_loop()
+        return results
+
+    @classmethod
+    async def gather_exclusive(cls) -> dict[str, Any]:
+        """
+        Сбор данных под межпроцессной блокировкой: если сбор уже выполняется другим процессом
+        (например, предыдущим запуском по расписанию), то запуск пропускается.
+
+        :return: Результаты этапов (пустой словарь, если запуск пропущен)
+        """
+
+        lock = cls.get_run_lock()
         try:
-            results = loop.run_until_complete(Collectors.gather())
-            loop.run_until_complete(WeatherCollector().collect(results[1]))
-            loop.run_until_complete(NewsCollector().collect())
-            loop.run_until_complete(loop.shutdown_asyncgens())
+            if not await lock.acquire(blocking=False):
+                logger.info("Сбор данных уже выполняется другим процессом, запуск пропущен")
+                return {}
+
+            return await cls.gather()
+        finally:
+            lock.release()
+
+    @classmethod
+    async def run(cls) -> dict[str, Any]:
+        """
+        Сбор данных с последующим закрытием общей HTTP-сессии.
 
+        :return:
+        """
+
+        try:
+            return await cls.gather_exclusive()
         finally:
-            loop.close()
+            # закрытие общей HTTP-сессии и соединений
+            await session_manager.close()
+            await BaseCollector.get_backend().close()
+
+    @staticmethod
+    def get_run_lock() -> FileLock:
+        """
+        Получение межпроцессной блокировки запуска сбора данных.
+
+        :return:
+        """
+
+        return FileLock(settings.MEDIA_ABSOLUTE_PATH.joinpath(settings.LOCK_DIR, "collect.lock"))
+
+    @classmethod
+    def collect(cls) -> dict[str, Any]:
+        return asyncio.run(cls.run())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,92 @@
+"""
+Межпроцессные блокировки на основе файлов.
+
+Периодические запуски сбора данных могут пересекаться во времени (в том числе в разных контейнерах
+с общей директорией для сохранения файлов), поэтому запуск сбора и получение данных для каждого ключа
+выполняются под блокировкой: другой процесс пропускает уже выполняемую работу или ожидает ее завершения.
+"""
+
+import asyncio
+import fcntl
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class FileLock:
+    """
+    Эксклюзивная блокировка файла (``flock``), освобождаемая при завершении процесса.
+    """
+
+    def __init__(self, path: Path, poll_interval: float = 0.1) -> None:
+        """
+        Конструктор.
+
+        :param path: Путь до файла блокировки
+        :param poll_interval: Интервал повторных попыток захвата блокировки при ожидании (в секундах)
+        """
+
+        self.path = path
+        self.poll_interval = poll_interval
+        self._descriptor: Optional[int] = None
+
+    @property
+    def locked(self) -> bool:
+        """
+        Блокировка захвачена текущим объектом.
+
+        :return:
+        """
+
+        return self._descriptor is not None
+
+    async def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Захват блокировки.
+
+        :param blocking: Ожидать освобождения блокировки, если она захвачена другим процессом
+        :param timeout: Время ожидания (в секундах), по умолчанию – без ограничения
+        :return: True, если блокировка захвачена
+        """
+
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while not self._try_acquire():
+            if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                return False
+            await asyncio.sleep(self.poll_interval)
+
+        return True
+
+    def release(self) -> None:
+        """
+        Освобождение блокировки.
+
+        :return:
+        """
+
+        if self._descriptor is not None:
+            fcntl.flock(self._descriptor, fcntl.LOCK_UN)
+            os.close(self._descriptor)
+            self._descriptor = None
+
+    def _try_acquire(self) -> bool:
+        """
+        Попытка захвата блокировки без ожидания.
+
+        :return:
+        """
+
+        if self._descriptor is not None:
+            return True
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(descriptor)
+            return False
+
+        self._descriptor = descriptor
+        return True
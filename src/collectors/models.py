@@ -3,7 +3,31 @@
 """
 
 from datetime import datetime
+from typing import Any
+
 from pydantic import Field, BaseModel, HttpUrl
+from pydantic.json import pydantic_encoder
+
+
+def model_encoder(obj: Any) -> Any:
+    """
+    Кодирование моделей в JSON.
+
+    Вложенные модели кодируются по одной (без предварительного преобразования в словари),
+    так как pydantic не может преобразовать множество моделей в множество словарей.
+
+    .. code-block::
+
+        location_info.json(models_as_dict=False, encoder=model_encoder)
+
+    :param obj: Объект для кодирования
+    :return:
+    """
+
+    if isinstance(obj, BaseModel):
+        return dict(obj)
+
+    return pydantic_encoder(obj)
 
 
 class HashableBaseModel(BaseModel):
@@ -267,11 +291,107 @@ class LocationInfoDTO(BaseModel):
             },
             capital=CityInfoDTO(...),
             news=[NewsDTO(...), ..., NewsDTO(...)],
+            degraded=["capital"],
+            ages={"weather": 12600.0, "currency_rates": 3600.0},
         )
+
+    Поле ``degraded`` содержит названия частей данных, которые не удалось получить
+    (ошибка или превышение времени ожидания), а поле ``ages`` – возраст сохраненных частей данных (в секундах).
     """
 
     location: CountryDTO
-    weather: WeatherInfoDTO
+    weather: WeatherInfoDTO | None
     currency_rates: dict[str, float]
-    capital: CityInfoDTO
+    capital: CityInfoDTO | None
     news: list[NewsDTO] | None
+    degraded: list[str] = []
+    ages: dict[str, float] = {}
+
+
+class CountryKeyDTO(HashableBaseModel):
+    """
+    Модель ключевых полей страны, от которых зависят ключи собираемых для нее данных.
+
+    .. code-block::
+
+        CountryKeyDTO(
+            alpha2code="AX",
+            capital="Mariehamn",
+            name="Åland Islands",
+        )
+    """
+
+    alpha2code: str
+    capital: str
+    name: str
+
+    @property
+    def location(self) -> LocationDTO:
+        """
+        Локация (столица) страны.
+
+        :return:
+        """
+
+        return LocationDTO(capital=self.capital, alpha2code=self.alpha2code)
+
+
+class CountryDeltaDTO(BaseModel):
+    """
+    Модель локаций стран и изменений списка стран по сравнению со списком, обработанным при предыдущем сборе данных.
+
+    .. code-block::
+
+        CountryDeltaDTO(
+            locations=frozenset({LocationDTO(capital="Tallinn", alpha2code="EE")}),
+            countries=[CountryKeyDTO(alpha2code="EE", capital="Tallinn", name="Estonia")],
+            added=[CountryKeyDTO(alpha2code="EE", capital="Tallinn", name="Estonia")],
+            removed=[CountryKeyDTO(alpha2code="AX", capital="Mariehamn", name="Åland Islands")],
+            changed=[],
+        )
+
+    Поле ``countries`` содержит ключевые поля всех стран списка, а поле ``changed`` – прежние и новые
+    ключевые поля стран, у которых изменились столица или название.
+    """
+
+    locations: frozenset[LocationDTO] = frozenset()
+    countries: list[CountryKeyDTO] = []
+    added: list[CountryKeyDTO] = []
+    removed: list[CountryKeyDTO] = []
+    changed: list[tuple[CountryKeyDTO, CountryKeyDTO]] = []
+
+    def get_obsolete(self) -> list[CountryKeyDTO]:
+        """
+        Получение ключевых полей стран, данные для которых больше не нужны:
+        удаленных стран и прежних значений изменившихся стран.
+
+        :return:
+        """
+
+        return self.removed + [previous for previous, _ in self.changed]
+
+
+class CollectSummaryDTO(BaseModel):
+    """
+    Модель итогов сбора данных.
+
+    .. code-block::
+
+        CollectSummaryDTO(
+            succeeded=12,
+            failed=1,
+            skipped=187,
+            not_modified=3,
+            deferred=0,
+        )
+
+    Поле ``not_modified`` содержит количество ключей, данные для которых не изменились у сервиса
+    (обновлено только время их получения), а поле ``deferred`` – количество ключей с неактуальными данными,
+    актуализация которых отложена до следующего запуска (см. ``CACHE_REFRESH_SLICE``).
+    """
+
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    not_modified: int = 0
+    deferred: int = 0
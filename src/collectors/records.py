@@ -0,0 +1,277 @@
+"""
+Легковесные модели для чтения данных (read models).
+
+Модели pydantic (см. :mod:`collectors.models`) проверяют данные при создании и занимают много памяти,
+поэтому при поиске (индекс стран, чтение данных для ответа) используются неизменяемые модели
+на основе ``dataclass`` со ``__slots__``: они создаются без проверки данных, хэшируются по значениям полей
+и преобразуются в модели pydantic только при формировании ответа (метод ``to_dto``).
+
+.. code-block::
+
+    country = CountryRecord.from_dto(country_dto)
+    location_info = LocationInfoDTO(location=country.to_dto(), ...)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+from collectors.models import (
+    CountryDTO,
+    CurrencyInfoDTO,
+    LanguagesInfoDTO,
+    LocationDTO,
+    NewsDTO,
+    WeatherInfoDTO,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class LocationRecord:
+    """
+    Локация (столица страны).
+
+    .. code-block::
+
+        LocationRecord(capital="Mariehamn", alpha2code="AX")
+    """
+
+    capital: str
+    alpha2code: str
+
+    def to_dto(self) -> LocationDTO:
+        """
+        Преобразование в модель pydantic.
+
+        :return:
+        """
+
+        return LocationDTO.construct(capital=self.capital, alpha2code=self.alpha2code)
+
+
+# локация в любом представлении (для функций, которым нужны только поля локации)
+AnyLocation = Union[LocationDTO, LocationRecord]
+
+
+@dataclass(frozen=True, slots=True)
+class CountryRecord:
+    """
+    Проверенные данные о стране.
+
+    Валюты хранятся кодами, а языки – парами из названия и названия на родном языке
+    (в порядке сортировки), списки – кортежами.
+
+    .. code-block::
+
+        CountryRecord(
+            capital="Mariehamn",
+            alpha2code="AX",
+            alt_spellings=("AX", "Aaland", "Aland", "Ahvenanmaa"),
+            currencies=("EUR",),
+            flag="http://assets.promptapi.com/flags/AX.svg",
+            languages=(("Swedish", "svenska"),),
+            name="Åland Islands",
+            population=28875,
+            subregion="Northern Europe",
+            timezones=("UTC+02:00",),
+            area=1580.0,
+        )
+    """
+
+    capital: str
+    alpha2code: str
+    alt_spellings: tuple[str, ...]
+    currencies: tuple[str, ...]
+    flag: str
+    languages: tuple[tuple[str, str], ...]
+    name: str
+    population: int
+    subregion: str
+    timezones: tuple[str, ...]
+    area: Optional[float]
+
+    @property
+    def location(self) -> LocationRecord:
+        """
+        Локация (столица) страны.
+
+        :return:
+        """
+
+        return LocationRecord(self.capital, self.alpha2code)
+
+    @classmethod
+    def from_dto(cls, country: CountryDTO) -> "CountryRecord":
+        """
+        Создание по проверенной модели pydantic.
+
+        :param country: Данные о стране
+        :return:
+        """
+
+        return cls(
+            capital=country.capital,
+            alpha2code=country.alpha2code,
+            alt_spellings=tuple(country.alt_spellings),
+            currencies=tuple(sorted(currency.code for currency in country.currencies)),
+            flag=country.flag,
+            languages=tuple(sorted((language.name, language.native_name) for language in country.languages)),
+            name=country.name,
+            population=country.population,
+            subregion=country.subregion,
+            timezones=tuple(country.timezones),
+            area=country.area,
+        )
+
+    def to_dto(self) -> CountryDTO:
+        """
+        Преобразование в модель pydantic (без повторной проверки данных).
+
+        :return:
+        """
+
+        return CountryDTO.construct(
+            capital=self.capital,
+            alpha2code=self.alpha2code,
+            alt_spellings=list(self.alt_spellings),
+            currencies={CurrencyInfoDTO.construct(code=code) for code in self.currencies},
+            flag=self.flag,
+            languages={
+                LanguagesInfoDTO.construct(name=name, native_name=native_name)
+                for name, native_name in self.languages
+            },
+            name=self.name,
+            population=self.population,
+            subregion=self.subregion,
+            timezones=list(self.timezones),
+            area=self.area,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class WeatherRecord:
+    """
+    Данные о погоде.
+
+    .. code-block::
+
+        WeatherRecord(
+            temp=13.92,
+            pressure=1023,
+            humidity=54,
+            wind_speed=4.63,
+            visibility=10000,
+            description="scattered clouds",
+            timezone=7200,
+        )
+    """
+
+    temp: float
+    pressure: int
+    humidity: int
+    wind_speed: float
+    visibility: int
+    description: str
+    timezone: int
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "WeatherRecord":
+        """
+        Создание по сохраненным данным сервиса погоды.
+
+        Числовые значения приводятся к типам полей, как и при проверке модели pydantic.
+
+        :param payload: Сохраненные данные
+        :return:
+        :raises KeyError: Если в данных нет обязательных полей
+        :raises ValueError: Если значения полей не приводятся к типам полей
+        """
+
+        return cls(
+            temp=float(payload["main"]["temp"]),
+            pressure=int(payload["main"]["pressure"]),
+            humidity=int(payload["main"]["humidity"]),
+            wind_speed=float(payload["wind"]["speed"]),
+            visibility=int(payload["visibility"]),
+            description=str(payload["weather"][0]["description"]),
+            timezone=int(payload["timezone"]),
+        )
+
+    def to_dto(self) -> WeatherInfoDTO:
+        """
+        Преобразование в модель pydantic (без повторной проверки данных).
+
+        :return:
+        """
+
+        return WeatherInfoDTO.construct(
+            temp=self.temp,
+            pressure=self.pressure,
+            humidity=self.humidity,
+            wind_speed=self.wind_speed,
+            visibility=self.visibility,
+            description=self.description,
+            timezone=self.timezone,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class NewsRecord:
+    """
+    Данные о новости в том виде, в каком они сохранены.
+
+    .. code-block::
+
+        NewsRecord(
+            author="Иванов И.И.",
+            title="Ограбление века",
+            description="Ограбили Аллу Пугачеву",
+            publishedAt="2024-06-06T10:57:25Z",
+            content="bla bla bla...",
+            url="http://site.ru/kjidpwk",
+        )
+    """
+
+    author: str
+    title: str
+    description: Optional[str]
+    publishedAt: str
+    content: Optional[str]
+    url: str
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "NewsRecord":
+        """
+        Создание по сохраненным данным о новости.
+
+        :param payload: Сохраненные данные
+        :return:
+        """
+
+        return cls(
+            author=payload["author"],
+            title=payload["title"],
+            description=payload["description"],
+            publishedAt=payload["publishedAt"],
+            content=payload["content"],
+            url=payload["url"],
+        )
+
+    def to_dto(self) -> NewsDTO:
+        """
+        Преобразование в модель pydantic.
+
+        Дата публикации и адрес новости получены от внешнего сервиса без проверки,
+        поэтому модель создается с проверкой данных.
+
+        :return:
+        :raises pydantic.ValidationError: Если данные не прошли проверку
+        """
+
+        return NewsDTO(
+            author=self.author,
+            title=self.title,
+            description=self.description,
+            publishedAt=self.publishedAt,
+            content=self.content,
+            url=self.url,
+        )
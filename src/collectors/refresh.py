@@ -0,0 +1,68 @@
+"""
+Фоновая актуализация устаревших данных (stale-while-revalidate).
+
+При чтении устаревших данных пользователь сразу получает последние сохраненные данные,
+а их актуализация выполняется в фоне, поэтому время ответа не зависит от времени ответа внешних сервисов.
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collectors.base import BaseCollector
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshQueue:
+    """
+    Очередь фоновой актуализации данных (каждый ключ актуализируется не более одного раза одновременно).
+    """
+
+    def __init__(self) -> None:
+        # выполняющиеся задачи актуализации по пространству имен и ключу данных
+        self._tasks: dict[tuple[str, str], asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def enqueue(self, collector: "BaseCollector", key: str, item: Any = None) -> None:
+        """
+        Постановка данных в очередь на актуализацию.
+
+        :param collector: Сборщик данных
+        :param key: Ключ данных
+        :param item: Элемент для получения данных (см. :meth:`BaseCollector.fetch`)
+        :return:
+        """
+
+        task_key = (collector.namespace, key)
+        if task_key in self._tasks:
+            return
+
+        logger.debug("Фоновая актуализация данных: %s/%s", *task_key)
+        task = asyncio.create_task(collector.refresh(key, item))
+        self._tasks[task_key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(task_key, None))
+
+    async def drain(self, timeout: float) -> None:
+        """
+        Ожидание завершения актуализации (незавершенные за отведенное время задачи отменяются).
+
+        :param timeout: Время ожидания (в секундах)
+        :return:
+        """
+
+        if not self._tasks:
+            return
+
+        tasks = list(self._tasks.values())
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# общая очередь фоновой актуализации для процесса
+refresh_queue = RefreshQueue()
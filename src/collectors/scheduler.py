@@ -0,0 +1,129 @@
+"""
+Постоянно работающий планировщик сбора данных.
+
+В отличие от запуска сбора по расписанию cron (новый процесс каждую минуту), планировщик работает в одном процессе:
+вычисляет время устаревания данных для всех ключей, ожидает ближайшего из них и актуализирует только устаревшие данные,
+переиспользуя загруженные модули и HTTP-соединения между запусками.
+"""
+
+import asyncio
+import logging
+import signal
+import time
+from typing import Optional
+
+from clients.session import session_manager
+from collectors.base import BaseCollector
+from collectors.collector import Collectors
+from settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    """
+    Планировщик актуализации данных по времени их устаревания.
+    """
+
+    def __init__(self, collectors: type[Collectors] = Collectors) -> None:
+        """
+        Конструктор.
+
+        :param collectors: Планировщик этапов сбора данных
+        """
+
+        self.collectors = collectors
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """
+        Остановка планировщика (после завершения текущего запуска сбора).
+
+        :return:
+        """
+
+        logger.info("Остановка планировщика ...")
+        self._stopping.set()
+
+    async def get_next_run_at(self) -> Optional[float]:
+        """
+        Получение ближайшего времени устаревания данных среди всех ключей всех сборщиков.
+
+        :return: Время (timestamp) или None, если ключей нет
+        """
+
+        collectors = [collector() for collector in self.collectors.collectors]
+        expiries = await asyncio.gather(*(collector.get_expiries() for collector in collectors))
+
+        run_at = []
+        for collector, result in zip(collectors, expiries):
+            if not result:
+                continue
+            expiry = min(result.values())
+            # данные сервиса, запросы к которому отключены, актуализируются после истечения времени отключения
+            if (unavailable_until := collector.get_unavailable_until()) is not None:
+                logger.info("Сервис %s недоступен до %s", collector.name, time.ctime(unavailable_until))
+                expiry = max(expiry, unavailable_until)
+            run_at.append(expiry)
+
+        return min(run_at, default=None)
+
+    async def get_delay(self) -> float:
+        """
+        Получение времени ожидания до следующего запуска сбора данных.
+
+        :return: Время ожидания (в секундах)
+        """
+
+        next_run_at = await self.get_next_run_at()
+        delay = settings.SCHEDULER_MAX_INTERVAL if next_run_at is None else next_run_at - time.time()
+
+        return min(max(delay, settings.SCHEDULER_MIN_INTERVAL), settings.SCHEDULER_MAX_INTERVAL)
+
+    async def run(self) -> None:
+        """
+        Запуск планировщика до получения сигнала остановки (SIGTERM, SIGINT).
+
+        :return:
+        """
+
+        loop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signal_number, self.stop)
+
+        logger.info("Запуск планировщика сбора данных ...")
+        try:
+            while not self._stopping.is_set():
+                await self._run_until_stopped()
+                delay = await self.get_delay()
+                logger.info("Следующая актуализация данных через %.0f с", delay)
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for signal_number in (signal.SIGTERM, signal.SIGINT):
+                loop.remove_signal_handler(signal_number)
+            # закрытие общей HTTP-сессии и соединений
+            await session_manager.close()
+            await BaseCollector.get_backend().close()
+            logger.info("Планировщик остановлен.")
+
+    async def _run_until_stopped(self) -> None:
+        """
+        Запуск сбора данных, прерываемый при остановке планировщика
+        (запуску дается ``SCHEDULER_STOP_TIMEOUT`` секунд на завершение).
+
+        :return:
+        """
+
+        task = asyncio.create_task(self.collectors.gather_exclusive())
+        stopping = asyncio.create_task(self._stopping.wait())
+        await asyncio.wait({task, stopping}, return_when=asyncio.FIRST_COMPLETED)
+        stopping.cancel()
+
+        if not task.done():
+            await asyncio.wait({task}, timeout=settings.SCHEDULER_STOP_TIMEOUT)
+            task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
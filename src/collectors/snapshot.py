@@ -0,0 +1,96 @@
+"""
+Снимок данных о странах, подготовленный для чтения.
+
+Исходные данные о странах (JSON) остаются основными, а снимок строится по ним после проверки моделей данных
+и хранит значения полей стран в компактном двоичном виде (pickle). При чтении снимка модели для чтения
+(см. :class:`collectors.records.CountryRecord`) создаются по значениям полей без повторной проверки.
+Снимок содержит заголовок с форматом, версией и временем получения исходных данных:
+снимок другой версии или построенный по другим исходным данным не используется и строится заново.
+"""
+
+import asyncio
+import logging
+import pickle
+from dataclasses import astuple
+from pathlib import Path
+from typing import Any, Optional
+
+from collectors.records import CountryRecord
+from collectors.storage import write_atomic
+
+logger = logging.getLogger(__name__)
+
+# формат и версия снимка (версия увеличивается при изменении состава полей)
+SNAPSHOT_FORMAT = "countries"
+SNAPSHOT_VERSION = 1
+
+
+class _RestrictedUnpickler(pickle.Unpickler):
+    """
+    Чтение снимка, содержащего только встроенные типы (строки, числа, кортежи, списки).
+    """
+
+    def find_class(self, module: str, name: str) -> Any:
+        raise pickle.UnpicklingError(f"Недопустимый тип в снимке: {module}.{name}")
+
+
+class CountrySnapshot:
+    """
+    Снимок данных о странах.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Конструктор.
+
+        :param path: Путь до файла снимка
+        """
+
+        self.path = path
+
+    async def load(self, fetched_at: float) -> Optional[list[CountryRecord]]:
+        """
+        Чтение снимка.
+
+        :param fetched_at: Время получения исходных данных о странах
+        :return: Данные о странах или None, если снимка нет или он построен по другим исходным данным
+        """
+
+        try:
+            rows = await asyncio.to_thread(self._read, fetched_at)
+            return [CountryRecord(*row) for row in rows] if rows is not None else None
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, ValueError, TypeError) as exception:
+            logger.warning("Поврежденный снимок данных о странах %s: %r", self.path, exception)
+            return None
+
+    async def save(self, countries: list[CountryRecord], fetched_at: float) -> None:
+        """
+        Сохранение снимка.
+
+        :param countries: Проверенные данные о странах
+        :param fetched_at: Время получения исходных данных о странах
+        :return:
+        """
+
+        rows = [astuple(country) for country in countries]
+        content = pickle.dumps((SNAPSHOT_FORMAT, SNAPSHOT_VERSION, fetched_at)) + pickle.dumps(rows)
+
+        await asyncio.to_thread(self.path.parent.mkdir, parents=True, exist_ok=True)
+        await asyncio.to_thread(write_atomic, self.path, content)
+
+    def _read(self, fetched_at: float) -> Optional[list[tuple]]:
+        """
+        Чтение заголовка и, если снимок актуален, значений полей стран.
+
+        :param fetched_at: Время получения исходных данных о странах
+        :return:
+        """
+
+        with open(self.path, "rb") as file:
+            unpickler = _RestrictedUnpickler(file)
+            if unpickler.load() != (SNAPSHOT_FORMAT, SNAPSHOT_VERSION, fetched_at):
+                return None
+
+            return unpickler.load()
@@ -0,0 +1,633 @@
+"""
+Хранилища (бэкенды) кэша собранных данных.
+
+Данные сборщиков хранятся по пространствам имен (тип данных, например, ``weather``) и ключам
+(например, ``tallinn_ee``) вместе со временем их получения. Бэкенд выбирается в настройках (``CACHE_BACKEND``):
+
+* ``files`` – отдельный JSON-файл для каждого ключа в директории для сохранения файлов;
+* ``memory`` – LRU-кэш в памяти процесса;
+* ``sqlite`` – одна база данных SQLite (проверка актуальности – одним запросом по индексу,
+  сохранение результатов сбора – одной транзакцией).
+
+Данные кодируются в JSON кодеком, выбранным в настройках (``CACHE_CODEC``, см. :mod:`collectors.codecs`).
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Iterable, NamedTuple, Optional, TypeVar
+
+import aiofiles
+import aiofiles.os
+
+from collectors.codecs import Codec, JsonCodec, get_codec
+from settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+ResultT = TypeVar("ResultT")
+
+
+class CacheEntry(NamedTuple):
+    """
+    Сохраненные данные и время их получения (timestamp).
+    """
+
+    payload: Any
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        """
+        Возраст данных (в секундах).
+
+        :return:
+        """
+
+        return time.time() - self.fetched_at
+
+
+class CacheBackend(ABC):
+    """
+    Базовый класс, реализующий интерфейс для хранилищ кэша.
+    """
+
+    @abstractmethod
+    async def get(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        """
+        Получение сохраненных данных.
+
+        :param namespace: Пространство имен (тип данных)
+        :param key: Ключ данных
+        :return:
+        """
+
+    @abstractmethod
+    async def put(self, namespace: str, key: str, payload: Any) -> None:
+        """
+        Сохранение данных (временем получения данных считается текущее время).
+
+        :param namespace: Пространство имен (тип данных)
+        :param key: Ключ данных
+        :param payload: Данные
+        :return:
+        """
+
+    @abstractmethod
+    async def fetched_at(self, namespace: str, key: str) -> Optional[float]:
+        """
+        Получение времени получения данных без их чтения.
+
+        :param namespace: Пространство имен (тип данных)
+        :param key: Ключ данных
+        :return: Время получения данных (timestamp) или None, если данных нет
+        """
+
+    @abstractmethod
+    async def delete_many(self, namespace: str, keys: Iterable[str]) -> None:
+        """
+        Удаление данных для нескольких ключей (отсутствующие ключи пропускаются).
+
+        :param namespace: Пространство имен (тип данных)
+        :param keys: Ключи данных
+        :return:
+        """
+
+    async def fetched_at_many(self, namespace: str, keys: Iterable[str]) -> dict[str, float]:
+        """
+        Получение времени получения данных для нескольких ключей без их чтения.
+
+        :param namespace: Пространство имен (тип данных)
+        :param keys: Ключи данных
+        :return: Время получения данных по ключам (ключи без данных отсутствуют)
+        """
+
+        result = {}
+        for key in keys:
+            if (fetched_at := await self.fetched_at(namespace, key)) is not None:
+                result[key] = fetched_at
+
+        return result
+
+    async def get_many(self, namespace: str, keys: Iterable[str]) -> dict[str, CacheEntry]:
+        """
+        Получение сохраненных данных для нескольких ключей.
+
+        :param namespace: Пространство имен (тип данных)
+        :param keys: Ключи данных
+        :return: Данные по ключам (ключи без данных отсутствуют)
+        """
+
+        entries = {}
+        for key in keys:
+            if entry := await self.get(namespace, key):
+                entries[key] = entry
+
+        return entries
+
+    async def put_many(self, namespace: str, items: dict[str, Any]) -> None:
+        """
+        Сохранение данных для нескольких ключей.
+
+        :param namespace: Пространство имен (тип данных)
+        :param items: Данные по ключам
+        :return:
+        """
+
+        for key, payload in items.items():
+            await self.put(namespace, key, payload)
+
+    async def touch_many(self, namespace: str, keys: Iterable[str]) -> None:
+        """
+        Обновление времени получения данных без их перезаписи
+        (например, если сервис ответил, что данные не изменились).
+
+        :param namespace: Пространство имен (тип данных)
+        :param keys: Ключи данных
+        :return:
+        """
+
+        entries = await self.get_many(namespace, keys)
+        await self.put_many(namespace, {key: entry.payload for key, entry in entries.items()})
+
+    async def fresh_keys(self, namespace: str, keys: Iterable[str], ttl: float) -> set[str]:
+        """
+        Получение ключей, данные для которых актуальны.
+
+        :param namespace: Пространство имен (тип данных)
+        :param keys: Проверяемые ключи
+        :param ttl: Время актуальности данных (в секундах)
+        :return:
+        """
+
+        now = time.time()
+        fresh = set()
+        for key in keys:
+            fetched_at = await self.fetched_at(namespace, key)
+            if fetched_at is not None and now - fetched_at <= ttl:
+                fresh.add(key)
+
+        return fresh
+
+    async def is_fresh(self, namespace: str, key: str, ttl: float) -> bool:
+        """
+        Проверка актуальности данных.
+
+        :param namespace: Пространство имен (тип данных)
+        :param key: Ключ данных
+        :param ttl: Время актуальности данных (в секундах)
+        :return:
+        """
+
+        return key in await self.fresh_keys(namespace, (key,), ttl)
+
+    async def close(self) -> None:
+        """
+        Освобождение ресурсов хранилища.
+
+        :return:
+        """
+
+
+def write_atomic(file_path: Path, content: str | bytes) -> None:
+    """
+    Атомарная запись файла: запись во временный файл, сброс на диск и замена целевого файла.
+
+    :param file_path: Путь до файла
+    :param content: Содержимое файла (текст или двоичные данные)
+    :return:
+    """
+
+    if isinstance(content, str):
+        content = content.encode()
+
+    descriptor, temp_path = tempfile.mkstemp(
+        dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        # временный файл создается доступным только владельцу
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(temp_path)
+        raise
+
+    # сброс на диск записи о замене файла в директории
+    directory = os.open(file_path.parent, os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+
+
+class FileSystemBackend(CacheBackend):
+    """
+    Хранилище данных в JSON-файлах: ``<директория>/<пространство имен>/<ключ>.json``.
+    Временем получения данных считается время последнего изменения файла.
+
+    Файл записывается во временный файл в той же директории и заменяет целевой файл целиком (``os.replace``),
+    поэтому читатели из других процессов никогда не видят частично записанный файл.
+    При включенной контрольной сумме данные сохраняются вместе с ней:
+
+    .. code-block::
+
+        {"sha256": "9f86d08...", "payload": {...}}
+    """
+
+    # начало файла с контрольной суммой и разделитель контрольной суммы и данных
+    CHECKSUM_PREFIX = '{"sha256": "'
+    CHECKSUM_SEPARATOR = '", "payload": '
+
+    def __init__(self, root: Path, checksum: bool = False, codec: Optional[Codec] = None) -> None:
+        """
+        Конструктор.
+
+        :param root: Директория для сохранения файлов
+        :param checksum: Сохранять данные с контрольной суммой
+        :param codec: Кодек данных (по умолчанию – модуль ``json`` стандартной библиотеки)
+        """
+
+        self.root = root
+        self.checksum = checksum
+        self.codec = codec or JsonCodec()
+
+    def get_path(self, namespace: str, key: str) -> Path:
+        """
+        Получение пути до файла с данными.
+
+        :param namespace: Пространство имен (тип данных)
+        :param key: Ключ данных
+        :return:
+        """
+
+        return self.root.joinpath(namespace, f"{key}.json")
+
+    async def get(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        file_path = self.get_path(namespace, key)
+        try:
+            fetched_at = await aiofiles.os.path.getmtime(file_path)
+            async with aiofiles.open(file_path, mode="r", encoding="utf-8") as file:
+                content = await file.read()
+        except FileNotFoundError:
+            return None
+
+        if not content:
+            return None
+
+        try:
+            return CacheEntry(self._decode(content), fetched_at)
+        except ValueError:
+            # поврежденный файл переносится в сторону: данные считаются отсутствующими и будут собраны заново
+            logger.warning("Поврежденный файл с данными: %s", file_path)
+            await asyncio.to_thread(self.quarantine, file_path, fetched_at)
+            return None
+
+    async def put(self, namespace: str, key: str, payload: Any) -> None:
+        file_path = self.get_path(namespace, key)
+        # если целевой директории еще не существует, то она создается
+        if not await aiofiles.os.path.exists(file_path.parent):
+            await aiofiles.os.makedirs(file_path.parent, exist_ok=True)
+
+        await asyncio.to_thread(write_atomic, file_path, self._encode(payload))
+
+    async def fetched_at(self, namespace: str, key: str) -> Optional[float]:
+        file_path = self.get_path(namespace, key)
+        try:
+            # пустой файл считается отсутствием данных
+            if not await aiofiles.os.path.getsize(file_path):
+                return None
+            return await aiofiles.os.path.getmtime(file_path)
+        except FileNotFoundError:
+            return None
+
+    async def touch_many(self, namespace: str, keys: Iterable[str]) -> None:
+        for key in keys:
+            try:
+                # время получения данных – время последнего изменения файла
+                await asyncio.to_thread(os.utime, self.get_path(namespace, key))
+            except FileNotFoundError:
+                pass
+
+    async def delete_many(self, namespace: str, keys: Iterable[str]) -> None:
+        for key in keys:
+            try:
+                await aiofiles.os.remove(self.get_path(namespace, key))
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def quarantine(file_path: Path, fetched_at: float) -> None:
+        """
+        Перенос поврежденного файла с данными в файл ``<ключ>.json.corrupt``.
+
+        Файл переносится, только если он не был перезаписан после чтения (например, другим процессом).
+
+        :param file_path: Путь до файла
+        :param fetched_at: Время последнего изменения прочитанного файла
+        :return:
+        """
+
+        try:
+            if os.path.getmtime(file_path) == fetched_at:
+                os.replace(file_path, file_path.with_name(f"{file_path.name}.corrupt"))
+        except FileNotFoundError:
+            pass
+
+    def _encode(self, payload: Any) -> str:
+        """
+        Сериализация данных (с контрольной суммой, если она включена).
+
+        :param payload: Данные
+        :return:
+        """
+
+        content = self.codec.dumps(payload)
+        if not self.checksum:
+            return content
+
+        checksum = hashlib.sha256(content.encode()).hexdigest()
+        return f"{self.CHECKSUM_PREFIX}{checksum}{self.CHECKSUM_SEPARATOR}{content}}}"
+
+    def _decode(self, content: str) -> Any:
+        """
+        Десериализация данных с проверкой контрольной суммы, если она сохранена.
+
+        :param content: Содержимое файла
+        :return:
+        :raises ValueError: Если содержимое файла повреждено
+        """
+
+        if not content.startswith(self.CHECKSUM_PREFIX):
+            return self.codec.loads(content)
+
+        # контрольная сумма проверяется по сохраненному тексту данных, а не по их повторному кодированию,
+        # поэтому не зависит от кодека, которым данные были записаны
+        checksum_start = len(self.CHECKSUM_PREFIX)
+        checksum_end = checksum_start + hashlib.sha256().digest_size * 2
+        checksum = content[checksum_start:checksum_end]
+        payload_start = checksum_end + len(self.CHECKSUM_SEPARATOR)
+        payload = content[payload_start:-1]
+        if (
+            not content.startswith(self.CHECKSUM_SEPARATOR, checksum_end)
+            or not content.endswith("}")
+            or hashlib.sha256(payload.encode()).hexdigest() != checksum
+        ):
+            raise ValueError("Контрольная сумма не совпадает")
+
+        return self.codec.loads(payload)
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Хранилище данных в памяти процесса с вытеснением давно не использованных данных (LRU).
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Конструктор.
+
+        :param capacity: Максимальное количество хранимых ключей
+        """
+
+        self.capacity = capacity
+        self._entries: OrderedDict[tuple[str, str], CacheEntry] = OrderedDict()
+
+    async def get(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        if (entry := self._entries.get((namespace, key))) is not None:
+            self._entries.move_to_end((namespace, key))
+
+        return entry
+
+    async def put(self, namespace: str, key: str, payload: Any) -> None:
+        self._entries[(namespace, key)] = CacheEntry(payload, time.time())
+        self._entries.move_to_end((namespace, key))
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    async def fetched_at(self, namespace: str, key: str) -> Optional[float]:
+        entry = self._entries.get((namespace, key))
+        return entry.fetched_at if entry else None
+
+    async def touch_many(self, namespace: str, keys: Iterable[str]) -> None:
+        now = time.time()
+        for key in keys:
+            if (entry := self._entries.get((namespace, key))) is not None:
+                self._entries[(namespace, key)] = entry._replace(fetched_at=now)
+
+    async def delete_many(self, namespace: str, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._entries.pop((namespace, key), None)
+
+
+class SqliteBackend(CacheBackend):
+    """
+    Хранилище данных в одной базе данных SQLite.
+    """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            PRIMARY KEY (namespace, key)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS snapshots_fetched_at ON snapshots (namespace, fetched_at)",
+    )
+    # максимальное количество параметров в одном запросе
+    BATCH_SIZE = 500
+
+    def __init__(self, path: Path, codec: Optional[Codec] = None) -> None:
+        """
+        Конструктор.
+
+        :param path: Путь до файла базы данных
+        :param codec: Кодек данных (по умолчанию – модуль ``json`` стандартной библиотеки)
+        """
+
+        self.path = path
+        self.codec = codec or JsonCodec()
+        self._connection: Optional[sqlite3.Connection] = None
+        # соединение используется из разных потоков, но не одновременно
+        self._lock = threading.Lock()
+
+    async def get(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        return (await self.get_many(namespace, (key,))).get(key)
+
+    async def get_many(self, namespace: str, keys: Iterable[str]) -> dict[str, CacheEntry]:
+        return await self._run(self._get_many, namespace, list(keys))
+
+    async def put(self, namespace: str, key: str, payload: Any) -> None:
+        await self.put_many(namespace, {key: payload})
+
+    async def put_many(self, namespace: str, items: dict[str, Any]) -> None:
+        if items:
+            # сохранение всех данных одной транзакцией
+            await self._run(
+                self._put_many,
+                namespace,
+                {key: self.codec.dumps(payload) for key, payload in items.items()},
+                time.time(),
+            )
+
+    async def fetched_at(self, namespace: str, key: str) -> Optional[float]:
+        return await self._run(self._fetched_at, namespace, key)
+
+    async def fetched_at_many(self, namespace: str, keys: Iterable[str]) -> dict[str, float]:
+        return await self._run(self._fetched_at_many, namespace, list(keys))
+
+    async def touch_many(self, namespace: str, keys: Iterable[str]) -> None:
+        if keys := list(keys):
+            await self._run(self._touch_many, namespace, keys, time.time())
+
+    async def delete_many(self, namespace: str, keys: Iterable[str]) -> None:
+        if keys := list(keys):
+            await self._run(self._delete_many, namespace, keys)
+
+    async def fresh_keys(self, namespace: str, keys: Iterable[str], ttl: float) -> set[str]:
+        # проверка всех ключей одним запросом
+        return set(keys) & await self._run(self._fresh_keys, namespace, time.time() - ttl)
+
+    async def close(self) -> None:
+        await self._run(self._close)
+
+    async def _run(self, func: Callable[..., ResultT], *args: Any) -> ResultT:
+        """
+        Выполнение операции с базой данных в отдельном потоке, чтобы не блокировать цикл событий.
+
+        :param func: Операция
+        :param args: Аргументы операции
+        :return:
+        """
+
+        def locked() -> ResultT:
+            with self._lock:
+                return func(*args)
+
+        return await asyncio.to_thread(locked)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            # журнал WAL позволяет читать данные во время записи из другого процесса
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                for statement in self.SCHEMA:
+                    connection.execute(statement)
+            self._connection = connection
+
+        return self._connection
+
+    def _get_many(self, namespace: str, keys: list[str]) -> dict[str, CacheEntry]:
+        entries = {}
+        for start in range(0, len(keys), self.BATCH_SIZE):
+            end = start + self.BATCH_SIZE
+            batch = keys[start:end]
+            rows = self._connect().execute(
+                "SELECT key, payload, fetched_at FROM snapshots "
+                f"WHERE namespace = ? AND key IN ({', '.join('?' * len(batch))})",
+                (namespace, *batch),
+            )
+            for key, payload, fetched_at in rows:
+                entries[key] = CacheEntry(self.codec.loads(payload), fetched_at)
+
+        return entries
+
+    def _fetched_at(self, namespace: str, key: str) -> Optional[float]:
+        row = self._connect().execute(
+            "SELECT fetched_at FROM snapshots WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _fetched_at_many(self, namespace: str, keys: list[str]) -> dict[str, float]:
+        result: dict[str, float] = {}
+        for start in range(0, len(keys), self.BATCH_SIZE):
+            end = start + self.BATCH_SIZE
+            batch = keys[start:end]
+            rows = self._connect().execute(
+                "SELECT key, fetched_at FROM snapshots "
+                f"WHERE namespace = ? AND key IN ({', '.join('?' * len(batch))})",
+                (namespace, *batch),
+            )
+            result.update(rows)
+
+        return result
+
+    def _fresh_keys(self, namespace: str, fetched_after: float) -> set[str]:
+        rows = self._connect().execute(
+            "SELECT key FROM snapshots WHERE namespace = ? AND fetched_at > ?",
+            (namespace, fetched_after),
+        )
+        return {key for (key,) in rows}
+
+    def _put_many(self, namespace: str, items: dict[str, str], fetched_at: float) -> None:
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO snapshots (namespace, key, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                ((namespace, key, payload, fetched_at) for key, payload in items.items()),
+            )
+
+    def _touch_many(self, namespace: str, keys: list[str], fetched_at: float) -> None:
+        with self._connect() as connection:
+            connection.executemany(
+                "UPDATE snapshots SET fetched_at = ? WHERE namespace = ? AND key = ?",
+                ((fetched_at, namespace, key) for key in keys),
+            )
+
+    def _delete_many(self, namespace: str, keys: list[str]) -> None:
+        with self._connect() as connection:
+            connection.executemany(
+                "DELETE FROM snapshots WHERE namespace = ? AND key = ?",
+                ((namespace, key) for key in keys),
+            )
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+# созданные хранилища по названию бэкенда и директории для сохранения файлов
+_backends: dict[tuple[str, Path], CacheBackend] = {}
+
+
+def get_cache_backend() -> CacheBackend:
+    """
+    Получение общего для процесса хранилища, выбранного в настройках.
+
+    :return:
+    """
+
+    name, root = settings.CACHE_BACKEND, settings.MEDIA_ABSOLUTE_PATH
+    if (name, root) not in _backends:
+        if name == "files":
+            _backends[(name, root)] = FileSystemBackend(root, checksum=settings.CACHE_CHECKSUM, codec=get_codec())
+        elif name == "memory":
+            _backends[(name, root)] = MemoryBackend(settings.CACHE_MEMORY_CAPACITY)
+        elif name == "sqlite":
+            _backends[(name, root)] = SqliteBackend(
+                root.joinpath(settings.CACHE_SQLITE_FILENAME), codec=get_codec()
+            )
+        else:
+            raise ValueError(f"Неизвестное хранилище кэша: {name}")
+
+    return _backends[(name, root)]
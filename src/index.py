@@ -0,0 +1,204 @@
+"""
+Индексы собранной информации в памяти для быстрого поиска.
+"""
+
+import heapq
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Optional
+
+from collectors.collector import CountryCollector
+from collectors.records import CountryRecord
+
+
+def normalize(value: str) -> str:
+    """
+    Приведение строки к виду для сравнения.
+
+    :param value: Строка
+    :return:
+    """
+
+    return " ".join(value.split()).casefold()
+
+
+class TrigramIndex:
+    """
+    Индекс для нечеткого поиска строк по триграммам.
+
+    Кандидаты предварительно отбираются по количеству общих триграмм с запросом,
+    а точная (и дорогая) оценка схожести выполняется только для короткого списка лучших кандидатов.
+    """
+
+    # минимальная степень схожести строк
+    ratio = 0.67
+    # количество кандидатов, отбираемых для точной оценки схожести
+    shortlist_size = 30
+
+    def __init__(self) -> None:
+        self._terms: list[str] = []
+        self._values: list[int] = []
+        # количество триграмм в каждой строке
+        self._sizes: list[int] = []
+        # триграмма -> идентификаторы строк, в которых она встречается
+        self._postings: defaultdict[str, list[int]] = defaultdict(list)
+
+    def add(self, term: str, value: int) -> None:
+        """
+        Добавление строки в индекс.
+
+        :param term: Строка для поиска
+        :param value: Идентификатор значения, соответствующего строке
+        :return:
+        """
+
+        if not (term := normalize(term)):
+            return
+
+        term_id = len(self._terms)
+        grams = self.trigrams(term)
+        self._terms.append(term)
+        self._values.append(value)
+        self._sizes.append(len(grams))
+        for gram in grams:
+            self._postings[gram].append(term_id)
+
+    def search(self, query: str, limit: int = 5) -> list[tuple[int, float]]:
+        """
+        Поиск значений, строки которых схожи с запросом.
+
+        :param query: Строка для поиска
+        :param limit: Максимальное количество результатов
+        :return: Идентификаторы значений и степень схожести в порядке убывания схожести
+        """
+
+        query = normalize(query)
+        scores: dict[int, float] = {}
+        for word in query.split():
+            grams = self.trigrams(word)
+            common = Counter(
+                term_id for gram in grams for term_id in self._postings.get(gram, ())
+            )
+            # предварительный отбор кандидатов по коэффициенту Дайса для триграмм
+            shortlist = heapq.nlargest(
+                self.shortlist_size,
+                common,
+                key=lambda term_id: 2 * common[term_id] / (len(grams) + self._sizes[term_id]),
+            )
+            for term_id in shortlist:
+                term = self._terms[term_id]
+                score = 1.0 if query in term else SequenceMatcher(None, word, term).ratio()
+                value = self._values[term_id]
+                if score > self.ratio and score > scores.get(value, 0):
+                    scores[value] = score
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    @staticmethod
+    def trigrams(term: str) -> set[str]:
+        """
+        Получение триграмм строки (с учетом начала и конца строки).
+
+        :param term: Строка
+        :return:
+        """
+
+        padded = f"  {term} "
+        return {"".join(chars) for chars in zip(padded, padded[1:], padded[2:])}
+
+
+class CountryIndex:
+    """
+    Индекс данных о странах в памяти.
+
+    Данные загружаются из кэша один раз и перечитываются только при их обновлении,
+    поиск по точному совпадению выполняется по хэш-таблицам без обращения к диску.
+    Страны хранятся в виде моделей для чтения (см. :mod:`collectors.records`).
+    """
+
+    def __init__(self) -> None:
+        # время получения загруженных данных
+        self._fetched_at: Optional[float] = None
+        self.countries: list[CountryRecord] = []
+        self._by_code: dict[str, CountryRecord] = {}
+        self._by_name: dict[str, CountryRecord] = {}
+        self._by_capital: dict[str, CountryRecord] = {}
+        self._by_spelling: dict[str, CountryRecord] = {}
+        self._trigrams = TrigramIndex()
+
+    async def refresh(self) -> None:
+        """
+        Загрузка данных, если файл изменился с момента предыдущей загрузки.
+
+        :return:
+        """
+
+        fetched_at = await CountryCollector.get_backend().fetched_at(
+            CountryCollector.namespace, CountryCollector.cache_key
+        )
+        if fetched_at is not None and fetched_at == self._fetched_at:
+            return
+
+        countries = (await CountryCollector.read_records() or []) if fetched_at is not None else []
+        self._build(countries)
+        self._fetched_at = fetched_at
+
+    async def get(self, search: str) -> Optional[CountryRecord]:
+        """
+        Поиск страны по точному совпадению кода, названия, столицы или варианта написания.
+
+        :param search: Строка для поиска
+        :return:
+        """
+
+        await self.refresh()
+        key = normalize(search)
+        for mapping in (self._by_code, self._by_name, self._by_capital, self._by_spelling):
+            if country := mapping.get(key):
+                return country
+
+        return None
+
+    async def search(self, search: str, limit: int = 5) -> list[tuple[CountryRecord, float]]:
+        """
+        Нечеткий поиск стран по столице, названию и вариантам написания.
+
+        :param search: Строка для поиска
+        :param limit: Максимальное количество результатов
+        :return: Страны и степень схожести в порядке убывания схожести
+        """
+
+        await self.refresh()
+
+        return [
+            (self.countries[position], score)
+            for position, score in self._trigrams.search(search, limit)
+        ]
+
+    def _build(self, countries: list[CountryRecord]) -> None:
+        """
+        Построение хэш-таблиц для поиска.
+
+        :param countries: Данные о странах
+        :return:
+        """
+
+        self.countries = countries
+        self._by_code = {}
+        self._by_name = {}
+        self._by_capital = {}
+        self._by_spelling = {}
+        self._trigrams = TrigramIndex()
+        for position, country in enumerate(countries):
+            self._by_code.setdefault(normalize(country.alpha2code), country)
+            self._by_name.setdefault(normalize(country.name), country)
+            self._by_capital.setdefault(normalize(country.capital), country)
+            self._trigrams.add(country.capital, position)
+            self._trigrams.add(country.name, position)
+            for spelling in country.alt_spellings:
+                self._by_spelling.setdefault(normalize(spelling), country)
+                self._trigrams.add(spelling, position)
+
+
+# общий индекс для всех читателей в процессе
+country_index = CountryIndex()
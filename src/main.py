@@ -2,10 +2,19 @@
 Запуск приложения.
 """
 
+from typing import Optional
+
 import asyncclick as click
 
+from clients.service import ServiceClient
+from clients.session import session_manager
+from collectors.models import LocationInfoDTO
+from collectors.refresh import refresh_queue
 from reader import Reader
 from renderer import Renderer
+from settings import get_settings
+
+settings = get_settings()
 
 
 @click.command()
@@ -17,14 +26,43 @@ from renderer import Renderer
     help="Страна и/или город",
     prompt="Страна и/или город",
 )
-async def process_input(location: str) -> None:
+@click.option(
+    "--remote",
+    "-r",
+    "remote",
+    is_flag=True,
+    default=False,
+    help="Выполнить поиск через запущенный сервис (server.py)",
+)
+async def process_input(location: str, remote: bool) -> None:
     """
     Поиск и вывод информации о стране, погоде и курсах валют.
 
     :param str location: Страна и/или город
+    :param bool remote: Выполнить поиск через запущенный сервис
+    """
+
+    try:
+        if remote:
+            result = await ServiceClient().find(location)
+            location_info = LocationInfoDTO.parse_obj(result) if result else None
+        else:
+            location_info = await Reader().find(location)
+
+        await show_location_info(location_info)
+    finally:
+        # ожидание фоновой актуализации устаревших данных
+        await refresh_queue.drain(settings.REFRESH_TIMEOUT)
+        await session_manager.close()
+
+
+async def show_location_info(location_info: Optional[LocationInfoDTO]) -> None:
+    """
+    Вывод информации о стране в виде таблиц.
+
+    :param location_info: Данные о стране
     """
 
-    location_info = await Reader().find(location)
     if location_info:
         rend = Renderer(location_info)
         main_info = await rend.render()
@@ -32,6 +70,11 @@ async def process_input(location: str) -> None:
 
         click.secho("\nВывод информации в стране:", fg="magenta")
         click.secho(main_info, fg="green")
+        if location_info.degraded:
+            click.secho(
+                f"Часть данных недоступна: {', '.join(location_info.degraded)}",
+                fg="yellow",
+            )
         if news is not None:
             click.secho("\nПоследние три новости в стране:", fg="magenta")
             click.secho(news, fg="blue")
@@ -2,25 +2,24 @@
 Поиск собранной информации в файлах на диске.
 """
 
-from difflib import SequenceMatcher
-from typing import Optional
+import asyncio
+import logging
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Iterable, Optional
 
-from clients.city import CityClient
 from collectors.collector import (
-    CountryCollector,
+    CityCollector,
     CurrencyRatesCollector,
     NewsCollector,
     WeatherCollector,
 )
-from collectors.models import (
-    CityInfoDTO,
-    CountryDTO,
-    CurrencyInfoDTO,
-    LocationDTO,
-    LocationInfoDTO,
-    NewsDTO,
-    WeatherInfoDTO,
-)
+from collectors.models import CityInfoDTO, LocationInfoDTO, NewsDTO, WeatherInfoDTO
+from collectors.records import AnyLocation, CountryRecord
+from index import CountryIndex, country_index
+from settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 class Reader:
@@ -28,6 +27,15 @@ class Reader:
     Чтение сохраненных данных.
     """
 
+    def __init__(self, index: Optional[CountryIndex] = None) -> None:
+        """
+        Конструктор.
+
+        :param index: Индекс данных о странах (по умолчанию – общий для процесса)
+        """
+
+        self.index = index or country_index
+
     async def find(self, location: str) -> Optional[LocationInfoDTO]:
         """
         Поиск данных о стране по строке.
@@ -38,26 +46,175 @@ class Reader:
 
         country = await self.find_country(location)
         if country:
-            weather = await self.get_weather(
-                LocationDTO(capital=country.capital, alpha2code=country.alpha2code)
-            )
-            currency_rates = await self.get_currency_rates(country.currencies)
-            capital = await self.get_city_info(country.capital)
-            country_name = await self._get_country_name(
-                country.name, country.alpha2code
-            )
-            news = await self.get_news_from_country(country_name)
-
-            return LocationInfoDTO(
-                location=country,
-                weather=weather,
-                currency_rates=currency_rates,
-                capital=capital,
-                news=news,
-            )
+            return await self.get_location_info(country)
 
         return None
 
+    async def find_many(
+        self, locations: Iterable[str] | AsyncIterable[str]
+    ) -> AsyncIterator[tuple[str, Optional[LocationInfoDTO] | Exception]]:
+        """
+        Поиск данных о странах для нескольких строк.
+
+        Данные для разных стран читаются конкурентно, а для повторяющихся стран – только один раз.
+        Строки читаются по мере выдачи результатов с опережением не более чем на ``READER_LOOKAHEAD`` строк,
+        результаты возвращаются в порядке следования строк.
+        Ошибка при получении данных о стране возвращается вместо результата для каждой строки с этой страной
+        и не прерывает обработку остальных строк.
+
+        :param locations: Строки для поиска
+        :return: Пары из строки для поиска и найденных данных (или ошибки их получения)
+        """
+
+        # строки, результаты для которых еще не выданы, и коды найденных для них стран
+        pending: deque[tuple[str, Optional[str]]] = deque()
+        # задачи получения данных по кодам стран
+        tasks: dict[str, asyncio.Task] = {}
+        lookahead = max(settings.READER_LOOKAHEAD, 1)
+        try:
+            async for location in self._iterate(locations):
+                country = await self.find_country(location)
+                if country and country.alpha2code not in tasks:
+                    tasks[country.alpha2code] = asyncio.create_task(
+                        self.get_location_info(country)
+                    )
+                pending.append((location, country.alpha2code if country else None))
+                if len(pending) >= lookahead:
+                    location, alpha2code = pending.popleft()
+                    yield location, await self._get_result(
+                        location, tasks[alpha2code] if alpha2code else None
+                    )
+
+            while pending:
+                location, alpha2code = pending.popleft()
+                yield location, await self._get_result(
+                    location, tasks[alpha2code] if alpha2code else None
+                )
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    @staticmethod
+    async def _iterate(locations: Iterable[str] | AsyncIterable[str]) -> AsyncIterator[str]:
+        """
+        Перебор строк для поиска из обычного или асинхронного источника.
+
+        :param locations: Строки для поиска
+        :return:
+        """
+
+        if isinstance(locations, AsyncIterable):
+            async for location in locations:
+                yield location
+        else:
+            for location in locations:
+                yield location
+
+    @staticmethod
+    async def _get_result(
+        location: str, task: Optional[asyncio.Task]
+    ) -> Optional[LocationInfoDTO] | Exception:
+        """
+        Ожидание данных о стране для строки поиска.
+
+        :param location: Строка для поиска
+        :param task: Задача получения данных о стране (отсутствует, если страна не найдена)
+        :return: Найденные данные или ошибка их получения
+        """
+
+        if task is None:
+            return None
+        try:
+            return await task
+        except Exception as exception:
+            logger.exception("Ошибка при поиске данных: %s", location)
+            return exception
+
+    async def get_location_info(self, country: CountryRecord) -> LocationInfoDTO:
+        """
+        Получение данных о стране, погоде, курсах валют, столице и новостях.
+
+        Данные читаются в виде моделей для чтения (см. :mod:`collectors.records`)
+        и преобразуются в модели pydantic при чтении каждой части: некорректные данные
+        одной части не мешают получить остальные.
+
+        :param country: Данные о стране
+        :return:
+        """
+
+        country_name = NewsCollector.get_key(country.name, country.alpha2code)
+        # части данных не зависят друг от друга и читаются одновременно
+        parts: dict[str, Awaitable[Any]] = {
+            "weather": self.get_weather(country.location),
+            "currency_rates": self.get_currency_rates(country.currencies),
+            "capital": self.get_city_info(country.location),
+            "news": self.get_news_from_country(country_name),
+        }
+        results = dict(
+            zip(
+                parts,
+                await asyncio.gather(
+                    *(self._read_part(name, part) for name, part in parts.items())
+                ),
+            )
+        )
+        degraded = [name for name, (_, received) in results.items() if not received]
+        ages = await self._get_ages(country, country_name)
+
+        return LocationInfoDTO(
+            location=country.to_dto(),
+            weather=results["weather"][0],
+            currency_rates=results["currency_rates"][0] or {},
+            capital=results["capital"][0],
+            news=results["news"][0],
+            degraded=degraded,
+            ages=ages,
+        )
+
+    @staticmethod
+    async def _get_ages(country: CountryRecord, country_name: str) -> dict[str, float]:
+        """
+        Получение возраста сохраненных частей данных о стране.
+
+        :param country: Данные о стране
+        :param country_name: Ключ новостей о стране (см. :meth:`NewsCollector.get_key`)
+        :return: Возраст частей данных (в секундах) по их названиям
+        """
+
+        location_key = await WeatherCollector.get_key(country.location)
+        parts = {
+            "weather": WeatherCollector.get_entry_age(location_key),
+            "currency_rates": CurrencyRatesCollector.get_entry_age(),
+            "capital": CityCollector.get_entry_age(location_key),
+            "news": NewsCollector.get_entry_age(country_name),
+        }
+        ages = await asyncio.gather(*parts.values(), return_exceptions=True)
+
+        return {
+            name: age
+            for name, age in zip(parts, ages)
+            if isinstance(age, float)
+        }
+
+    @staticmethod
+    async def _read_part(name: str, part: Awaitable[Any]) -> tuple[Any, bool]:
+        """
+        Чтение части данных о стране с ограничением времени ожидания.
+
+        :param name: Название части данных
+        :param part: Чтение части данных
+        :return: Прочитанные данные и признак их успешного получения
+        """
+
+        try:
+            return await asyncio.wait_for(part, timeout=settings.READER_PART_TIMEOUT), True
+        except asyncio.TimeoutError:
+            logger.warning("Превышено время ожидания данных: %s", name)
+        except Exception:
+            logger.exception("Ошибка при чтении данных: %s", name)
+
+        return None, False
+
     @staticmethod
     async def get_news_from_country(country_name: str) -> list[NewsDTO] | None:
         """
@@ -69,25 +226,25 @@ class Reader:
         return await NewsCollector.read(country_name)
 
     @staticmethod
-    async def get_currency_rates(currencies: set[CurrencyInfoDTO]) -> dict[str, float]:
+    async def get_currency_rates(currencies: Iterable[str]) -> dict[str, float]:
         """
         Чтение и формирование информации о курсах валют.
 
-        :param currencies: Множество с данными о курсах валют
+        :param currencies: Коды валют
         :return:
         """
 
         currency_rates = await CurrencyRatesCollector.read()
         result = {}
-        for currency in currencies:
+        for code in currencies:
             if currency_rates:
-                if isinstance(rate := currency_rates.rates.get(currency.code), float):
-                    result[currency.code] = 1 / rate
+                if isinstance(rate := currency_rates.rates.get(code), float):
+                    result[code] = 1 / rate
 
         return result
 
     @staticmethod
-    async def get_weather(location: LocationDTO) -> Optional[WeatherInfoDTO]:
+    async def get_weather(location: AnyLocation) -> Optional[WeatherInfoDTO]:
         """
         Получение данных о погоде.
 
@@ -97,69 +254,29 @@ class Reader:
         return await WeatherCollector.read(location=location)
 
     @staticmethod
-    async def get_city_info(city_name: str) -> Optional[CityInfoDTO]:
+    async def get_city_info(location: AnyLocation) -> Optional[CityInfoDTO]:
         """
-        Получение данных о городе.
+        Получение данных о столице.
 
-        :param city_name: Название города
+        :param location: Объект локации для получения данных
         :return:
         """
 
-        city_info = await CityClient().get_city_info(city_name)
-        return CityInfoDTO(**city_info) if city_info else None
+        return await CityCollector.read(location=location)
 
-    async def find_country(self, search: str) -> Optional[CountryDTO]:
+    async def find_country(self, search: str) -> Optional[CountryRecord]:
         """
         Поиск страны.
 
         :param search: Строка для поиска
         :return:
         """
-        if countries := await CountryCollector.read():
-            for country in countries:
-                if await self._match(search, country):
-                    return country
+        # поиск по точному совпадению
+        if country := await self.index.get(search):
+            return country
 
-        return None
-
-    @staticmethod
-    async def _match(search: str, country: CountryDTO) -> bool:
-        """
-        Получение факта сходства между переданными строками для поиска страны.
-
-        :param search: Строка для сравнения
-        :param CountryDTO country: Данные о стране
-        :return:
-        """
+        # нечеткий поиск (лучшее совпадение)
+        if matches := await self.index.search(search, limit=1):
+            return matches[0][0]
 
-        words = search.split()
-        # степень схожести сравниваемого текста
-        ratio = 0.67
-        for word in words:
-            if any(
-                [
-                    search.lower() in country.capital.lower()
-                    or SequenceMatcher(None, word, country.capital).ratio() > ratio,
-                    *[
-                        search.lower() in spelling.lower()
-                        or SequenceMatcher(None, word, spelling).ratio() > ratio
-                        for spelling in country.alt_spellings
-                    ],
-                ]
-            ):
-                return True
-
-        return False
-
-    @staticmethod
-    async def _get_country_name(country_name: str, short_country_name: str) -> str:
-        """
-        Получение названия страны в следующем формате:
-        "<название страны>_<название страны в формате alpha2code>.
-
-        :param country_name: Название страны
-        :param short_country_name: Короткое название страны в формате alpha2code
-        :return:
-        """
-
-        return f"{country_name.replace(' ', '_')}_{short_country_name}".lower()
+        return None
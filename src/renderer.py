@@ -12,6 +12,9 @@ from prettytable import ALL, PrettyTable
 
 from collectors.models import LocationInfoDTO
 
+# значение для отсутствующих данных
+NO_DATA = "нет данных"
+
 
 class Renderer:
     """
@@ -100,6 +103,9 @@ class Renderer:
 
         :return:
         """
+        if self.location_info.capital is None:
+            return NO_DATA
+
         return f"широта: {self.location_info.capital.latitude}, долгота: {self.location_info.capital.longitude}"
 
     async def _get_city_time_by_timezone(self) -> str:
@@ -109,10 +115,45 @@ class Renderer:
         :return:
         """
 
+        if self.location_info.weather is None:
+            return NO_DATA
+
         timezone = self.location_info.weather.timezone  # в секундах
 
         return f"{time.ctime(time.time() + (timezone - 10800))} (UTC+{timezone / 3600})"
 
+    async def _format_weather(self) -> str:
+        """
+        Форматирование информации о погоде.
+
+        :return:
+        """
+
+        if self.location_info.weather is None:
+            return NO_DATA
+
+        return (
+            f"температура: {self.location_info.weather.temp} °C, "
+            f"описание: {self.location_info.weather.description}, "
+            f"видимость (м): {self.location_info.weather.visibility}, "
+            f"скорость ветра (м/с): {self.location_info.weather.wind_speed}."
+        )
+
+    async def _format_ages(self) -> str:
+        """
+        Форматирование информации о возрасте данных.
+
+        :return:
+        """
+
+        if not self.location_info.ages:
+            return NO_DATA
+
+        return ", ".join(
+            f"{name}: {int(age // 60)} мин."
+            for name, age in self.location_info.ages.items()
+        )
+
     async def _get_formatted_info(self) -> dict[str, Any]:
         """Получение форматированного вывода с информацией о стране."""
         return {
@@ -122,13 +163,9 @@ class Renderer:
             "Языки": (await self._format_languages()),
             "Население страны": f"{await self._format_population()} чел.",
             "Курсы валют": (await self._format_currency_rates()),
-            "Информация о погоде": (
-                f"температура: {self.location_info.weather.temp} °C, "
-                f"описание: {self.location_info.weather.description}, "
-                f"видимость (м): {self.location_info.weather.visibility}, "
-                f"скорость ветра (м/с): {self.location_info.weather.wind_speed}."
-            ),
+            "Информация о погоде": (await self._format_weather()),
             "Площадь страны": f"{self.location_info.location.area} кв. м.",
             "Координаты столицы": (await self._get_city_coordinates()),
             "Текущее время в столице": (await self._get_city_time_by_timezone()),
+            "Возраст данных": (await self._format_ages()),
         }
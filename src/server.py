@@ -0,0 +1,82 @@
+"""
+Сервис поиска информации о странах (HTTP API).
+
+Процесс сервиса работает постоянно, поэтому загруженные данные (индекс стран) и HTTP-соединения
+переиспользуются между запросами, а запросы обрабатываются конкурентно.
+"""
+
+import logging
+
+from aiohttp import web
+
+from clients.session import session_manager
+from collectors.models import model_encoder
+from collectors.refresh import refresh_queue
+from reader import Reader
+from settings import get_settings
+
+settings = get_settings()
+
+
+async def find(request: web.Request) -> web.Response:
+    """
+    Поиск информации о стране.
+
+    .. code-block::
+
+        GET /find?location=Tallinn
+
+    :param request: HTTP-запрос
+    :return: Данные о стране (:class:`collectors.models.LocationInfoDTO`) в формате JSON
+    """
+
+    location = request.query.get("location", "").strip()
+    if not location:
+        return web.json_response(
+            {"error": "Не указан параметр location."}, status=web.HTTPBadRequest.status_code
+        )
+
+    reader: Reader = request.app["reader"]
+    location_info = await reader.find(location)
+    if location_info is None:
+        return web.json_response(
+            {"error": "Информация отсутствует."}, status=web.HTTPNotFound.status_code
+        )
+
+    return web.json_response(
+        text=location_info.json(models_as_dict=False, encoder=model_encoder)
+    )
+
+
+async def on_cleanup(app: web.Application) -> None:
+    """
+    Освобождение ресурсов при остановке сервиса.
+
+    :param app: Приложение
+    :return:
+    """
+
+    # pylint: disable=unused-argument
+    await refresh_queue.drain(settings.REFRESH_TIMEOUT)
+    await session_manager.close()
+
+
+def create_app() -> web.Application:
+    """
+    Создание приложения сервиса.
+
+    :return:
+    """
+
+    app = web.Application()
+    # общий читатель данных с загруженным индексом стран
+    app["reader"] = Reader()
+    app.router.add_get("/find", find)
+    app.on_cleanup.append(on_cleanup)
+
+    return app
+
+
+if __name__ == "__main__":
+    logging.info("Запуск сервиса поиска ...")
+    web.run_app(create_app(), host=settings.SERVICE_HOST, port=settings.SERVICE_PORT)
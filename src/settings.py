@@ -31,6 +31,23 @@ class Settings(BaseSettings):
     API_KEY_OPENWEATHER: str
     API_KEY_NEWS: str
 
+    # региональные объединения, данные о странах которых собираются (запрашиваются одновременно)
+    COUNTRY_BLOCS: list[str] = [
+        "eu",
+        "efta",
+        "caricom",
+        "pa",
+        "au",
+        "usan",
+        "eeu",
+        "al",
+        "asean",
+        "cais",
+        "cefta",
+        "nafta",
+        "saarc",
+    ]
+
     # время актуальности данных о странах (в секундах), по умолчанию – один год
     CACHE_TTL_COUNTRY: int = int("31_536_000")
     # время актуальности данных о курсах валют (в секундах), по умолчанию – сутки
@@ -39,6 +56,128 @@ class Settings(BaseSettings):
     CACHE_TTL_WEATHER: int = int("10_700")
     # время актуаьности новостей о странах (в секундах), по умолчанию - 1 час
     CACHE_TTL_NEWS: int = 3600
+    # время актуальности данных о столицах (в секундах), по умолчанию – 30 дней
+    CACHE_TTL_CITY: int = int("2_592_000")
+
+    # предельный возраст данных (в секундах), до которого устаревшие данные выдаются пользователю,
+    # пока они актуализируются в фоне (stale-while-revalidate); более старые данные не выдаются
+    # для данных о странах, по умолчанию – два года
+    CACHE_MAX_STALE_COUNTRY: int = int("63_072_000")
+    # для данных о курсах валют, по умолчанию – семь дней
+    CACHE_MAX_STALE_CURRENCY_RATES: int = int("604_800")
+    # для данных о погоде, по умолчанию – сутки
+    CACHE_MAX_STALE_WEATHER: int = int("86_400")
+    # для новостей о странах, по умолчанию – сутки
+    CACHE_MAX_STALE_NEWS: int = int("86_400")
+    # для данных о столицах, по умолчанию – один год
+    CACHE_MAX_STALE_CITY: int = int("31_536_000")
+    # актуализация устаревших данных в фоне при их чтении
+    CACHE_BACKGROUND_REFRESH: bool = True
+    # максимальная доля, на которую сокращается время актуальности данных для ключа (от 0 до 1),
+    # чтобы данные, собранные одновременно, устаревали в разное время
+    CACHE_TTL_JITTER: float = 0.1
+    # максимальное количество ключей одного сборщика, актуализируемых за один запуск (0 – без ограничения)
+    CACHE_REFRESH_SLICE: int = 0
+    # время до повторного получения данных для ключа после неудачной попытки (в секундах),
+    # удваивается после каждой следующей неудачи, но не превышает времени актуальности данных
+    CACHE_FAILURE_BACKOFF: int = 300
+    # время ожидания фоновой актуализации данных перед завершением работы (в секундах)
+    REFRESH_TIMEOUT: float = 30.0
+    # условные запросы к сервисам (If-None-Match / If-Modified-Since) по сохраненным валидаторам ответов,
+    # время актуальности данных продлевается до разрешенного сервисом (Cache-Control: max-age)
+    CACHE_CONDITIONAL_REQUESTS: bool = True
+
+    # максимальное количество одновременных запросов данных о погоде
+    WEATHER_MAX_CONCURRENCY: int = 10
+    # время ожидания данных о погоде для одной локации (в секундах) без ожидания в очереди ограничителя частоты
+    # запросов, должно быть не меньше HTTP_TIMEOUT * (HTTP_RETRIES + 1) + HTTP_BACKOFF_MAX * HTTP_RETRIES
+    WEATHER_TIMEOUT: float = 60.0
+
+    # максимальное количество одновременных запросов данных о столицах
+    CITY_MAX_CONCURRENCY: int = 5
+    # время ожидания данных о столице для одной локации (в секундах), см. WEATHER_TIMEOUT
+    CITY_TIMEOUT: float = 60.0
+
+    # максимальное количество одновременных запросов новостей
+    NEWS_MAX_CONCURRENCY: int = 5
+    # время ожидания новостей для одной страны (в секундах), см. WEATHER_TIMEOUT
+    NEWS_TIMEOUT: float = 60.0
+
+    # хранилище кэша собранных данных:
+    # files – отдельный JSON-файл для каждого ключа, memory – LRU-кэш в памяти процесса,
+    # sqlite – одна база данных SQLite
+    CACHE_BACKEND: str = "files"
+    # название файла базы данных SQLite (в директории для сохранения файлов)
+    CACHE_SQLITE_FILENAME: str = "snapshots.sqlite3"
+    # максимальное количество ключей в кэше в памяти процесса
+    CACHE_MEMORY_CAPACITY: int = 1024
+    # сохранение файлов с данными вместе с контрольной суммой (проверяется при чтении)
+    CACHE_CHECKSUM: bool = False
+    # кодек для сериализации данных в JSON: json – стандартная библиотека, orjson – библиотека orjson,
+    # auto – orjson, если она установлена, иначе стандартная библиотека
+    CACHE_CODEC: str = "auto"
+    # сохранение снимка проверенных данных о странах для быстрого чтения (строится заново при изменении данных)
+    CACHE_SNAPSHOT: bool = True
+    # название директории для снимков данных (в директории для сохранения файлов)
+    SNAPSHOT_DIR: str = "snapshots"
+
+    # директория для файлов межпроцессных блокировок (в директории для сохранения файлов)
+    LOCK_DIR: str = "locks"
+    # поведение при получении данных для ключа другим процессом:
+    # wait – ожидание завершения и повторная проверка актуальности, skip – пропуск ключа
+    LOCK_KEY_MODE: str = "wait"
+    # время ожидания блокировки ключа (в секундах), ограничено также временем ожидания данных для ключа
+    LOCK_TIMEOUT: float = 30.0
+
+    # минимальное и максимальное время ожидания планировщика между запусками сбора данных (в секундах)
+    SCHEDULER_MIN_INTERVAL: float = 5.0
+    SCHEDULER_MAX_INTERVAL: float = 600.0
+    # время ожидания завершения текущего запуска сбора данных при остановке планировщика (в секундах)
+    SCHEDULER_STOP_TIMEOUT: float = 5.0
+
+    # общее максимальное количество HTTP-соединений
+    HTTP_LIMIT: int = 100
+    # максимальное количество HTTP-соединений с одним хостом
+    HTTP_LIMIT_PER_HOST: int = 10
+    # время удержания неиспользуемого соединения открытым (в секундах)
+    HTTP_KEEPALIVE_TIMEOUT: float = 30.0
+    # время кэширования результатов DNS-запросов (в секундах)
+    HTTP_DNS_CACHE_TTL: int = 300
+    # время ожидания ответа на один HTTP-запрос (в секундах)
+    HTTP_TIMEOUT: float = 5.0
+    # максимальное количество повторных попыток запроса при временной ошибке (429, 5xx, ошибка соединения)
+    HTTP_RETRIES: int = 2
+    # базовое и максимальное время ожидания перед повторной попыткой (в секундах),
+    # ожидание растет экспоненциально со случайным разбросом, но не меньше значения заголовка Retry-After
+    HTTP_BACKOFF_BASE: float = 0.5
+    HTTP_BACKOFF_MAX: float = 5.0
+    # объединение одинаковых одновременных запросов к сервисам в один запрос
+    HTTP_SINGLE_FLIGHT: bool = True
+
+    # максимальная частота запросов к провайдерам данных (запросов в секунду, 0 – без ограничения)
+    RATE_LIMIT_APILAYER: float = 5.0
+    RATE_LIMIT_OPENWEATHER: float = 1.0
+    RATE_LIMIT_NEWSAPI: float = 1.0
+    # максимальное количество запросов к провайдеру, выполняемых без ожидания
+    RATE_LIMIT_BURST: int = 5
+
+    # количество ошибок сервиса подряд, после которого запросы к нему отключаются (0 – не отключаются)
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    # время, на которое отключаются запросы к сервису (в секундах)
+    CIRCUIT_RESET_TIMEOUT: float = 60.0
+    # максимальное количество одновременных пробных запросов после отключения
+    CIRCUIT_HALF_OPEN_REQUESTS: int = 1
+
+    # время ожидания чтения одной части данных о стране (погода, курсы валют, столица, новости) (в секундах)
+    READER_PART_TIMEOUT: float = 3.0
+    # количество строк пакетного поиска, читаемых с опережением выдачи результатов
+    READER_LOOKAHEAD: int = 100
+
+    # адрес и порт, на которых запускается сервис поиска
+    SERVICE_HOST: str = "127.0.0.1"
+    SERVICE_PORT: int = 8080
+    # адрес сервиса поиска для консольного клиента
+    SERVICE_URL: str = "http://127.0.0.1:8080"
 
 
 def get_settings(**kwargs: Any) -> Settings:
@@ -0,0 +1,131 @@
+"""
+Тестирование выключателя запросов к внешним сервисам.
+"""
+import time
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from clients import base as base_module, breaker as breaker_module, policy as policy_module
+from clients.breaker import CircuitBreaker, CircuitState, get_circuit_stats
+from clients.session import SessionManager
+from clients.weather import WeatherClient
+from collectors.collector import Collectors, WeatherCollector
+from collectors.models import CollectSummaryDTO, LocationDTO
+from collectors.scheduler import Scheduler
+
+
+class TestCircuitBreaker:
+    """
+    Тестирование состояний выключателя.
+    """
+
+    def test_open_after_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+        assert breaker.acquire() is False
+        breaker.record(False)
+        breaker.record(True)
+        breaker.record(False)
+        assert breaker.state is CircuitState.CLOSED
+
+        breaker.record(False)
+
+        stats = breaker.stats()
+        assert stats.state is CircuitState.OPEN
+        assert stats.consecutive_failures == 2
+        assert stats.retry_at == pytest.approx(time.time() + 60, abs=1)
+        assert breaker.acquire() is None
+        assert breaker.stats().short_circuited == 1
+
+    def test_half_open(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record(False)
+
+        # после истечения времени отключения разрешается один пробный запрос
+        assert breaker.state is CircuitState.HALF_OPEN
+        assert breaker.acquire() is True
+        assert breaker.acquire() is None
+        # отмененный пробный запрос не меняет состояние
+        breaker.record(None, probe=True)
+        assert breaker.acquire() is True
+
+        breaker.record(True, probe=True)
+
+        assert breaker.state is CircuitState.CLOSED
+        assert breaker.acquire() is False
+
+    def test_failed_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker._state = CircuitState.HALF_OPEN
+
+        breaker.record(False, probe=True)
+
+        assert breaker.state is CircuitState.OPEN
+
+    def test_disabled(self):
+        breaker = CircuitBreaker(failure_threshold=0, reset_timeout=60)
+
+        for _ in range(10):
+            breaker.record(False)
+
+        assert breaker.state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+class TestClientCircuitBreaker:
+    """
+    Тестирование отключения запросов клиента к неработающему сервису.
+    """
+
+    @pytest.fixture
+    async def client(self, mocker):
+        mocker.patch.object(base_module.settings, "HTTP_RETRIES", 0)
+        mocker.patch.object(breaker_module.settings, "CIRCUIT_FAILURE_THRESHOLD", 2)
+        mocker.patch.object(breaker_module, "_circuit_breakers", {})
+        mocker.patch.object(policy_module.settings, "RATE_LIMIT_OPENWEATHER", 0)
+        mocker.patch.object(policy_module, "_rate_limiters", {})
+        requests = []
+
+        async def weather(request: web.Request) -> web.Response:
+            requests.append(request)
+            return web.Response(status=503)
+
+        app = web.Application()
+        app.router.add_get("/weather", weather)
+        server = TestServer(app)
+        await server.start_server()
+        manager = SessionManager()
+        mocker.patch.object(WeatherClient, "BASE_URL", str(server.make_url("/weather")))
+        self.requests = requests
+        yield WeatherClient(session_manager=manager)
+        await manager.close()
+        await server.close()
+
+    async def test_short_circuit(self, client: WeatherClient):
+        for _ in range(5):
+            assert await client.get_weather("Tallinn,EE") is None
+
+        assert len(self.requests) == 2
+        stats = get_circuit_stats()[client.BASE_URL]
+        assert stats.state is CircuitState.OPEN
+        assert stats.short_circuited == 3
+
+    async def test_collector_defers(self, client: WeatherClient, media_path: Path):
+        client.get_circuit_breaker()._state = CircuitState.OPEN
+        client.get_circuit_breaker()._opened_at = time.monotonic()
+        collector = WeatherCollector()
+        locations = frozenset({LocationDTO(capital="Tallinn", alpha2code="EE")})
+
+        assert collector.get_unavailable_until() == pytest.approx(time.time() + 60, abs=1)
+        assert await collector.collect(locations) == CollectSummaryDTO(deferred=1)
+        assert not self.requests
+
+    async def test_scheduler_waits_for_provider(self, mocker, client: WeatherClient, country_file: Path):
+        client.get_circuit_breaker()._state = CircuitState.OPEN
+        client.get_circuit_breaker()._opened_at = time.monotonic()
+        mocker.patch.object(Collectors, "collectors", (WeatherCollector,))
+
+        assert await Scheduler().get_next_run_at() == pytest.approx(time.time() + 60, abs=1)
@@ -0,0 +1,127 @@
+"""
+Тестирование условных запросов клиентов.
+"""
+import os
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from clients.base import conditional_request
+from clients.session import SessionManager
+from clients.weather import WeatherClient
+from collectors.collector import WeatherCollector
+from collectors.models import CollectSummaryDTO, LocationDTO
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+
+@pytest.mark.asyncio
+class TestConditionalRequest:
+    """
+    Тестирование условных запросов к сервису с валидаторами ответов.
+    """
+
+    @pytest.fixture
+    async def server(self):
+        requests = []
+
+        async def weather(request: web.Request) -> web.Response:
+            requests.append(request)
+            headers = {"ETag": ETAG, "Last-Modified": LAST_MODIFIED, "Cache-Control": "max-age=60"}
+            if request.headers.get("If-None-Match") == ETAG:
+                return web.Response(status=304, headers=headers)
+            return web.json_response({"main": {"temp": 5.0}}, headers=headers)
+
+        app = web.Application()
+        app["requests"] = requests
+        app.router.add_get("/weather", weather)
+        server = TestServer(app)
+        await server.start_server()
+        yield server
+        await server.close()
+
+    @pytest.fixture
+    async def client(self, mocker, server: TestServer):
+        manager = SessionManager()
+        mocker.patch.object(WeatherClient, "BASE_URL", str(server.make_url("/weather")))
+        mocker.patch("collectors.collector.WeatherClient", lambda: WeatherClient(session_manager=manager))
+        yield WeatherClient(session_manager=manager)
+        await manager.close()
+
+    async def test_validators(self, client: WeatherClient, server: TestServer):
+        with conditional_request() as request:
+            result = await client.get_weather("Tallinn,EE")
+
+        assert result == {"main": {"temp": 5.0}}
+        assert not request.not_modified
+        assert request.response_validators == {"etag": ETAG, "last_modified": LAST_MODIFIED, "max_age": 60}
+
+        with conditional_request(request.response_validators) as request:
+            result = await client.get_weather("Tallinn,EE")
+
+        assert result is None
+        assert request.not_modified
+        assert server.app["requests"][-1].headers["If-Modified-Since"] == LAST_MODIFIED
+
+    async def test_not_conditional(self, client: WeatherClient, server: TestServer):
+        assert await client.get_weather("Tallinn,EE") == {"main": {"temp": 5.0}}
+        assert "If-None-Match" not in server.app["requests"][-1].headers
+
+    async def test_collect_not_modified(self, mocker, client: WeatherClient, media_path: Path):
+        collector = WeatherCollector()
+        locations = frozenset({LocationDTO(capital="Tallinn", alpha2code="EE")})
+        file_path = media_path.joinpath("weather", "tallinn_ee.json")
+
+        assert await collector.collect(locations) == CollectSummaryDTO(succeeded=1)
+        assert media_path.joinpath("validators", "weather", "tallinn_ee.json").is_file()
+        # ответ разрешено кэшировать дольше времени актуальности из настроек
+        mocker.patch("collectors.collector.settings.CACHE_TTL_WEATHER", 0)
+        assert await collector.collect(locations) == CollectSummaryDTO(skipped=1)
+
+        # данные устарели, но у сервиса не изменились: файл не перезаписывается
+        os.utime(file_path, (0, 0))
+        content = file_path.read_text()
+        mocker.patch("collectors.base.BaseCollector.stale_keys", return_value={"tallinn_ee"})
+
+        assert await collector.collect(locations) == CollectSummaryDTO(not_modified=1)
+        assert file_path.read_text() == content
+        assert file_path.stat().st_mtime > 0
+
+    async def test_collect_missing_data(self, client: WeatherClient, server: TestServer, media_path: Path):
+        collector = WeatherCollector()
+        locations = frozenset({LocationDTO(capital="Tallinn", alpha2code="EE")})
+        file_path = media_path.joinpath("weather", "tallinn_ee.json")
+        assert await collector.collect(locations) == CollectSummaryDTO(succeeded=1)
+
+        # данные удалены, а валидаторы сохранились: запрос выполняется без условий
+        file_path.unlink()
+
+        assert await collector.collect(locations) == CollectSummaryDTO(succeeded=1)
+        assert "If-None-Match" not in server.app["requests"][-1].headers
+        assert await WeatherCollector.load("tallinn_ee") == {"main": {"temp": 5.0}}
+
+    async def test_collect_not_modified_missing_data(
+        self, mocker, client: WeatherClient, server: TestServer, media_path: Path
+    ):
+        collector = WeatherCollector()
+        locations = frozenset({LocationDTO(capital="Tallinn", alpha2code="EE")})
+        file_path = media_path.joinpath("weather", "tallinn_ee.json")
+        validators_path = media_path.joinpath("validators", "weather", "tallinn_ee.json")
+        assert await collector.collect(locations) == CollectSummaryDTO(succeeded=1)
+        mocker.patch("collectors.base.BaseCollector.stale_keys", return_value={"tallinn_ee"})
+
+        # данные удаляются во время условного запроса
+        fetch = collector.fetch
+
+        async def fetch_and_delete(location: LocationDTO):
+            file_path.unlink()
+            return await fetch(location)
+
+        mocker.patch.object(collector, "fetch", side_effect=fetch_and_delete)
+
+        assert await collector.collect(locations) == CollectSummaryDTO(failed=1)
+        assert server.app["requests"][-1].headers["If-None-Match"] == ETAG
+        assert not validators_path.exists()
@@ -0,0 +1,185 @@
+"""
+Тестирование объединения одинаковых одновременных запросов.
+"""
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from clients import base as base_module, breaker as breaker_module, policy as policy_module
+from clients.base import conditional_request
+from clients.flight import FlightStats, SingleFlight, get_request_key
+from clients.session import SessionManager
+from clients.weather import WeatherClient
+
+ETAG = '"v1"'
+
+
+@pytest.mark.asyncio
+class TestSingleFlight:
+    """
+    Тестирование объединения вызовов.
+    """
+
+    async def test_deduplicated(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def func(value: str) -> str:
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return value
+
+        results = await asyncio.gather(
+            flight.do("a", lambda: func("a")),
+            flight.do("a", lambda: func("a")),
+            flight.do("b", lambda: func("b")),
+            flight.do("a", lambda: func("a")),
+        )
+
+        assert results == ["a", "a", "b", "a"]
+        assert sorted(calls) == ["a", "b"]
+        assert flight.stats() == FlightStats(calls=4, deduplicated=2, in_flight=0)
+
+        # завершенный вызов выполняется заново
+        assert await flight.do("a", lambda: func("a")) == "a"
+        assert calls.count("a") == 2
+
+    async def test_error(self):
+        flight = SingleFlight()
+
+        async def func() -> None:
+            await asyncio.sleep(0.01)
+            raise ValueError("error")
+
+        results = await asyncio.gather(flight.do("a", func), flight.do("a", func), return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.stats().in_flight == 0
+
+    async def test_cancel(self):
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def func() -> str:
+            started.set()
+            await asyncio.sleep(0.05)
+            return "a"
+
+        first = asyncio.ensure_future(flight.do("a", func))
+        second = asyncio.ensure_future(flight.do("a", func))
+        await started.wait()
+
+        # отмена одного из ожидающих не прерывает вызов для остальных
+        first.cancel()
+        assert await second == "a"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        # вызов отменяется, если его результат никто не ожидает
+        cancelled = []
+
+        async def endless() -> None:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        task = asyncio.ensure_future(flight.do("b", endless))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+
+        assert cancelled == [True]
+        assert flight.stats().in_flight == 0
+
+
+class TestRequestKey:
+    """
+    Тестирование ключа запроса.
+    """
+
+    def test_request_key(self):
+        assert get_request_key("/a", {"q": "1", "p": "2"}) == get_request_key("/a", {"p": "2", "q": "1"})
+        assert get_request_key("/a", {"q": "1"}) != get_request_key("/a", {"q": "2"})
+        assert get_request_key("/a", headers={"If-None-Match": ETAG}) != get_request_key("/a")
+
+
+@pytest.mark.asyncio
+class TestClientSingleFlight:
+    """
+    Тестирование объединения одинаковых запросов клиентов к сервису.
+    """
+
+    @pytest.fixture
+    async def server(self, mocker):
+        mocker.patch.object(base_module, "single_flight", SingleFlight())
+        mocker.patch.object(policy_module, "_rate_limiters", {})
+        mocker.patch.object(breaker_module, "_circuit_breakers", {})
+        mocker.patch.object(policy_module.settings, "RATE_LIMIT_OPENWEATHER", 0)
+        requests = []
+
+        async def weather(request: web.Request) -> web.Response:
+            requests.append(request)
+            await asyncio.sleep(0.05)
+            if request.headers.get("If-None-Match") == ETAG:
+                return web.Response(status=304, headers={"ETag": ETAG})
+            return web.json_response({"main": {"temp": 5.0}}, headers={"ETag": ETAG})
+
+        app = web.Application()
+        app["requests"] = requests
+        app.router.add_get("/weather", weather)
+        server = TestServer(app)
+        await server.start_server()
+        yield server
+        await server.close()
+
+    @pytest.fixture
+    async def client(self, mocker, server: TestServer):
+        manager = SessionManager()
+        mocker.patch.object(WeatherClient, "BASE_URL", str(server.make_url("/weather")))
+        yield WeatherClient(session_manager=manager)
+        await manager.close()
+
+    async def test_deduplicated(self, client: WeatherClient, server: TestServer):
+        results = await asyncio.gather(
+            client.get_weather("Tallinn,EE"),
+            client.get_weather("Tallinn,EE"),
+            client.get_weather("Riga,LV"),
+        )
+
+        assert results == [{"main": {"temp": 5.0}}] * 3
+        assert len(server.app["requests"]) == 2
+        assert base_module.single_flight.stats() == FlightStats(calls=3, deduplicated=1, in_flight=0)
+
+    async def test_conditional(self, client: WeatherClient, server: TestServer):
+        async def get_weather(validators: dict) -> tuple:
+            with conditional_request(validators) as request:
+                result = await client.get_weather("Tallinn,EE")
+            return result, request.not_modified, request.response_validators
+
+        results = await asyncio.gather(
+            get_weather({"etag": ETAG}),
+            get_weather({"etag": ETAG}),
+            get_weather({}),
+        )
+
+        # запросы с разными валидаторами не объединяются, статус ответа получает каждый вызывающий
+        assert results == [
+            (None, True, {"etag": ETAG}),
+            (None, True, {"etag": ETAG}),
+            ({"main": {"temp": 5.0}}, False, {"etag": ETAG}),
+        ]
+        assert len(server.app["requests"]) == 2
+
+    async def test_disabled(self, mocker, client: WeatherClient, server: TestServer):
+        mocker.patch.object(base_module.settings, "HTTP_SINGLE_FLIGHT", False)
+
+        await asyncio.gather(client.get_weather("Tallinn,EE"), client.get_weather("Tallinn,EE"))
+
+        assert len(server.app["requests"]) == 2
+        assert base_module.single_flight.stats().calls == 0
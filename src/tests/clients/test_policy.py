@@ -0,0 +1,188 @@
+"""
+Тестирование ограничения частоты запросов и повторных попыток запросов.
+"""
+import asyncio
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from clients import base as base_module, policy as policy_module
+from clients.policy import TokenBucket, get_backoff, parse_retry_after, prepaid
+from clients.session import SessionManager
+from clients.weather import WeatherClient
+from collectors.base import BaseCollector, CollectStatus
+from settings import Settings
+
+
+@pytest.mark.asyncio
+class TestTokenBucket:
+    """
+    Тестирование ограничителя частоты запросов.
+    """
+
+    async def test_rate(self):
+        bucket = TokenBucket(rate=50, capacity=2)
+        started = time.monotonic()
+
+        for _ in range(5):
+            await bucket.acquire()
+
+        # два запроса без ожидания, еще три – с частотой 50 запросов в секунду
+        assert time.monotonic() - started == pytest.approx(0.06, abs=0.03)
+
+    async def test_unlimited_and_pause(self):
+        bucket = TokenBucket(rate=0, capacity=1)
+        started = time.monotonic()
+
+        for _ in range(100):
+            await bucket.acquire()
+        assert time.monotonic() - started < 0.05
+
+        bucket.pause(0.05)
+        await bucket.acquire()
+        assert time.monotonic() - started >= 0.05
+
+    async def test_refund_on_cancel(self):
+        bucket = TokenBucket(rate=10, capacity=1)
+        await bucket.acquire()
+        waiter = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0.01)
+
+        # ожидавший разрешения запрос отменен: зарезервированный токен возвращается
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        started = time.monotonic()
+        await bucket.acquire()
+
+        assert time.monotonic() - started < 0.1
+
+    async def test_prepaid(self):
+        bucket = TokenBucket(rate=10, capacity=1)
+        reservation = await bucket.reserve()
+        started = time.monotonic()
+
+        with prepaid(reservation):
+            # первый запрос использует полученное заранее разрешение, второй – ожидает
+            await bucket.acquire()
+            assert time.monotonic() - started < 0.05
+            await bucket.acquire()
+            assert time.monotonic() - started >= 0.05
+
+    async def test_prepaid_unused_is_released(self):
+        bucket = TokenBucket(rate=10, capacity=1)
+
+        with prepaid(await bucket.reserve()):
+            pass
+        started = time.monotonic()
+        await bucket.acquire()
+
+        assert time.monotonic() - started < 0.05
+
+    async def test_fan_out_waits_outside_timeout(self):
+        bucket = TokenBucket(rate=20, capacity=1)
+
+        async def worker(item: int) -> CollectStatus:
+            await bucket.acquire()
+            return CollectStatus.SUCCEEDED
+
+        # очередь из 5 запросов ожидает около 0.2 с, но время ожидания элемента начинается после разрешения
+        summary = await BaseCollector.fan_out(range(5), worker, concurrency=5, timeout=0.03, rate_limiter=bucket)
+
+        assert summary.succeeded == 5
+
+
+class TestRetryPolicy:
+    """
+    Тестирование вычисления времени ожидания перед повторной попыткой.
+    """
+
+    def test_parse_retry_after(self):
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=120)
+
+        assert parse_retry_after("5") == 5
+        assert parse_retry_after(format_datetime(retry_at, usegmt=True)) == pytest.approx(120, abs=2)
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+    def test_default_timeouts_fit_retries(self):
+        defaults = {name: field.default for name, field in Settings.__fields__.items()}
+        retries = defaults["HTTP_RETRIES"]
+        # время запроса со всеми повторными попытками
+        budget = defaults["HTTP_TIMEOUT"] * (retries + 1) + defaults["HTTP_BACKOFF_MAX"] * retries
+
+        for name in ("WEATHER_TIMEOUT", "CITY_TIMEOUT", "NEWS_TIMEOUT", "REFRESH_TIMEOUT"):
+            assert defaults[name] >= budget, name
+
+    def test_backoff(self, mocker):
+        mocker.patch.object(policy_module.settings, "HTTP_BACKOFF_BASE", 1)
+        mocker.patch.object(policy_module.settings, "HTTP_BACKOFF_MAX", 5)
+
+        assert all(0 <= get_backoff(0) <= 1 for _ in range(100))
+        assert all(0 <= get_backoff(10) <= 5 for _ in range(100))
+
+
+@pytest.mark.asyncio
+class TestClientRetries:
+    """
+    Тестирование повторных попыток запросов клиентов.
+    """
+
+    @pytest.fixture
+    async def responses(self, mocker):
+        mocker.patch.object(policy_module.settings, "HTTP_BACKOFF_BASE", 0.001)
+        mocker.patch.object(base_module.settings, "HTTP_RETRIES", 2)
+        mocker.patch.object(base_module.settings, "HTTP_BACKOFF_MAX", 1)
+        mocker.patch.object(policy_module, "_rate_limiters", {})
+        mocker.patch.object(policy_module.settings, "RATE_LIMIT_OPENWEATHER", 0)
+        # ответы сервиса по порядку запросов
+        responses: list[web.Response] = []
+        requests = []
+
+        async def weather(request: web.Request) -> web.Response:
+            requests.append(request)
+            return responses.pop(0) if responses else web.json_response({"main": {}})
+
+        app = web.Application()
+        app.router.add_get("/weather", weather)
+        server = TestServer(app)
+        await server.start_server()
+        manager = SessionManager()
+        mocker.patch.object(WeatherClient, "BASE_URL", str(server.make_url("/weather")))
+        self.client = WeatherClient(session_manager=manager)
+        self.requests = requests
+        yield responses
+        await manager.close()
+        await server.close()
+
+    async def test_retry_until_success(self, responses: list):
+        responses.extend(
+            [
+                web.Response(status=503),
+                web.Response(status=429, headers={"Retry-After": "0"}),
+            ]
+        )
+
+        assert await self.client.get_weather("Tallinn,EE") == {"main": {}}
+        assert len(self.requests) == 3
+
+    async def test_retries_exhausted(self, responses: list):
+        responses.extend(web.Response(status=500) for _ in range(3))
+
+        assert await self.client.get_weather("Tallinn,EE") is None
+        assert len(self.requests) == 3
+
+    async def test_no_retry(self, responses: list):
+        responses.append(web.Response(status=404))
+
+        assert await self.client.get_weather("Tallinn,EE") is None
+        assert len(self.requests) == 1
+
+    async def test_retry_after_too_long(self, responses: list):
+        responses.append(web.Response(status=429, headers={"Retry-After": "3600"}))
+
+        assert await self.client.get_weather("Tallinn,EE") is None
+        assert len(self.requests) == 1
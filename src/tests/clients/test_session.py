@@ -0,0 +1,42 @@
+"""
+Тестирование функций управления общей HTTP-сессией.
+"""
+
+import pytest
+
+from clients.country import CountryClient
+from clients.session import SessionManager
+from clients.weather import WeatherClient
+
+
+@pytest.mark.asyncio
+class TestSessionManager:
+    """
+    Тестирование менеджера общей HTTP-сессии.
+    """
+
+    @pytest.fixture
+    async def manager(self):
+        manager = SessionManager()
+        yield manager
+        await manager.close()
+
+    async def test_session_is_shared(self, manager: SessionManager):
+        country_client = CountryClient(session_manager=manager)
+        weather_client = WeatherClient(session_manager=manager)
+
+        session = await country_client.get_session()
+
+        assert session is await weather_client.get_session()
+        assert session.connector.limit_per_host > 0
+
+    async def test_close(self, manager: SessionManager):
+        session = await manager.get_session()
+
+        await manager.close()
+
+        assert session.closed
+        # после закрытия создается новая сессия
+        new_session = await manager.get_session()
+        assert new_session is not session
+        assert not new_session.closed
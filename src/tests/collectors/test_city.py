@@ -0,0 +1,57 @@
+"""
+Тестирование функций сбора информации о столицах.
+"""
+from pathlib import Path
+
+import pytest
+
+from collectors.collector import CityCollector
+from collectors.models import CityInfoDTO, CollectSummaryDTO, LocationDTO
+
+
+@pytest.mark.asyncio
+class TestCollectorCity:
+    """
+    Тестирование коллектора для получения информации о столицах.
+    """
+
+    location = LocationDTO(capital="Tallinn", alpha2code="EE")
+    get_city_info_call_result = dict(
+        country=dict(code="EE", name="Estonia"),
+        geo_id=588409,
+        latitude=59.436958,
+        longitude=24.753531,
+        name="Tallinn",
+        population=394024,
+        state_or_region="Harjumaa",
+    )
+
+    @pytest.fixture
+    def collector(self, media_path: Path):
+        return CityCollector()
+
+    async def test_collect_and_read(self, mocker, collector: CityCollector):
+        mocker.patch(
+            "clients.city.CityClient.get_city_info",
+            return_value=self.get_city_info_call_result,
+        )
+
+        summary = await collector.collect(frozenset({self.location}))
+        city_info = await CityCollector.read(self.location)
+
+        assert summary == CollectSummaryDTO(succeeded=1)
+        collector.client.get_city_info.assert_called_once_with("Tallinn")
+        assert isinstance(city_info, CityInfoDTO)
+        assert city_info.latitude == 59.436958
+
+    async def test_collect_from_cache(self, mocker, collector: CityCollector):
+        mocker.patch("clients.city.CityClient.get_city_info")
+        mocker.patch("collectors.collector.CityCollector.stale_keys", return_value=set())
+
+        summary = await collector.collect(frozenset({self.location}))
+
+        assert summary == CollectSummaryDTO(skipped=1)
+        collector.client.get_city_info.assert_not_called()
+
+    async def test_read_if_file_is_absent(self, collector: CityCollector):
+        assert await CityCollector.read(self.location) is None
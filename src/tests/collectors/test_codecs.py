@@ -0,0 +1,76 @@
+"""
+Тестирование кодеков сохраняемых данных.
+"""
+from pathlib import Path
+
+import pytest
+
+from collectors import codecs as codecs_module
+from collectors.codecs import JsonCodec, OrjsonCodec, get_codec
+from collectors.storage import FileSystemBackend, SqliteBackend
+
+PAYLOAD = {"name": "Åland Islands", "area": 1580.0, "population": 28875, "timezones": ["UTC+02:00"], "flag": None}
+
+
+class TestCodecs:
+    """
+    Тестирование кодирования и декодирования данных.
+    """
+
+    @pytest.mark.parametrize("name", ["json", "orjson"])
+    def test_round_trip(self, name: str):
+        if name == "orjson":
+            pytest.importorskip("orjson")
+        codec = get_codec(name)
+
+        assert codec.loads(codec.dumps(PAYLOAD)) == PAYLOAD
+        assert codec.loads(codec.dumps(PAYLOAD).encode()) == PAYLOAD
+        with pytest.raises(ValueError):
+            codec.loads("{")
+
+    def test_get_codec(self, mocker):
+        mocker.patch.object(codecs_module.settings, "CACHE_CODEC", "json")
+        assert isinstance(get_codec(), JsonCodec)
+
+        mocker.patch.object(codecs_module, "orjson", None)
+        assert isinstance(get_codec("auto"), JsonCodec)
+        with pytest.raises(RuntimeError):
+            get_codec("orjson")
+        with pytest.raises(ValueError):
+            get_codec("pickle")
+
+    def test_get_codec_auto(self):
+        pytest.importorskip("orjson")
+        assert isinstance(get_codec("auto"), OrjsonCodec)
+
+
+@pytest.mark.asyncio
+class TestBackendCodecs:
+    """
+    Тестирование совместимости данных, сохраненных разными кодеками.
+    """
+
+    @pytest.fixture(autouse=True)
+    def orjson(self):
+        pytest.importorskip("orjson")
+
+    @pytest.mark.parametrize("checksum", [False, True])
+    async def test_files(self, tmp_path: Path, checksum: bool):
+        writer = FileSystemBackend(tmp_path, checksum=checksum, codec=OrjsonCodec())
+        reader = FileSystemBackend(tmp_path, checksum=checksum, codec=JsonCodec())
+        await writer.put("country", "country", PAYLOAD)
+
+        assert (await reader.get("country", "country")).payload == PAYLOAD
+
+        await reader.put("country", "country", PAYLOAD)
+
+        assert (await writer.get("country", "country")).payload == PAYLOAD
+
+    async def test_sqlite(self, tmp_path: Path):
+        writer = SqliteBackend(tmp_path.joinpath("snapshots.sqlite3"), codec=OrjsonCodec())
+        await writer.put("country", "country", PAYLOAD)
+        await writer.close()
+        reader = SqliteBackend(tmp_path.joinpath("snapshots.sqlite3"), codec=JsonCodec())
+
+        assert (await reader.get("country", "country")).payload == PAYLOAD
+        await reader.close()
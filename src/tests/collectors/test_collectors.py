@@ -0,0 +1,133 @@
+"""
+Тестирование планировщика сбора данных.
+"""
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from collectors.base import BaseCollector
+from collectors.collector import Collectors
+
+
+class FakeCollector(BaseCollector):
+    """
+    Сборщик, записывающий в журнал начало и окончание своей работы.
+    """
+
+    journal: list[str] = []
+    delay = 0.0
+    result: Any = None
+
+    async def collect(self, **kwargs: Any) -> Any:
+        self.journal.append(f"{self.name}:start:{sorted(kwargs.items())}")
+        await asyncio.sleep(self.delay)
+        self.journal.append(f"{self.name}:end")
+        return self.result
+
+    async def fetch(self, item: Any) -> Any:
+        return self.result
+
+    @staticmethod
+    async def get_file_path(**kwargs: Any) -> Path:
+        return Path()
+
+    @property
+    async def cache_ttl(self) -> int:
+        return 0
+
+
+@pytest.mark.asyncio
+class TestCollectors:
+    """
+    Тестирование планировщика сбора данных.
+    """
+
+    @pytest.fixture
+    def journal(self):
+        FakeCollector.journal = []
+        return FakeCollector.journal
+
+    async def test_stages_overlap(self, journal: list[str]):
+        class Country(FakeCollector):
+            name = "country"
+            result = "locations"
+
+        class Weather(FakeCollector):
+            name = "weather"
+            depends_on = {"country": "locations"}
+            delay = 0.05
+
+        class News(FakeCollector):
+            name = "news"
+            depends_on = {"country": None}
+
+        class TestGraph(Collectors):
+            collectors = (Weather, News, Country)
+
+        results = await TestGraph.gather()
+
+        assert results == {"country": "locations", "weather": None, "news": None}
+        assert journal[0] == "country:start:[]"
+        assert "weather:start:[('locations', 'locations')]" in journal
+        # новости собираются, не дожидаясь окончания сбора погоды
+        assert journal.index("news:end") < journal.index("weather:end")
+
+    async def test_failed_dependency(self, journal: list[str]):
+        class Country(FakeCollector):
+            name = "country"
+
+            async def collect(self, **kwargs: Any) -> Any:
+                raise RuntimeError("boom")
+
+        class Weather(FakeCollector):
+            name = "weather"
+            depends_on = {"country": "locations"}
+
+        class Currency(FakeCollector):
+            name = "currency_rates"
+
+        class TestGraph(Collectors):
+            collectors = (Country, Weather, Currency)
+
+        results = await TestGraph.gather()
+
+        assert isinstance(results["country"], RuntimeError)
+        assert isinstance(results["weather"], RuntimeError)
+        assert results["currency_rates"] is None
+        assert journal == ["currency_rates:start:[]", "currency_rates:end"]
+
+    async def test_commit_after_dependents(self, mocker, journal: list[str]):
+        class Country(FakeCollector):
+            name = "country"
+            result = "locations"
+
+        class Weather(FakeCollector):
+            name = "weather"
+            depends_on = {"country": "locations"}
+
+        class TestGraph(Collectors):
+            collectors = (Country, Weather)
+
+        commit = mocker.patch.object(Country, "commit")
+
+        await TestGraph.gather()
+        commit.assert_called_once_with("locations")
+
+        # этап не завершается, если зависящий от него этап завершился ошибкой
+        commit.reset_mock()
+        mocker.patch.object(Weather, "collect", side_effect=RuntimeError("boom"))
+        await TestGraph.gather()
+        commit.assert_not_called()
+
+    async def test_unknown_dependency(self):
+        class Weather(FakeCollector):
+            name = "weather"
+            depends_on = {"country": "locations"}
+
+        class TestGraph(Collectors):
+            collectors = (Weather,)
+
+        with pytest.raises(ValueError):
+            await TestGraph.gather()
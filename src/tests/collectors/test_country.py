@@ -1,11 +1,15 @@
 """
 Тестирование функций сбора информации о странах.
 """
+import json
+import os
 from pathlib import Path
 import pytest
 
+from clients.base import get_conditional_request
+from collectors import collector as collector_module, storage as storage_module
 from collectors.collector import CountryCollector
-from collectors.models import LocationDTO
+from collectors.models import CountryKeyDTO, LocationDTO
 from settings import get_settings
 
 settings = get_settings()
@@ -52,25 +56,181 @@ class TestCollectorCountry:
     ):
         assert await collector.get_file_path() == file_path_for_test
 
+    @pytest.mark.parametrize("backend", ["sqlite", "memory"])
+    async def test_get_file_path_without_files(
+        self, mocker, media_path: Path, collector: CountryCollector, backend: str
+    ):
+        mocker.patch.object(storage_module.settings, "CACHE_BACKEND", backend)
+
+        assert await collector.get_file_path() is None
+
     async def test_get_cache_ttl(self, collector: CountryCollector):
         """ToDo по аналогии."""
 
     async def test_collect_no_cache(
-        self, mocker, collector: CountryCollector, file_path_for_test: Path
+        self, mocker, collector: CountryCollector, media_path: Path
     ):
         mocker.patch("clients.country.CountryClient.get_countries")
         collector.client.get_countries.return_value = self.get_countries_call_result
         mocker.patch("collectors.collector.CountryCollector.cache_invalid")
         collector.cache_invalid.return_value = True
-        mocker.patch("collectors.collector.CountryCollector.get_file_path")
-        collector.get_file_path.return_value = file_path_for_test
 
         call_result = await collector.collect()
-        collector.client.get_countries.assert_called_once_with()
+        assert [call.args for call in collector.client.get_countries.call_args_list] == [
+            (bloc,) for bloc in settings.COUNTRY_BLOCS
+        ]
 
-        assert call_result == frozenset(
+        assert call_result.locations == frozenset(
             {LocationDTO(capital="Mariehamn", alpha2code="AX")}
         )
+        assert media_path.joinpath("country.json").is_file()
+
+    async def test_get_delta(self, countries_payload: list[dict]):
+        aland, estonia = countries_payload
+        norway = {**aland, "alpha2code": "NO", "capital": "Oslo", "name": "Norway"}
+
+        delta = CountryCollector.get_delta(
+            [aland, estonia], [{**estonia, "capital": "Tartu"}, norway]
+        )
+
+        assert delta.locations == frozenset(
+            {LocationDTO(capital="Tartu", alpha2code="EE"), LocationDTO(capital="Oslo", alpha2code="NO")}
+        )
+        assert [country.alpha2code for country in delta.countries] == ["EE", "NO"]
+        assert delta.added == [CountryKeyDTO(alpha2code="NO", capital="Oslo", name="Norway")]
+        assert delta.removed == [CountryKeyDTO(alpha2code="AX", capital="Mariehamn", name="Åland Islands")]
+        assert delta.changed == [
+            (
+                CountryKeyDTO(alpha2code="EE", capital="Tallinn", name="Estonia"),
+                CountryKeyDTO(alpha2code="EE", capital="Tartu", name="Estonia"),
+            )
+        ]
+        assert [country.alpha2code for country in delta.get_obsolete()] == ["AX", "EE"]
+
+        # изменение остальных полей страны не считается изменением
+        delta = CountryCollector.get_delta([aland], [{**aland, "population": 1}])
+        assert not delta.added and not delta.removed and not delta.changed
+
+    async def test_collect_delta(
+        self, mocker, collector: CountryCollector, country_file: Path, countries_payload: list[dict]
+    ):
+        aland, estonia = countries_payload
+        mocker.patch.object(CountryCollector, "cache_invalid", return_value=True)
+        mocker.patch.object(collector, "fetch", return_value=[estonia])
+
+        delta = await collector.collect()
+
+        assert delta.locations == frozenset({LocationDTO(capital="Tallinn", alpha2code="EE")})
+        assert [country.alpha2code for country in delta.removed] == ["AX"]
+        assert not delta.added and not delta.changed
+
+    async def test_collect_corrupted_file(
+        self, mocker, collector: CountryCollector, country_file: Path, countries_payload: list[dict]
+    ):
+        country_file.write_text('[{"capital": ')
+        mocker.patch.object(collector, "fetch", return_value=countries_payload)
+
+        delta = await collector.collect()
+
+        # актуальный, но поврежденный файл собирается заново
+        collector.fetch.assert_called_once()
+        assert len(delta.locations) == 2
+        assert await CountryCollector.load() == countries_payload
+
+    async def test_collect_delta_after_background_refresh(
+        self, mocker, collector: CountryCollector, country_file: Path, countries_payload: list[dict]
+    ):
+        aland, estonia = countries_payload
+        await collector.commit(await collector.collect())
+        # список стран актуализирован в фоне при чтении, а не при сборе данных
+        country_file.write_text(json.dumps([estonia]))
+        mocker.patch.object(CountryCollector, "cache_invalid", return_value=False)
+
+        delta = await collector.collect()
+
+        assert [country.alpha2code for country in delta.removed] == ["AX"]
+        # пока обработанный список не сохранен, изменения не теряются
+        assert (await collector.collect()).removed == delta.removed
+
+        await collector.commit(delta)
+        assert not (await collector.collect()).removed
+
+    async def test_collect_not_refreshed(self, mocker, collector: CountryCollector, country_file: Path):
+        mocker.patch.object(CountryCollector, "cache_invalid", return_value=False)
+
+        delta = await collector.collect()
+
+        assert len(delta.locations) == 2
+        assert not delta.added and not delta.removed and not delta.changed
+
+    async def test_fetch_blocs(self, mocker, collector: CountryCollector, countries_payload: list[dict]):
+        mocker.patch.object(collector_module.settings, "COUNTRY_BLOCS", ["eu", "efta", "eu"])
+        aland, estonia = countries_payload
+        blocs = {"eu": [aland, estonia], "efta": [estonia, {**aland, "alpha2code": "NO"}]}
+        mocker.patch.object(collector.client, "get_countries", side_effect=lambda bloc: blocs[bloc])
+
+        result = await collector.fetch()
+
+        # страны, входящие в несколько объединений, не дублируются
+        assert [country["alpha2code"] for country in result] == ["AX", "EE", "NO"]
+        assert collector.client.get_countries.call_count == 2
+
+    async def test_fetch_bloc_failed(self, mocker, collector: CountryCollector, countries_payload: list[dict]):
+        mocker.patch.object(collector_module.settings, "COUNTRY_BLOCS", ["eu", "efta"])
+        blocs = {"eu": countries_payload, "efta": None}
+        mocker.patch.object(collector.client, "get_countries", side_effect=lambda bloc: blocs[bloc])
+
+        # неполный список стран не сохраняется
+        assert await collector.fetch() is None
+
+    async def test_fetch_single_bloc(self, mocker, collector: CountryCollector, countries_payload: list[dict]):
+        mocker.patch.object(collector_module.settings, "COUNTRY_BLOCS", ["eu"])
+        mocker.patch.object(collector.client, "get_countries", return_value=countries_payload)
+
+        assert await collector.fetch() == countries_payload
+        collector.client.get_countries.assert_called_once_with("eu")
+
+    async def test_collect_blocs_conditionally(
+        self, mocker, collector: CountryCollector, media_path: Path, countries_payload: list[dict]
+    ):
+        mocker.patch.object(collector_module.settings, "COUNTRY_BLOCS", ["eu", "efta"])
+        mocker.patch.object(CountryCollector, "cache_invalid", return_value=True)
+        aland, estonia = countries_payload
+        blocs = {"eu": [estonia], "efta": [aland]}
+        versions = {"eu": 1, "efta": 1}
+        requests = []
+
+        async def get_countries(bloc: str):
+            # сервис отвечает 304, если версия данных объединения не изменилась
+            request = get_conditional_request()
+            headers = {"ETag": f'"{bloc}-{versions[bloc]}"'}
+            requests.append((bloc, request.get_headers().get("If-None-Match", "")))
+            if request.get_headers().get("If-None-Match") == headers["ETag"]:
+                request.update(304, headers)
+                return None
+            request.update(200, headers)
+            return blocs[bloc]
+
+        mocker.patch.object(collector.client, "get_countries", side_effect=get_countries)
+        file_path = media_path.joinpath("country.json")
+
+        await collector.collect()
+        assert sorted(requests) == [("efta", ""), ("eu", "")]
+
+        # данные ни одного объединения не изменились: файл не перезаписывается
+        os.utime(file_path, (0, 0))
+        requests.clear()
+        await collector.collect()
+        assert sorted(requests) == [("efta", '"efta-1"'), ("eu", '"eu-1"')]
+        assert file_path.stat().st_mtime > 0
+        assert await CountryCollector.load() == [estonia, aland]
+
+        # данные одного объединения изменились: остальные запрашиваются заново без условий
+        versions["efta"], blocs["efta"] = 2, [{**aland, "capital": "Godby"}]
+        requests.clear()
+        await collector.collect()
+        assert sorted(requests) == [("efta", '"efta-1"'), ("eu", ""), ("eu", '"eu-1"')]
+        assert [country["capital"] for country in await CountryCollector.load()] == ["Tallinn", "Godby"]
 
     async def test_collect_from_cache(self, mocker, collector):
         """ToDO Если в кеше есть данные."""
@@ -0,0 +1,83 @@
+"""
+Тестирование удаления данных после изменения списка стран.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from collectors.collector import CityCollector, NewsCollector, WeatherCollector
+from collectors.models import CollectSummaryDTO, CountryDeltaDTO, CountryKeyDTO, LocationDTO
+
+
+@pytest.mark.asyncio
+class TestCollectGarbage:
+    """
+    Тестирование удаления данных удаленных и изменившихся стран.
+    """
+
+    aland = CountryKeyDTO(alpha2code="AX", capital="Mariehamn", name="Åland Islands")
+    estonia = CountryKeyDTO(alpha2code="EE", capital="Tallinn", name="Estonia")
+
+    @pytest.fixture
+    def countries(self, country_file: Path, countries_payload: list[dict]) -> CountryDeltaDTO:
+        # Аландские острова удалены, у Эстонии изменилась столица
+        country_file.write_text(json.dumps([{**countries_payload[1], "capital": "Tartu"}]))
+        return CountryDeltaDTO(
+            locations=frozenset({LocationDTO(capital="Tartu", alpha2code="EE")}),
+            removed=[self.aland],
+            changed=[(self.estonia, self.estonia.copy(update={"capital": "Tartu"}))],
+        )
+
+    @staticmethod
+    def write(media_path: Path, namespace: str, key: str) -> Path:
+        file_path = media_path.joinpath(namespace, f"{key}.json")
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("{}")
+        return file_path
+
+    @pytest.mark.parametrize("collector_class", [WeatherCollector, CityCollector])
+    async def test_locations(
+        self, mocker, collector_class: type, countries: CountryDeltaDTO, media_path: Path
+    ):
+        collector = collector_class()
+        namespace = collector.namespace
+        obsolete = [
+            self.write(media_path, namespace, "mariehamn_ax"),
+            self.write(media_path, namespace, "tallinn_ee"),
+            self.write(media_path, f"validators/{namespace}", "tallinn_ee"),
+        ]
+        lock = collector.get_lock("mariehamn_ax")
+        await lock.acquire()
+        lock.release()
+        mocker.patch.object(collector, "fetch", return_value={"name": "Tartu"})
+
+        summary = await collector.collect(countries=countries)
+
+        assert summary == CollectSummaryDTO(succeeded=1)
+        assert not any(file_path.exists() for file_path in obsolete)
+        assert not lock.path.exists()
+        assert media_path.joinpath(namespace, "tartu_ee.json").is_file()
+
+    async def test_news(self, mocker, countries: CountryDeltaDTO, media_path: Path):
+        collector = NewsCollector()
+        obsolete = self.write(media_path, "news", "åland_islands_ax")
+        kept = self.write(media_path, "news", "estonia_ee")
+        mocker.patch.object(collector, "fetch", return_value=None)
+
+        await collector.collect(countries=countries)
+
+        # название Эстонии не изменилось, поэтому ее новости сохраняются
+        assert not obsolete.exists()
+        assert kept.exists()
+
+    async def test_no_changes(self, mocker, media_path: Path):
+        collector = WeatherCollector()
+        file_path = self.write(media_path, "weather", "mariehamn_ax")
+        delete_many = mocker.spy(collector.get_backend(), "delete_many")
+        mocker.patch.object(collector, "fetch", return_value={})
+
+        await collector.collect(countries=CountryDeltaDTO())
+
+        assert file_path.exists()
+        delete_many.assert_not_called()
@@ -0,0 +1,102 @@
+"""
+Тестирование межпроцессных блокировок сбора данных.
+"""
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from collectors import base as base_module
+from collectors.collector import Collectors, WeatherCollector
+from collectors.locks import FileLock
+from collectors.models import CollectSummaryDTO, LocationDTO
+
+WEATHER_PAYLOAD = {"main": {"temp": 5.0}}
+
+
+@pytest.mark.asyncio
+class TestFileLock:
+    """
+    Тестирование блокировки файла.
+    """
+
+    async def test_acquire_and_release(self, tmp_path: Path):
+        lock = FileLock(tmp_path.joinpath("locks", "collect.lock"))
+        other = FileLock(tmp_path.joinpath("locks", "collect.lock"), poll_interval=0.01)
+
+        assert await lock.acquire(blocking=False)
+        assert lock.locked
+        assert not await other.acquire(blocking=False)
+        assert not await other.acquire(timeout=0.05)
+
+        lock.release()
+
+        assert await other.acquire(blocking=False)
+        other.release()
+
+    async def test_wait_for_release(self, tmp_path: Path):
+        lock = FileLock(tmp_path.joinpath("collect.lock"))
+        other = FileLock(tmp_path.joinpath("collect.lock"), poll_interval=0.01)
+        await lock.acquire()
+        asyncio.get_running_loop().call_later(0.05, lock.release)
+
+        assert await other.acquire(timeout=1)
+        other.release()
+
+
+@pytest.mark.asyncio
+class TestCollectLocks:
+    """
+    Тестирование сбора данных при пересечении запусков.
+    """
+
+    locations = frozenset({LocationDTO(capital="Tallinn", alpha2code="EE")})
+
+    @pytest.fixture
+    def key_lock(self, media_path: Path) -> FileLock:
+        return FileLock(media_path.joinpath("locks", "weather", "tallinn_ee.lock"))
+
+    async def test_key_locked_skip(self, mocker, media_path: Path, key_lock: FileLock):
+        mocker.patch.object(base_module.settings, "LOCK_KEY_MODE", "skip")
+        mocker.patch("clients.weather.WeatherClient.get_weather", return_value=WEATHER_PAYLOAD)
+        collector = WeatherCollector()
+        await key_lock.acquire()
+
+        summary = await collector.collect(self.locations)
+
+        key_lock.release()
+        assert summary == CollectSummaryDTO(skipped=1)
+        collector.client.get_weather.assert_not_called()
+
+    async def test_key_locked_wait(self, mocker, media_path: Path, key_lock: FileLock):
+        mocker.patch("clients.weather.WeatherClient.get_weather", return_value=WEATHER_PAYLOAD)
+        collector = WeatherCollector()
+        await key_lock.acquire()
+
+        async def other_process() -> None:
+            # другой процесс сохраняет данные и освобождает блокировку
+            await asyncio.sleep(0.05)
+            await collector.save(WEATHER_PAYLOAD, "tallinn_ee")
+            key_lock.release()
+
+        summary, _ = await asyncio.gather(collector.collect(self.locations), other_process())
+
+        assert summary == CollectSummaryDTO(skipped=1)
+        collector.client.get_weather.assert_not_called()
+
+    async def test_key_lock_released(self, mocker, media_path: Path, key_lock: FileLock):
+        mocker.patch("clients.weather.WeatherClient.get_weather", return_value=WEATHER_PAYLOAD)
+
+        assert await WeatherCollector().collect(self.locations) == CollectSummaryDTO(succeeded=1)
+        assert await key_lock.acquire(blocking=False)
+        key_lock.release()
+
+    async def test_run_locked(self, mocker, media_path: Path):
+        mocker.patch.object(Collectors, "gather")
+        lock = FileLock(media_path.joinpath("locks", "collect.lock"))
+        await lock.acquire()
+
+        assert await Collectors.run() == {}
+
+        lock.release()
+        Collectors.gather.assert_not_called()
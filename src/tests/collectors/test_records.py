@@ -0,0 +1,106 @@
+"""
+Тестирование моделей для чтения данных.
+"""
+import json
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from collectors.collector import CountryCollector, NewsCollector, WeatherCollector
+from collectors.models import LocationDTO
+from collectors.records import CountryRecord, LocationRecord, NewsRecord, WeatherRecord
+
+WEATHER_PAYLOAD = {
+    "main": {"temp": 5, "pressure": 1000, "humidity": 80},
+    "wind": {"speed": 3},
+    "weather": [{"description": "clear sky"}],
+    "visibility": 10000,
+    "timezone": 7200,
+}
+ARTICLE = {
+    "author": "Jane Doe",
+    "title": "Lorem ipsum",
+    "description": None,
+    "publishedAt": "2024-06-06T10:57:25Z",
+    "content": None,
+    "url": "https://example.com/news/lorem-ipsum",
+}
+
+
+class TestRecords:
+    """
+    Тестирование преобразования моделей для чтения в модели pydantic.
+    """
+
+    def test_location(self):
+        location = LocationRecord("Tallinn", "EE")
+
+        assert hash(location) == hash(LocationRecord("Tallinn", "EE"))
+        assert {location, LocationRecord("Tallinn", "EE")} == {location}
+        assert location.to_dto() == LocationDTO(capital="Tallinn", alpha2code="EE")
+        assert not hasattr(location, "__dict__")
+
+    def test_country(self, countries_payload: list[dict]):
+        (country,) = CountryCollector.build(countries_payload[1:])
+
+        record = CountryRecord.from_dto(country)
+
+        assert record.alt_spellings == ("EE", "Eesti", "Republic of Estonia", "Eesti Vabariik")
+        assert record.currencies == ("EUR",)
+        assert record.languages == (("Estonian", "eesti"),)
+        assert record.location == LocationRecord("Tallinn", "EE")
+        assert record.to_dto().dict(exclude={"currencies", "languages"}) == country.dict(
+            exclude={"currencies", "languages"}
+        )
+        assert record.to_dto().currencies == country.currencies
+        assert record.to_dto().languages == country.languages
+
+    def test_weather(self):
+        weather = WeatherRecord.from_payload(WEATHER_PAYLOAD)
+
+        # значения приводятся к типам полей, как и при проверке модели pydantic
+        assert weather.temp == 5.0 and isinstance(weather.temp, float)
+        assert weather.to_dto().json() == (
+            '{"temp": 5.0, "pressure": 1000, "humidity": 80, "wind_speed": 3.0, '
+            '"visibility": 10000, "description": "clear sky", "timezone": 7200}'
+        )
+
+    def test_news(self):
+        news = NewsRecord.from_payload(ARTICLE).to_dto()
+
+        assert news.publishedAt.year == 2024
+        assert news.url == ARTICLE["url"]
+        with pytest.raises(ValidationError):
+            NewsRecord.from_payload({**ARTICLE, "url": "not a url"}).to_dto()
+
+
+@pytest.mark.asyncio
+class TestReadRecords:
+    """
+    Тестирование чтения сохраненных данных в виде моделей для чтения.
+    """
+
+    async def test_countries(self, country_file: Path):
+        countries = await CountryCollector.read_records()
+
+        assert [country.alpha2code for country in countries] == ["AX", "EE"]
+        assert all(isinstance(country, CountryRecord) for country in countries)
+        assert await CountryCollector.read_records() == countries
+
+    async def test_weather(self, media_path: Path):
+        file_path = media_path.joinpath("weather", "tallinn_ee.json")
+        file_path.parent.mkdir()
+        file_path.write_text(json.dumps(WEATHER_PAYLOAD))
+
+        assert await WeatherCollector.read_record(LocationRecord("Tallinn", "EE")) == WeatherRecord.from_payload(
+            WEATHER_PAYLOAD
+        )
+        assert await WeatherCollector.read_record(LocationRecord("Riga", "LV")) is None
+
+    async def test_news(self, media_path: Path):
+        file_path = media_path.joinpath("news", "estonia_ee.json")
+        file_path.parent.mkdir()
+        file_path.write_text(json.dumps({"totalResults": 1, "articles": [ARTICLE]}))
+
+        assert await NewsCollector.read_records("estonia_ee") == [NewsRecord.from_payload(ARTICLE)]
@@ -0,0 +1,156 @@
+"""
+Тестирование выдачи устаревших данных с их фоновой актуализацией.
+"""
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from collectors import base as base_module, collector as collector_module
+from collectors.collector import WeatherCollector
+from collectors.models import LocationDTO
+from collectors.refresh import RefreshQueue, refresh_queue
+
+WEATHER_PAYLOAD = {
+    "main": {"temp": 5.0, "pressure": 1000, "humidity": 80},
+    "wind": {"speed": 3.0},
+    "weather": [{"description": "clear sky"}],
+    "visibility": 10000,
+    "timezone": 7200,
+}
+
+
+@pytest.fixture(autouse=True)
+async def drain_refresh_queue():
+    yield
+    await refresh_queue.drain(timeout=1)
+
+
+@pytest.mark.asyncio
+class TestStaleWhileRevalidate:
+    """
+    Тестирование чтения устаревших данных.
+    """
+
+    location = LocationDTO(capital="Tallinn", alpha2code="EE")
+
+    @pytest.fixture
+    def weather_file(self, media_path: Path) -> Path:
+        file_path = media_path.joinpath("weather", "tallinn_ee.json")
+        file_path.parent.mkdir()
+        file_path.write_text(json.dumps(WEATHER_PAYLOAD))
+        return file_path
+
+    @staticmethod
+    def set_age(file_path: Path, age: float) -> None:
+        fetched_at = time.time() - age
+        os.utime(file_path, (fetched_at, fetched_at))
+
+    async def test_fresh(self, mocker, weather_file: Path):
+        mocker.patch("clients.weather.WeatherClient.get_weather")
+
+        weather = await WeatherCollector.read(self.location)
+
+        assert weather.temp == 5.0
+        assert len(refresh_queue) == 0
+
+    async def test_stale_is_served_and_refreshed(self, mocker, weather_file: Path):
+        self.set_age(weather_file, collector_module.settings.CACHE_TTL_WEATHER + 60)
+        fresh_payload = {**WEATHER_PAYLOAD, "main": {"temp": 7.0, "pressure": 1000, "humidity": 80}}
+        mocker.patch("clients.weather.WeatherClient.get_weather", return_value=fresh_payload)
+
+        weather = await WeatherCollector.read(self.location)
+        assert weather.temp == 5.0
+        assert len(refresh_queue) == 1
+
+        await refresh_queue.drain(timeout=1)
+
+        weather = await WeatherCollector.read(self.location)
+        assert weather.temp == 7.0
+        assert len(refresh_queue) == 0
+
+    async def test_stale_within_max_age(self, mocker, media_path: Path, weather_file: Path):
+        self.set_age(weather_file, collector_module.settings.CACHE_TTL_WEATHER + 60)
+        # сервис разрешил кэшировать ответ дольше времени актуальности из настроек
+        validators_file = media_path.joinpath("validators", "weather", "tallinn_ee.json")
+        validators_file.parent.mkdir(parents=True)
+        validators_file.write_text(json.dumps({"max_age": collector_module.settings.CACHE_TTL_WEATHER + 3600}))
+
+        weather = await WeatherCollector.read(self.location)
+
+        assert weather.temp == 5.0
+        assert len(refresh_queue) == 0
+
+    async def test_too_stale(self, mocker, weather_file: Path):
+        self.set_age(weather_file, collector_module.settings.CACHE_MAX_STALE_WEATHER + 60)
+        mocker.patch("clients.weather.WeatherClient.get_weather", return_value=WEATHER_PAYLOAD)
+
+        assert await WeatherCollector.read(self.location) is None
+        assert len(refresh_queue) == 1
+
+        await refresh_queue.drain(timeout=1)
+
+        assert (await WeatherCollector.read(self.location)).temp == 5.0
+
+    async def test_background_refresh_disabled(self, mocker, weather_file: Path):
+        self.set_age(weather_file, collector_module.settings.CACHE_TTL_WEATHER + 60)
+        mocker.patch.object(base_module.settings, "CACHE_BACKGROUND_REFRESH", False)
+
+        weather = await WeatherCollector.read(self.location)
+
+        assert weather.temp == 5.0
+        assert len(refresh_queue) == 0
+
+    async def test_entry_age(self, weather_file: Path):
+        self.set_age(weather_file, 120)
+
+        age = await WeatherCollector.get_entry_age("tallinn_ee")
+
+        assert 119 < age < 130
+        assert await WeatherCollector.get_entry_age("riga_lv") is None
+
+
+@pytest.mark.asyncio
+class TestRefreshQueue:
+    """
+    Тестирование очереди фоновой актуализации.
+    """
+
+    async def test_enqueue_deduplicates(self, mocker, media_path: Path):
+        queue = RefreshQueue()
+        started = asyncio.Event()
+
+        async def get_weather(location: str) -> dict:
+            started.set()
+            return WEATHER_PAYLOAD
+
+        mocker.patch("clients.weather.WeatherClient.get_weather", side_effect=get_weather)
+        collector = WeatherCollector()
+
+        queue.enqueue(collector, "tallinn_ee", LocationDTO(capital="Tallinn", alpha2code="EE"))
+        queue.enqueue(collector, "tallinn_ee", LocationDTO(capital="Tallinn", alpha2code="EE"))
+        assert len(queue) == 1
+
+        await queue.drain(timeout=1)
+
+        assert started.is_set()
+        assert collector.client.get_weather.call_count == 1
+        assert media_path.joinpath("weather", "tallinn_ee.json").is_file()
+
+    async def test_drain_cancels_slow(self, mocker, media_path: Path):
+        queue = RefreshQueue()
+
+        async def get_weather(location: str) -> dict:
+            await asyncio.sleep(10)
+            return WEATHER_PAYLOAD
+
+        mocker.patch("clients.weather.WeatherClient.get_weather", side_effect=get_weather)
+
+        queue.enqueue(WeatherCollector(), "tallinn_ee", LocationDTO(capital="Tallinn", alpha2code="EE"))
+        await queue.drain(timeout=0.05)
+
+        assert len(queue) == 0
+        assert not media_path.joinpath("weather", "tallinn_ee.json").exists()
@@ -0,0 +1,126 @@
+"""
+Тестирование планировщика сбора данных.
+"""
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from collectors import base as base_module, scheduler as scheduler_module
+from collectors.collector import Collectors, CountryCollector, WeatherCollector
+from collectors.scheduler import Scheduler
+
+
+@pytest.mark.asyncio
+class TestScheduler:
+    """
+    Тестирование вычисления времени запуска и остановки планировщика.
+    """
+
+    @pytest.fixture
+    def scheduler(self, media_path: Path) -> Scheduler:
+        return Scheduler()
+
+    async def test_expiries(self, country_file: Path, media_path: Path):
+        weather_file = media_path.joinpath("weather", "tallinn_ee.json")
+        weather_file.parent.mkdir()
+        weather_file.write_text(json.dumps({"main": {}}))
+
+        collector = WeatherCollector()
+
+        expiries = await collector.get_expiries()
+
+        assert expiries.keys() == {"mariehamn_ax", "tallinn_ee"}
+        assert expiries["mariehamn_ax"] == pytest.approx(time.time(), abs=5)
+        assert expiries["tallinn_ee"] == pytest.approx(
+            weather_file.stat().st_mtime
+            + collector.get_key_ttl("tallinn_ee", scheduler_module.settings.CACHE_TTL_WEATHER),
+            abs=1,
+        )
+        assert (await CountryCollector().get_expiries()).keys() == {"country"}
+
+    async def test_failed_key_backoff(self, mocker, country_file: Path, scheduler: Scheduler):
+        mocker.patch.object(base_module.settings, "CACHE_FAILURE_BACKOFF", 300)
+        mocker.patch.object(base_module.settings, "CACHE_REFRESH_SLICE", 0)
+        # сервис не возвращает данные о столице Аландских островов
+        mocker.patch(
+            "clients.weather.WeatherClient.get_weather",
+            side_effect=lambda location: None if location.startswith("Mariehamn") else {"main": {}},
+        )
+        collector = WeatherCollector()
+        locations = await CountryCollector.get_locations()
+
+        summary = await collector.collect(locations)
+        assert (summary.succeeded, summary.failed) == (1, 1)
+
+        # ключ без данных не запрашивается повторно до истечения паузы
+        summary = await collector.collect(locations)
+        assert (summary.succeeded, summary.failed, summary.skipped) == (0, 0, 2)
+        assert collector.client.get_weather.call_count == 2
+        assert (await collector.get_expiries())["mariehamn_ax"] == pytest.approx(time.time() + 300, abs=5)
+
+        # после истечения паузы ключ запрашивается снова, а пауза после повторной неудачи удваивается
+        failures = await collector.load_failures(["mariehamn_ax"])
+        failures["mariehamn_ax"]["failed_at"] -= 300
+        await collector.get_backend().put_many(collector.get_failures_namespace(), failures)
+
+        summary = await collector.collect(locations)
+        assert summary.failed == 1
+        assert (await collector.get_expiries())["mariehamn_ax"] == pytest.approx(time.time() + 600, abs=5)
+
+    async def test_failure_cleared_on_success(self, mocker, country_file: Path, scheduler: Scheduler):
+        mocker.patch.object(base_module.settings, "CACHE_FAILURE_BACKOFF", 0)
+        mocker.patch("clients.weather.WeatherClient.get_weather", return_value=None)
+        collector = WeatherCollector()
+        locations = await CountryCollector.get_locations()
+
+        await collector.collect(locations)
+        assert (await collector.load_failures(["tallinn_ee"])).keys() == {"tallinn_ee"}
+
+        collector.client.get_weather.return_value = {"main": {}}
+        await collector.collect(locations)
+        assert await collector.load_failures(["mariehamn_ax", "tallinn_ee"]) == {}
+
+    async def test_delay(self, mocker, scheduler: Scheduler):
+        mocker.patch.object(scheduler_module.settings, "SCHEDULER_MIN_INTERVAL", 5)
+        mocker.patch.object(scheduler_module.settings, "SCHEDULER_MAX_INTERVAL", 600)
+
+        mocker.patch.object(scheduler, "get_next_run_at", return_value=time.time() + 120)
+        assert await scheduler.get_delay() == pytest.approx(120, abs=1)
+
+        # просроченные данные актуализируются не чаще минимального интервала
+        scheduler.get_next_run_at.return_value = time.time() - 120
+        assert await scheduler.get_delay() == 5
+
+        scheduler.get_next_run_at.return_value = None
+        assert await scheduler.get_delay() == 600
+
+    async def test_run_until_stopped(self, mocker, scheduler: Scheduler):
+        mocker.patch.object(Collectors, "gather_exclusive", return_value={})
+        mocker.patch.object(scheduler, "get_delay", return_value=60)
+        asyncio.get_running_loop().call_later(0.05, scheduler.stop)
+
+        await asyncio.wait_for(scheduler.run(), timeout=1)
+
+        Collectors.gather_exclusive.assert_called_once_with()
+
+    async def test_stop_cancels_slow_run(self, mocker, scheduler: Scheduler):
+        mocker.patch.object(scheduler_module.settings, "SCHEDULER_STOP_TIMEOUT", 0.05)
+        cancelled = asyncio.Event()
+
+        async def gather_exclusive() -> dict:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return {}
+
+        mocker.patch.object(Collectors, "gather_exclusive", side_effect=gather_exclusive)
+        asyncio.get_running_loop().call_later(0.05, scheduler.stop)
+
+        await asyncio.wait_for(scheduler.run(), timeout=1)
+
+        assert cancelled.is_set()
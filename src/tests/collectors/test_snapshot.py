@@ -0,0 +1,93 @@
+"""
+Тестирование снимка данных о странах.
+"""
+import os
+import pickle
+from pathlib import Path
+
+import pytest
+
+from collectors import collector as collector_module
+from collectors.collector import CountryCollector
+from collectors.models import CurrencyInfoDTO, LanguagesInfoDTO
+from collectors.snapshot import SNAPSHOT_FORMAT, SNAPSHOT_VERSION, CountrySnapshot
+
+
+@pytest.mark.asyncio
+class TestCountrySnapshot:
+    """
+    Тестирование чтения данных о странах через снимок.
+    """
+
+    @pytest.fixture
+    def snapshot_path(self, media_path: Path) -> Path:
+        return media_path.joinpath("snapshots", "country.pickle")
+
+    async def test_read(self, mocker, country_file: Path, snapshot_path: Path):
+        build = mocker.spy(CountryCollector, "build")
+
+        validated = await CountryCollector.read()
+
+        assert snapshot_path.is_file()
+        assert build.call_count == 1
+
+        countries = await CountryCollector.read()
+
+        # данные прочитаны из снимка без повторной проверки
+        assert build.call_count == 1
+        assert [country.dict(exclude={"currencies", "languages"}) for country in countries] == [
+            country.dict(exclude={"currencies", "languages"}) for country in validated
+        ]
+        assert countries[1].currencies == {CurrencyInfoDTO(code="EUR")}
+        assert countries[1].languages == {LanguagesInfoDTO(name="Estonian", native_name="eesti")}
+        assert countries[1].alt_spellings == ["EE", "Eesti", "Republic of Estonia", "Eesti Vabariik"]
+
+    async def test_rebuild_on_change(self, mocker, country_file: Path, snapshot_path: Path):
+        await CountryCollector.read()
+        build = mocker.spy(CountryCollector, "build")
+
+        # исходные данные новее снимка
+        mtime = country_file.stat().st_mtime + 10
+        os.utime(country_file, (mtime, mtime))
+        await CountryCollector.read()
+        await CountryCollector.read()
+
+        assert build.call_count == 1
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            pickle.dumps((SNAPSHOT_FORMAT, 0, 0.0)),
+            b"corrupted",
+        ],
+    )
+    async def test_invalid(self, mocker, country_file: Path, snapshot_path: Path, content: bytes):
+        snapshot_path.parent.mkdir()
+        snapshot_path.write_bytes(content)
+        build = mocker.spy(CountryCollector, "build")
+
+        assert len(await CountryCollector.read()) == 2
+        assert build.call_count == 1
+
+    async def test_load_foreign_classes(self, tmp_path: Path):
+        snapshot = CountrySnapshot(tmp_path.joinpath("country.pickle"))
+        # снимок может содержать только встроенные типы
+        snapshot.path.write_bytes(
+            pickle.dumps((SNAPSHOT_FORMAT, SNAPSHOT_VERSION, 1.0)) + pickle.dumps([CurrencyInfoDTO(code="EUR")])
+        )
+
+        assert await snapshot.load(1.0) is None
+
+    async def test_disabled(self, mocker, country_file: Path, snapshot_path: Path):
+        mocker.patch.object(collector_module.settings, "CACHE_SNAPSHOT", False)
+
+        assert len(await CountryCollector.read()) == 2
+        assert not snapshot_path.exists()
+
+    async def test_collect(self, mocker, media_path: Path, snapshot_path: Path, countries_payload: list[dict]):
+        collector = CountryCollector()
+        mocker.patch.object(collector, "fetch", return_value=countries_payload)
+
+        await collector.collect()
+
+        assert snapshot_path.is_file()
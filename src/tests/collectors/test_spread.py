@@ -0,0 +1,80 @@
+"""
+Тестирование распределения актуализации данных по времени.
+"""
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from collectors import base as base_module
+from collectors.collector import WeatherCollector
+from collectors.models import CollectSummaryDTO, LocationDTO
+
+TTL = 1000
+
+
+@pytest.mark.asyncio
+class TestSpreadRefresh:
+    """
+    Тестирование разброса времени актуальности и ограничения количества актуализируемых ключей.
+    """
+
+    locations = frozenset(
+        LocationDTO(capital=capital, alpha2code=code)
+        for capital, code in (("Tallinn", "EE"), ("Riga", "LV"), ("Vilnius", "LT"), ("Helsinki", "FI"))
+    )
+
+    @pytest.fixture
+    def collector(self, mocker, media_path: Path) -> WeatherCollector:
+        mocker.patch.object(base_module.settings, "CACHE_TTL_JITTER", 0.2)
+        mocker.patch("collectors.collector.settings.CACHE_TTL_WEATHER", TTL)
+        return WeatherCollector()
+
+    @staticmethod
+    def write(media_path: Path, key: str, age: float) -> None:
+        file_path = media_path.joinpath("weather", f"{key}.json")
+        file_path.parent.mkdir(exist_ok=True)
+        file_path.write_text(json.dumps({"main": {}}))
+        fetched_at = time.time() - age
+        os.utime(file_path, (fetched_at, fetched_at))
+
+    async def test_key_ttl(self, collector: WeatherCollector):
+        ttls = {key: collector.get_key_ttl(key, TTL) for key in ("tallinn_ee", "riga_lv", "vilnius_lt")}
+
+        assert all(TTL * 0.8 <= ttl <= TTL for ttl in ttls.values())
+        assert len(set(ttls.values())) == 3
+        # время актуальности для ключа не меняется между запусками
+        assert collector.get_key_ttl("tallinn_ee", TTL) == ttls["tallinn_ee"]
+        assert collector.get_key_ttl("tallinn_ee", TTL, {"max_age": 5000}) == 5000
+
+    async def test_stale_keys(self, collector: WeatherCollector, media_path: Path):
+        for key in ("tallinn_ee", "riga_lv"):
+            self.write(media_path, key, collector.get_key_ttl(key, TTL) - 10)
+        for key in ("vilnius_lt", "helsinki_fi"):
+            self.write(media_path, key, collector.get_key_ttl(key, TTL) + 10)
+
+        assert await collector.stale_keys(
+            ["tallinn_ee", "riga_lv", "vilnius_lt", "helsinki_fi", "oslo_no"]
+        ) == {"vilnius_lt", "helsinki_fi", "oslo_no"}
+
+    async def test_refresh_slice(self, mocker, collector: WeatherCollector, media_path: Path):
+        mocker.patch.object(base_module.settings, "CACHE_REFRESH_SLICE", 2)
+        mocker.patch("clients.weather.WeatherClient.get_weather", return_value={"main": {}})
+        self.write(media_path, "tallinn_ee", 2 * TTL)
+        self.write(media_path, "riga_lv", 3 * TTL)
+        self.write(media_path, "vilnius_lt", 4 * TTL)
+
+        summary = await collector.collect(self.locations)
+
+        assert summary == CollectSummaryDTO(succeeded=2, deferred=2)
+        # сначала актуализируются ключи без данных и с самыми старыми данными
+        assert sorted(call.args[0] for call in collector.client.get_weather.call_args_list) == [
+            "Helsinki,FI",
+            "Vilnius,LT",
+        ]
+
+        summary = await collector.collect(self.locations)
+
+        assert summary == CollectSummaryDTO(succeeded=2, skipped=2)
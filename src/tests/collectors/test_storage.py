@@ -0,0 +1,184 @@
+"""
+Тестирование хранилищ кэша собранных данных.
+"""
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from collectors import storage as storage_module
+from collectors.collector import WeatherCollector
+from collectors.models import CollectSummaryDTO, LocationDTO
+from collectors.storage import (
+    CacheBackend,
+    FileSystemBackend,
+    MemoryBackend,
+    SqliteBackend,
+    get_cache_backend,
+)
+
+
+@pytest.mark.asyncio
+class TestCacheBackends:
+    """
+    Тестирование общего интерфейса хранилищ кэша.
+    """
+
+    @pytest.fixture(params=["files", "memory", "sqlite"])
+    async def backend(self, request, tmp_path: Path):
+        backend: CacheBackend = {
+            "files": lambda: FileSystemBackend(tmp_path),
+            "memory": lambda: MemoryBackend(capacity=10),
+            "sqlite": lambda: SqliteBackend(tmp_path.joinpath("snapshots.sqlite3")),
+        }[request.param]()
+        yield backend
+        await backend.close()
+
+    async def test_put_and_get(self, backend: CacheBackend):
+        await backend.put("weather", "riga_lv", {"a": 1})
+
+        entry = await backend.get("weather", "riga_lv")
+
+        assert entry.payload == {"a": 1}
+        assert entry.fetched_at == pytest.approx(time.time(), abs=5)
+        assert entry.age < 5
+        assert await backend.get("news", "riga_lv") is None
+        assert await backend.fetched_at("weather", "riga_lv") == entry.fetched_at
+        assert await backend.fetched_at("weather", "tallinn_ee") is None
+
+    async def test_put_many_and_get_many(self, backend: CacheBackend):
+        await backend.put_many("weather", {"riga_lv": [1], "tallinn_ee": [2]})
+
+        entries = await backend.get_many("weather", ["riga_lv", "tallinn_ee", "vilnius_lt"])
+
+        assert {key: entry.payload for key, entry in entries.items()} == {
+            "riga_lv": [1],
+            "tallinn_ee": [2],
+        }
+
+    async def test_fresh_keys(self, backend: CacheBackend):
+        await backend.put_many("weather", {"riga_lv": {}, "tallinn_ee": {}})
+        keys = {"riga_lv", "tallinn_ee", "vilnius_lt"}
+
+        assert await backend.fresh_keys("weather", keys, ttl=60) == {"riga_lv", "tallinn_ee"}
+        assert await backend.fresh_keys("weather", keys, ttl=-1) == set()
+        assert await backend.is_fresh("weather", "riga_lv", ttl=60)
+
+    async def test_touch_many(self, backend: CacheBackend):
+        await backend.put("weather", "riga_lv", {"a": 1})
+        fetched_at = await backend.fetched_at("weather", "riga_lv")
+        time.sleep(0.01)
+
+        await backend.touch_many("weather", ["riga_lv", "tallinn_ee"])
+
+        entry = await backend.get("weather", "riga_lv")
+        assert entry.payload == {"a": 1}
+        assert entry.fetched_at > fetched_at
+        assert await backend.get("weather", "tallinn_ee") is None
+
+    async def test_delete_many(self, backend: CacheBackend):
+        await backend.put_many("weather", {"riga_lv": {}, "tallinn_ee": {}})
+        await backend.put("news", "riga_lv", {})
+
+        await backend.delete_many("weather", ["riga_lv", "vilnius_lt"])
+
+        assert await backend.get("weather", "riga_lv") is None
+        assert await backend.get("weather", "tallinn_ee") is not None
+        assert await backend.get("news", "riga_lv") is not None
+
+
+@pytest.mark.asyncio
+class TestFileSystemBackend:
+    """
+    Тестирование хранилища в JSON-файлах.
+    """
+
+    async def test_put_is_atomic(self, mocker, tmp_path: Path):
+        backend = FileSystemBackend(tmp_path)
+        await backend.put("weather", "riga_lv", {"a": 1})
+        mocker.patch("collectors.storage.os.replace", side_effect=OSError)
+
+        with pytest.raises(OSError):
+            await backend.put("weather", "riga_lv", {"a": 2})
+
+        # целевой файл не изменился, временный файл удален
+        assert (await backend.get("weather", "riga_lv")).payload == {"a": 1}
+        assert [path.name for path in tmp_path.joinpath("weather").iterdir()] == ["riga_lv.json"]
+
+    async def test_checksum(self, tmp_path: Path):
+        backend = FileSystemBackend(tmp_path, checksum=True)
+        await backend.put("weather", "riga_lv", {"a": 1})
+        file_path = backend.get_path("weather", "riga_lv")
+
+        assert json.loads(file_path.read_text())["payload"] == {"a": 1}
+        assert (await backend.get("weather", "riga_lv")).payload == {"a": 1}
+        # файлы с контрольной суммой читаются и при выключенном ее сохранении
+        assert (await FileSystemBackend(tmp_path).get("weather", "riga_lv")).payload == {"a": 1}
+
+        file_path.write_text(file_path.read_text().replace('"a": 1', '"a": 2'))
+        assert await backend.get("weather", "riga_lv") is None
+
+    async def test_corrupted_file(self, tmp_path: Path):
+        backend = FileSystemBackend(tmp_path)
+        file_path = backend.get_path("weather", "riga_lv")
+        file_path.parent.mkdir()
+        file_path.write_text('{"a": ')
+
+        assert await backend.get("weather", "riga_lv") is None
+        # поврежденный файл перенесен в сторону: данные считаются отсутствующими
+        assert await backend.fetched_at("weather", "riga_lv") is None
+        assert file_path.with_name("riga_lv.json.corrupt").read_text() == '{"a": '
+
+
+@pytest.mark.asyncio
+class TestMemoryBackend:
+    """
+    Тестирование хранилища в памяти.
+    """
+
+    async def test_lru_eviction(self):
+        backend = MemoryBackend(capacity=2)
+        await backend.put("weather", "riga_lv", 1)
+        await backend.put("weather", "tallinn_ee", 2)
+        # ключ становится недавно использованным
+        await backend.get("weather", "riga_lv")
+
+        await backend.put("weather", "vilnius_lt", 3)
+
+        assert await backend.get("weather", "tallinn_ee") is None
+        assert (await backend.get("weather", "riga_lv")).payload == 1
+
+
+@pytest.mark.asyncio
+class TestCollectorWithSqlite:
+    """
+    Тестирование сборщика, сохраняющего данные в SQLite.
+    """
+
+    location = LocationDTO(capital="Tallinn", alpha2code="EE")
+
+    @pytest.fixture
+    async def collector(self, mocker, media_path: Path):
+        mocker.patch.object(storage_module.settings, "CACHE_BACKEND", "sqlite")
+        yield WeatherCollector()
+        await get_cache_backend().close()
+
+    async def test_collect_and_read(self, mocker, collector: WeatherCollector, media_path: Path):
+        payload = {
+            "main": {"temp": 13.92, "pressure": 1023, "humidity": 54},
+            "wind": {"speed": 4.63},
+            "weather": [{"description": "scattered clouds"}],
+            "visibility": 10000,
+            "timezone": 7200,
+        }
+        mocker.patch("clients.weather.WeatherClient.get_weather", return_value=payload)
+
+        assert await collector.collect(frozenset({self.location})) == CollectSummaryDTO(succeeded=1)
+        # повторный сбор не требуется – данные актуальны
+        assert await collector.collect(frozenset({self.location})) == CollectSummaryDTO(skipped=1)
+
+        weather = await WeatherCollector.read(self.location)
+        assert weather.temp == 13.92
+        assert media_path.joinpath("snapshots.sqlite3").is_file()
+        assert not media_path.joinpath("weather").exists()
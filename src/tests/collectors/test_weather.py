@@ -1,3 +1,84 @@
 """
 Тестирование функций сбора информации о погоде.
 """
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from collectors import collector as collector_module
+from collectors.collector import WeatherCollector
+from collectors.models import CollectSummaryDTO, LocationDTO
+
+
+@pytest.mark.asyncio
+class TestCollectorWeather:
+    """
+    Тестирование коллектора для получения информации о погоде.
+    """
+
+    locations = frozenset(
+        {
+            LocationDTO(capital="Mariehamn", alpha2code="AX"),
+            LocationDTO(capital="Tallinn", alpha2code="EE"),
+            LocationDTO(capital="Riga", alpha2code="LV"),
+        }
+    )
+
+    @pytest.fixture
+    def collector(self, media_path: Path):
+        return WeatherCollector()
+
+    async def test_collect_no_cache(self, mocker, collector: WeatherCollector, media_path: Path):
+        mocker.patch("clients.weather.WeatherClient.get_weather", return_value={"main": {}})
+
+        summary = await collector.collect(self.locations)
+
+        assert summary == CollectSummaryDTO(succeeded=3)
+        assert collector.client.get_weather.call_count == 3
+        assert media_path.joinpath("weather", "tallinn_ee.json").is_file()
+
+    async def test_collect_from_cache(self, mocker, collector: WeatherCollector):
+        mocker.patch("clients.weather.WeatherClient.get_weather")
+        mocker.patch("collectors.collector.WeatherCollector.stale_keys", return_value=set())
+
+        summary = await collector.collect(self.locations)
+
+        assert summary == CollectSummaryDTO(skipped=3)
+        collector.client.get_weather.assert_not_called()
+
+    async def test_collect_concurrency_is_bounded(self, mocker, collector: WeatherCollector):
+        mocker.patch.object(collector_module.settings, "WEATHER_MAX_CONCURRENCY", 2)
+        active = 0
+        max_active = 0
+
+        async def get_weather(location: str) -> dict:
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"main": {}}
+
+        mocker.patch("clients.weather.WeatherClient.get_weather", side_effect=get_weather)
+
+        summary = await collector.collect(self.locations)
+
+        assert summary.succeeded == 3
+        assert max_active == 2
+
+    async def test_collect_slow_and_failed_locations(self, mocker, collector: WeatherCollector):
+        mocker.patch.object(collector_module.settings, "WEATHER_TIMEOUT", 0.05)
+
+        async def get_weather(location: str) -> dict | None:
+            if location.startswith("Tallinn"):
+                await asyncio.sleep(1)
+            if location.startswith("Riga"):
+                return None
+            return {"main": {}}
+
+        mocker.patch("clients.weather.WeatherClient.get_weather", side_effect=get_weather)
+
+        summary = await collector.collect(self.locations)
+
+        assert summary == CollectSummaryDTO(succeeded=1, failed=2)
@@ -1,3 +1,70 @@
 """
 Фикстуры для моделей объектов.
 """
+import json
+from pathlib import Path
+
+import pytest
+
+from clients import policy as policy_module
+from collectors import base as base_module, collector as collector_module, storage as storage_module
+
+
+@pytest.fixture(autouse=True)
+def rate_limiters(mocker) -> None:
+    """
+    Отдельные для каждого теста ограничители частоты запросов к провайдерам.
+    """
+
+    mocker.patch.object(policy_module, "_rate_limiters", {})
+
+
+@pytest.fixture
+def countries_payload() -> list[dict]:
+    return [
+        dict(
+            capital="Mariehamn",
+            alpha2code="AX",
+            alt_spellings=["AX", "Aaland", "Aland", "Ahvenanmaa"],
+            area=1580.0,
+            currencies=[dict(code="EUR")],
+            flag="http://assets.promptapi.com/flags/AX.svg",
+            languages=[dict(name="Swedish", native_name="svenska")],
+            name="Åland Islands",
+            population=28875,
+            subregion="Northern Europe",
+            timezones=["UTC+02:00"],
+        ),
+        dict(
+            capital="Tallinn",
+            alpha2code="EE",
+            alt_spellings=["EE", "Eesti", "Republic of Estonia", "Eesti Vabariik"],
+            area=45227.0,
+            currencies=[dict(code="EUR")],
+            flag="http://assets.promptapi.com/flags/EE.svg",
+            languages=[dict(name="Estonian", native_name="eesti")],
+            name="Estonia",
+            population=1315944,
+            subregion="Northern Europe",
+            timezones=["UTC+02:00"],
+        ),
+    ]
+
+
+@pytest.fixture
+def media_path(mocker, tmp_path: Path) -> Path:
+    """
+    Временная директория для сохранения файлов сборщиками.
+    """
+
+    mocker.patch.object(collector_module.settings, "MEDIA_ABSOLUTE_PATH", tmp_path)
+    mocker.patch.object(base_module.settings, "MEDIA_ABSOLUTE_PATH", tmp_path)
+    mocker.patch.object(storage_module.settings, "MEDIA_ABSOLUTE_PATH", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def country_file(media_path: Path, countries_payload: list[dict]) -> Path:
+    file_path = media_path.joinpath("country.json")
+    file_path.write_text(json.dumps(countries_payload))
+    return file_path
@@ -0,0 +1,47 @@
+"""
+Тестирование функций пакетного поиска.
+"""
+import io
+import json
+import logging
+
+import pytest
+
+from batch import parse_locations, read_locations, to_json_line
+
+
+class TestBatch:
+    """
+    Тестирование пакетного поиска.
+    """
+
+    def test_parse_locations(self):
+        lines = io.StringIO('London\n\n  {"location": "Tallinn"}\n{"other": 1}\n Riga \n')
+
+        assert list(parse_locations(lines)) == ["London", "Tallinn", "Riga"]
+
+    def test_parse_locations_skips_invalid_lines(self, caplog):
+        lines = io.StringIO('London\n{"location": \n["Tallinn"]\n{}\n{"location": "Riga"}\n')
+
+        with caplog.at_level(logging.WARNING, logger="batch"):
+            assert list(parse_locations(lines)) == ["London", "Riga"]
+        assert [record.getMessage()[:9] for record in caplog.records] == ["Строка 2 ", "Строка 3 "]
+
+    @pytest.mark.asyncio
+    async def test_read_locations(self):
+        lines = io.StringIO('London\n{"location": "Tallinn"}\n')
+
+        assert [location async for location in read_locations(lines)] == ["London", "Tallinn"]
+
+    def test_to_json_line_with_error(self):
+        assert json.loads(to_json_line("Tallinn", RuntimeError("broken"))) == {
+            "location": "Tallinn",
+            "result": None,
+            "error": "broken",
+        }
+
+    def test_to_json_line_without_result(self):
+        assert json.loads(to_json_line("Atlantis", None)) == {
+            "location": "Atlantis",
+            "result": None,
+        }
@@ -0,0 +1,93 @@
+"""
+Тестирование индексов собранной информации.
+"""
+import os
+from pathlib import Path
+
+import pytest
+
+from collectors.collector import CountryCollector
+from index import CountryIndex, TrigramIndex
+
+
+@pytest.mark.asyncio
+class TestCountryIndex:
+    """
+    Тестирование индекса данных о странах.
+    """
+
+    @pytest.fixture
+    def index(self):
+        return CountryIndex()
+
+    @pytest.mark.parametrize(
+        "search", ["EE", "ee", "Estonia", " tallinn ", "Eesti Vabariik", "republic of  estonia"]
+    )
+    async def test_get_exact(self, index: CountryIndex, country_file: Path, search: str):
+        country = await index.get(search)
+
+        assert country is not None
+        assert country.alpha2code == "EE"
+
+    async def test_get_missing(self, index: CountryIndex, country_file: Path):
+        assert await index.get("Talin") is None
+
+    async def test_get_without_file(self, index: CountryIndex, media_path: Path):
+        assert await index.get("Estonia") is None
+        assert index.countries == []
+
+    async def test_reload_on_change(self, mocker, index: CountryIndex, country_file: Path):
+        read = mocker.spy(CountryCollector, "read_records")
+
+        await index.get("EE")
+        await index.get("AX")
+        assert read.call_count == 1
+
+        mtime = country_file.stat().st_mtime + 10
+        os.utime(country_file, (mtime, mtime))
+        await index.get("EE")
+        assert read.call_count == 2
+
+    @pytest.mark.parametrize(
+        "search, alpha2code",
+        [("Talin", "EE"), ("Marieham", "AX"), ("Aaland Islands", "AX"), ("estonija", "EE")],
+    )
+    async def test_search_fuzzy(
+        self, index: CountryIndex, country_file: Path, search: str, alpha2code: str
+    ):
+        matches = await index.search(search)
+
+        assert matches
+        assert matches[0][0].alpha2code == alpha2code
+
+    async def test_search_no_match(self, index: CountryIndex, country_file: Path):
+        assert await index.search("Buenos Aires") == []
+
+
+class TestTrigramIndex:
+    """
+    Тестирование индекса для нечеткого поиска строк.
+    """
+
+    @pytest.fixture
+    def index(self):
+        index = TrigramIndex()
+        for value, term in enumerate(["Vienna", "Vilnius", "Valletta", "Tallinn"]):
+            index.add(term, value)
+        return index
+
+    def test_search_ranked(self, index: TrigramIndex):
+        matches = index.search("Vilnus", limit=5)
+
+        assert [value for value, _ in matches] == [1]
+        assert 0.67 < matches[0][1] < 1
+
+    def test_search_substring(self, index: TrigramIndex):
+        assert index.search("tall") == [(3, 1.0)]
+
+    def test_search_top_k(self, index: TrigramIndex):
+        index.add("Vilnius City", 4)
+
+        matches = index.search("vilnius", limit=1)
+
+        assert matches == [(1, 1.0)]
@@ -1,3 +1,181 @@
 """
 Тестирование функций поиска (чтения) собранной информации в файлах.
 """
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from collectors.models import CurrencyInfoDTO, LocationDTO, model_encoder
+from collectors.records import NewsRecord, WeatherRecord
+from index import CountryIndex
+from reader import Reader
+
+
+@pytest.mark.asyncio
+class TestReader:
+    """
+    Тестирование чтения сохраненных данных.
+    """
+
+    @pytest.fixture
+    def reader(self):
+        return Reader(index=CountryIndex())
+
+    async def test_find_country(self, reader: Reader, country_file: Path):
+        country = await reader.find_country("Talin")
+
+        assert country is not None
+        assert country.alpha2code == "EE"
+
+    async def test_find_many_deduplicates_countries(
+        self, mocker, reader: Reader, country_file: Path
+    ):
+        mocker.patch(
+            "reader.Reader.get_location_info",
+            side_effect=lambda country: country.alpha2code,
+        )
+
+        results = [
+            result
+            async for result in reader.find_many(
+                ["Tallinn", "Estonia", "Atlantis", "Mariehamn", "EE"]
+            )
+        ]
+
+        assert results == [
+            ("Tallinn", "EE"),
+            ("Estonia", "EE"),
+            ("Atlantis", None),
+            ("Mariehamn", "AX"),
+            ("EE", "EE"),
+        ]
+        assert reader.get_location_info.call_count == 2
+
+    async def test_find_many_streams_input(self, mocker, reader: Reader, country_file: Path):
+        mocker.patch("reader.settings.READER_LOOKAHEAD", 2)
+        mocker.patch(
+            "reader.Reader.get_location_info",
+            side_effect=lambda country: country.alpha2code,
+        )
+        consumed = []
+
+        def read_locations():
+            for location in ["Tallinn", "Mariehamn", "Atlantis", "EE", "AX"]:
+                consumed.append(location)
+                yield location
+
+        results = []
+        async for result in reader.find_many(read_locations()):
+            results.append(result)
+            # строки читаются не более чем на две строки вперед выданных результатов
+            assert len(consumed) <= len(results) + 1
+
+        assert results == [
+            ("Tallinn", "EE"),
+            ("Mariehamn", "AX"),
+            ("Atlantis", None),
+            ("EE", "EE"),
+            ("AX", "AX"),
+        ]
+
+    async def test_find_many_reports_errors(self, mocker, reader: Reader, country_file: Path):
+        error = RuntimeError("broken")
+
+        async def get_location_info(country):
+            if country.alpha2code == "EE":
+                raise error
+            return country.alpha2code
+
+        mocker.patch("reader.Reader.get_location_info", side_effect=get_location_info)
+
+        async def read_locations():
+            for location in ["Tallinn", "Mariehamn", "EE"]:
+                yield location
+
+        results = [result async for result in reader.find_many(read_locations())]
+
+        assert results == [("Tallinn", error), ("Mariehamn", "AX"), ("EE", error)]
+
+    async def test_get_location_info_degraded(
+        self, mocker, reader: Reader, country_file: Path
+    ):
+        mocker.patch("reader.settings.READER_PART_TIMEOUT", 0.05)
+
+        async def get_city_info(location: LocationDTO) -> None:
+            await asyncio.sleep(1)
+
+        mocker.patch("reader.Reader.get_city_info", side_effect=get_city_info)
+        mocker.patch("reader.Reader.get_weather", side_effect=FileNotFoundError)
+        mocker.patch("reader.Reader.get_currency_rates", return_value={"EUR": 100.0})
+        mocker.patch("reader.Reader.get_news_from_country", return_value=None)
+        country = await reader.find_country("EE")
+
+        location_info = await reader.get_location_info(country)
+
+        assert location_info.capital is None
+        assert location_info.weather is None
+        assert location_info.currency_rates == {"EUR": 100.0}
+        assert location_info.news is None
+        assert sorted(location_info.degraded) == ["capital", "weather"]
+
+    async def test_get_location_info_converts_records(
+        self, mocker, reader: Reader, country_file: Path
+    ):
+        weather = WeatherRecord(
+            temp=5.0,
+            pressure=1000,
+            humidity=80,
+            wind_speed=3.0,
+            visibility=10000,
+            description="clear sky",
+            timezone=7200,
+        )
+        news = NewsRecord(
+            author="Jane Doe",
+            title="Lorem ipsum",
+            description=None,
+            publishedAt="2024-06-06T10:57:25Z",
+            content=None,
+            url="https://example.com/news/lorem-ipsum",
+        )
+        mocker.patch("reader.WeatherCollector.read_record", return_value=weather)
+        mocker.patch("reader.Reader.get_city_info", return_value=None)
+        mocker.patch("reader.NewsCollector.read_records", return_value=[news])
+        mocker.patch("reader.CurrencyRatesCollector.read", return_value=None)
+        country = await reader.find_country("EE")
+
+        location_info = await reader.get_location_info(country)
+
+        assert location_info.location.name == "Estonia"
+        assert location_info.location.currencies == {CurrencyInfoDTO(code="EUR")}
+        assert location_info.weather == weather.to_dto()
+        assert location_info.news == [news.to_dto()]
+        assert json.loads(location_info.json(models_as_dict=False, encoder=model_encoder))["location"][
+            "alt_spellings"
+        ] == ["EE", "Eesti", "Republic of Estonia", "Eesti Vabariik"]
+
+    async def test_get_location_info_invalid_news(
+        self, mocker, reader: Reader, country_file: Path
+    ):
+        news = NewsRecord(
+            author=None,
+            title="Lorem ipsum",
+            description=None,
+            publishedAt="2024-06-06T10:57:25Z",
+            content=None,
+            url="https://example.com/news/lorem-ipsum",
+        )
+        mocker.patch("reader.Reader.get_weather", return_value=None)
+        mocker.patch("reader.Reader.get_city_info", return_value=None)
+        mocker.patch("reader.Reader.get_currency_rates", return_value={"EUR": 100.0})
+        mocker.patch("reader.NewsCollector.read_records", return_value=[news])
+        country = await reader.find_country("EE")
+
+        location_info = await reader.get_location_info(country)
+
+        assert location_info.location.name == "Estonia"
+        assert location_info.currency_rates == {"EUR": 100.0}
+        assert location_info.news is None
+        assert location_info.degraded == ["news"]
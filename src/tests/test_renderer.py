@@ -1,3 +1,31 @@
 """
 Тестирование функций генерации выходных данных.
 """
+import pytest
+
+from collectors.models import LocationInfoDTO
+from renderer import NO_DATA, Renderer
+
+
+@pytest.mark.asyncio
+class TestRenderer:
+    """
+    Тестирование форматирования данных о стране.
+    """
+
+    async def test_render_without_optional_parts(self, countries_payload: list[dict]):
+        location_info = LocationInfoDTO(
+            location=countries_payload[0],
+            weather=None,
+            currency_rates={"EUR": 100.0},
+            capital=None,
+            news=None,
+            degraded=["weather", "capital"],
+        )
+
+        info = await Renderer(location_info)._get_formatted_info()
+
+        assert info["Информация о погоде"] == NO_DATA
+        assert info["Координаты столицы"] == NO_DATA
+        assert info["Текущее время в столице"] == NO_DATA
+        assert info["Курсы валют"] == "EUR = 100.00 руб."
@@ -0,0 +1,70 @@
+"""
+Тестирование сервиса поиска информации о странах.
+"""
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from collectors.models import LocationInfoDTO
+from reader import Reader
+from server import create_app
+
+
+@pytest.mark.asyncio
+class TestFindService:
+    """
+    Тестирование HTTP API сервиса поиска.
+    """
+
+    @pytest.fixture
+    async def client(self):
+        client = TestClient(TestServer(create_app()))
+        await client.start_server()
+        yield client
+        await client.close()
+
+    async def test_find_without_location(self, client: TestClient):
+        response = await client.get("/find")
+
+        assert response.status == 400
+
+    async def test_find_not_found(self, mocker, client: TestClient):
+        mocker.patch("reader.Reader.find", return_value=None)
+
+        response = await client.get("/find", params={"location": "Atlantis"})
+
+        assert response.status == 404
+        Reader.find.assert_called_once_with("Atlantis")
+
+    async def test_find(self, mocker, client: TestClient, countries_payload: list[dict]):
+        location_info = LocationInfoDTO(
+            location=countries_payload[1],
+            weather=dict(
+                temp=13.92,
+                pressure=1023,
+                humidity=54,
+                wind_speed=4.63,
+                visibility=10000,
+                description="scattered clouds",
+                timezone=7200,
+            ),
+            currency_rates={"EUR": 100.0},
+            capital=dict(
+                country=dict(code="EE", name="Estonia"),
+                geo_id=588409,
+                latitude=59.436958,
+                longitude=24.753531,
+                name="Tallinn",
+                state_or_region="Harjumaa",
+            ),
+            news=None,
+        )
+        mocker.patch("reader.Reader.find", return_value=location_info)
+
+        response = await client.get("/find", params={"location": "Tallinn"})
+
+        assert response.status == 200
+        result = LocationInfoDTO.parse_obj(await response.json())
+        assert result.location.alpha2code == "EE"
+        assert result.location.currencies == location_info.location.currencies
+        assert result.weather == location_info.weather
+        assert result.capital == location_info.capital